@@ -0,0 +1 @@
+"""Timekeeper benchmarks"""
@@ -0,0 +1,268 @@
+"""Benchmark suite runner
+
+Builds synthetic databases, times the model, rendering, remote and startup
+paths and prints machine readable JSON results, which can be compared with
+the results of another branch.
+
+    python -m benchmarks --years 5 --output results.json
+    python -m benchmarks --years 5 --compare results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from tabulate import tabulate
+
+from benchmarks.bench_startup import run as run_cli
+from benchmarks.datagen import DatasetSpec, build_datasets
+from test.hiper_stub import HiperStub
+from timekeeper.database import close_db
+from timekeeper.model import DAYS_AGGREGATE, DAYS_STREAM, DAYS_SUMMARY, Day, Times
+from timekeeper.remote import Hiper
+
+SUITES = ("model", "render", "remote", "startup")
+DEFAULT_REPEAT = 5
+REMOTE_DAYS = 30
+REMOTE_LATENCY = 0.01
+
+
+def measure(suite: str, name: str, func: Callable, repeat: int, **extra) -> dict:
+    """Times a function, returns the result record"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "suite": suite,
+        "name": name,
+        "best": min(timings),
+        "mean": sum(timings) / len(timings),
+        "repeat": repeat,
+        **extra,
+    }
+
+
+def legacy_days(times: Times) -> List[Day]:
+    """Buckets every register per day and builds them with Day.from_dict
+
+    Days holding only the OUT of a shift crossing midnight are skipped, the
+    original bucketing could not build them.
+    """
+    days = {}
+    for operation, date in times.query_all():
+        days.setdefault(date.strftime("%Y-%m-%d"), {}).setdefault(operation, []).append(
+            date
+        )
+    return [Day.from_dict(day) for day in days.values() if day.get("IN")]
+
+
+def model_suite(database: str, spec: DatasetSpec, repeat: int) -> List[dict]:
+    """Times the Times queries"""
+    times = Times(database)
+    month = {
+        "date_from": spec.end - timedelta(days=30),
+        "date_to": spec.end,
+    }
+
+    results = [
+        measure("model", "query_all", times.query_all, repeat),
+        measure("model", "day_from_dict", lambda: legacy_days(times), repeat),
+        measure("model", "rebuild_summary", times.rebuild_summary, 1),
+    ]
+    for mode in (DAYS_STREAM, DAYS_AGGREGATE, DAYS_SUMMARY):
+        results.append(
+            measure(
+                "model",
+                f"query_days_{mode}",
+                lambda: times.query_days(mode=mode),
+                repeat,
+            )
+        )
+        results.append(
+            measure(
+                "model",
+                f"query_days_{mode}_month",
+                lambda: times.query_days(month, mode=mode),
+                repeat,
+            )
+        )
+    return results
+
+
+def render_suite(database: str, repeat: int) -> List[dict]:
+    """Times the show table rendering"""
+    days = Times(database).query_days()
+    return [
+        measure(
+            "render",
+            "fancy_grid",
+            lambda: tabulate(days.tuples(), tablefmt="fancy_grid"),
+            repeat,
+            rows=len(days),
+        )
+    ]
+
+
+def remote_suite(database: str, repeat: int) -> List[dict]:
+    """Times informing days to a local Hiper stub"""
+    days = list(Times(database).query_days())[-REMOTE_DAYS:]
+    results = []
+
+    with HiperStub(latency=REMOTE_LATENCY) as stub:
+        for workers in (1, 4):
+            remote = Hiper(url=stub.url, workers=workers, rate=0)
+            remote.login("user", "password")
+            results.append(
+                measure(
+                    "remote",
+                    f"register_days_{workers}_workers",
+                    lambda: list(remote.register_days(days)),
+                    repeat,
+                    days=len(days),
+                )
+            )
+    return results
+
+
+def startup_suite(repeat: int) -> List[dict]:
+    """Times tk start and tk show in fresh interpreters"""
+    with tempfile.TemporaryDirectory() as home:
+        run_cli(home, ["start", "-d", "2023-01-01 09:00"])
+        return [
+            measure(
+                "startup",
+                f"tk_{args[0]}",
+                lambda: run_cli(home, args),
+                repeat,
+            )
+            for args in (
+                ["start", "-d", "2023-01-01 09:00"],
+                ["show", "--raw"],
+            )
+        ]
+
+
+def metadata(spec: DatasetSpec) -> dict:
+    """Returns the environment the results were measured in"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+
+    return {
+        "revision": revision,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "dataset": spec.as_dict(),
+    }
+
+
+def compare(base: dict, current: dict) -> str:
+    """Returns a table comparing the best times of two result sets"""
+
+    def key(row: dict) -> tuple:
+        return row["suite"], row["name"], row.get("database")
+
+    previous = {key(row): row["best"] for row in base["results"]}
+    rows = []
+    for row in current["results"]:
+        before = previous.get(key(row))
+        ratio = row["best"] / before if before else None
+        rows.append((*key(row), before, row["best"], ratio))
+    return tabulate(
+        rows,
+        headers=[
+            "suite",
+            "name",
+            "database",
+            base["meta"]["revision"],
+            current["meta"]["revision"],
+            "ratio",
+        ],
+        floatfmt=".5f",
+    )
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--shifts-per-day", type=int, default=2)
+    parser.add_argument("--unclosed-ratio", type=float, default=0.01)
+    parser.add_argument("--cross-midnight-ratio", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--suite", choices=SUITES, action="append")
+    parser.add_argument("--output", help="writes the JSON results to a file")
+    parser.add_argument("--compare", help="JSON results to compare against")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    spec = DatasetSpec(
+        users=args.users,
+        years=args.years,
+        shifts_per_day=args.shifts_per_day,
+        unclosed_ratio=args.unclosed_ratio,
+        cross_midnight_ratio=args.cross_midnight_ratio,
+        seed=args.seed,
+    )
+    suites = args.suite or SUITES
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        databases = build_datasets(directory, spec)
+
+        for database in databases:
+            user = os.path.basename(database)
+            rows = []
+            if "model" in suites:
+                rows += model_suite(database, spec, args.repeat)
+            if "render" in suites:
+                rows += render_suite(database, args.repeat)
+            if "remote" in suites:
+                rows += remote_suite(database, args.repeat)
+            for row in rows:
+                row["database"] = user
+            results += rows
+            close_db(database)
+
+    if "startup" in suites:
+        results += startup_suite(args.repeat)
+
+    report = {"meta": metadata(spec), "results": results}
+    payload = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as output:
+            output.write(payload)
+    else:
+        print(payload)
+
+    if args.compare:
+        with open(args.compare, encoding="utf8") as base:
+            print(compare(json.load(base), report), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
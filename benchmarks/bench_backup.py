@@ -0,0 +1,88 @@
+"""Backup benchmark
+
+Copies a large synthetic database while another process keeps clocking in,
+and reports how long each copy takes and how long the writer's commits
+took meanwhile. Compares a plain file copy, the online backup in one step
+and in page batches, and a compacted snapshot.
+
+    python -m benchmarks.bench_backup [YEARS]
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from benchmarks.datagen import DatasetSpec, populate
+from timekeeper.backup import backup, snapshot
+from timekeeper.database import close_db
+from timekeeper.model import Times
+
+DEFAULT_YEARS = 100
+WRITE_INTERVAL = 0.005
+
+
+def write(database: str, stop, latencies) -> None:
+    """Clocks in every WRITE_INTERVAL until stopped, sending commit times"""
+    logging.disable(logging.WARNING)
+    times = Times(database)
+    date = datetime(2200, 1, 1)
+    measured = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        times.register_row("IN", date)
+        measured.append(time.perf_counter() - started)
+        date += timedelta(minutes=5)
+        time.sleep(WRITE_INTERVAL)
+    latencies.put(measured)
+
+
+def run(name: str, database: str, copy: Callable[[], None]) -> None:
+    """Times a copy while a writer process runs, printing the writer stalls"""
+    stop = multiprocessing.Event()
+    latencies = multiprocessing.Queue()
+    writer = multiprocessing.Process(target=write, args=(database, stop, latencies))
+    writer.start()
+    time.sleep(0.5)
+
+    started = time.perf_counter()
+    copy()
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    measured = sorted(latencies.get())
+    writer.join()
+
+    print(
+        f"{name:<16} {elapsed:8.3f}s  writes {len(measured):5} "
+        f"p50 {measured[len(measured) // 2] * 1000:7.2f}ms "
+        f"max {measured[-1] * 1000:7.2f}ms"
+    )
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_YEARS
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "bench.db")
+        populate(database, DatasetSpec(years=years, weekends=True))
+        close_db(database)
+        print(f"database {os.path.getsize(database) / 2**20:.1f} MiB")
+
+        target = os.path.join(directory, "copy.db")
+        snapshots = os.path.join(directory, "snapshots")
+        run("file copy", database, lambda: shutil.copyfile(database, target))
+        run("backup 1 step", database, lambda: backup(database, target, pages=-1))
+        run("backup batched", database, lambda: backup(database, target, pages=256))
+        run("snapshot", database, lambda: snapshot(database, snapshots))
+
+
+if __name__ == "__main__":
+    main()
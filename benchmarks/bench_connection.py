@@ -0,0 +1,78 @@
+"""Connection handling benchmark
+
+Compares N register/query operations going through a fresh ``open_db``
+connection per call against the shared connection manager.
+
+    python -m benchmarks.bench_connection [N]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from timekeeper.database import close_db, open_db
+from timekeeper.model import Times
+
+DEFAULT_OPERATIONS = 1000
+START_DATE = datetime(2020, 1, 1, 9, 0)
+
+
+def per_call(database: str, operations: int) -> None:
+    """Registers and queries opening a connection each time"""
+    times = Times(database)
+    for index in range(operations):
+        with open_db(database) as cursor:
+            cursor.execute(
+                f"INSERT INTO `{times.table}` (`operation`,`date`) VALUES (?, ?);",
+                ("IN", START_DATE + timedelta(minutes=index)),
+            )
+        with open_db(database) as cursor:
+            cursor.execute(f"SELECT count(*) FROM `{times.table}`;")
+            cursor.fetchone()
+
+
+def shared(database: str, operations: int) -> None:
+    """Registers and queries through the shared connection"""
+    times = Times(database)
+    for index in range(operations):
+        times.register_row("IN", START_DATE + timedelta(minutes=index))
+        with times.connection() as cursor:
+            cursor.execute(f"SELECT count(*) FROM `{times.table}`;")
+            cursor.fetchone()
+
+
+def shared_transaction(database: str, operations: int) -> None:
+    """Registers and queries through the shared connection in one commit"""
+    times = Times(database)
+    with times.transaction():
+        shared(database, operations)
+
+
+def measure(func: Callable, operations: int) -> float:
+    """Runs a benchmark case on a temporary database and returns its time"""
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "bench.db")
+        started = time.perf_counter()
+        func(database, operations)
+        elapsed = time.perf_counter() - started
+        close_db(database)
+    return elapsed
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OPERATIONS
+
+    for func in (per_call, shared, shared_transaction):
+        elapsed = measure(func, operations)
+        print(
+            f"{func.__name__:<20} {operations} ops "
+            f"{elapsed:8.3f}s {operations / elapsed:10.0f} ops/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Days container benchmark
+
+Compares memory and time of a list of Day objects against a DayBatch for a
+synthetic history, building, formatting and totalizing every day.
+
+    python -m benchmarks.bench_day_batch [YEARS]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Tuple
+
+from timekeeper.model import Day, DayBatch
+from timekeeper.times import to_timestamp
+
+DEFAULT_YEARS = 10
+START_DATE = datetime(2014, 1, 1, 9)
+
+
+def rows(years: int) -> Iterator[Tuple[int, int]]:
+    """Yields first IN timestamps and worked seconds of a synthetic history"""
+    for offset in range(years * 365):
+        first_in = START_DATE + timedelta(days=offset, minutes=offset % 60)
+        yield to_timestamp(first_in), 8 * 3600 + (offset % 7) * 600
+
+
+def day_list(years: int) -> Tuple[list, Callable]:
+    """Builds a list of days and returns it with its report function"""
+    days = [Day.from_timestamps(*row) for row in rows(years)]
+
+    def report():
+        lines = [day.tuple() for day in days]
+        total = sum((day.hours for day in days), timedelta())
+        return lines, total
+
+    return days, report
+
+
+def day_batch(years: int) -> Tuple[DayBatch, Callable]:
+    """Builds a DayBatch and returns it with its report function"""
+    days = DayBatch(rows(years))
+
+    def report():
+        return list(days.tuples()), days.total()
+
+    return days, report
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_YEARS
+
+    print(f"{'container':<10} {'memory KiB':>12} {'build s':>10} {'report s':>10}")
+    for build in (day_list, day_batch):
+        tracemalloc.start()
+        started = time.perf_counter()
+        days, report = build(years)
+        built = time.perf_counter() - started
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        report()
+        reported = time.perf_counter() - started
+
+        print(
+            f"{build.__name__:<10} {memory / 1024:>12.1f} "
+            f"{built:>10.5f} {reported:>10.5f}"
+        )
+        del days
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Bulk import benchmark
+
+Imports a synthetic history of punches from CSV with the batched single
+transaction path, then again to measure the de-duplication pass, and
+compares with registering the same punches one by one.
+
+    python -m benchmarks.bench_import [PUNCHES]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from itertools import islice
+
+from benchmarks.datagen import DatasetSpec, generate_punches
+from timekeeper.database import close_db
+from timekeeper.model import Times
+from timekeeper.transfer import CSV, read_punches, write_punches
+
+DEFAULT_PUNCHES = 100000
+SINGLE_PUNCHES = 2000
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PUNCHES
+
+    spec = DatasetSpec(years=count // 500 + 1, weekends=True)
+    punches = list(islice(generate_punches(spec), count))
+    source = io.StringIO()
+    write_punches(source, punches, CSV)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "bench.db")
+        times = Times(database)
+
+        for name in ("import", "reimport"):
+            source.seek(0)
+            started = time.perf_counter()
+            inserted = times.register_rows(read_punches(source, CSV))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:<10} {inserted:>8} inserted {elapsed:8.3f}s "
+                f"{len(punches) / elapsed:10.0f} punches/s"
+            )
+
+        close_db(database)
+
+        database = os.path.join(directory, "single.db")
+        times = Times(database)
+        started = time.perf_counter()
+        for operation, date in punches[:SINGLE_PUNCHES]:
+            times.register_row(operation, date)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{'single':<10} {SINGLE_PUNCHES:>8} inserted {elapsed:8.3f}s "
+            f"{SINGLE_PUNCHES / elapsed:10.0f} punches/s"
+        )
+        close_db(database)
+
+
+if __name__ == "__main__":
+    main()
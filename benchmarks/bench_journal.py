@@ -0,0 +1,98 @@
+"""Clock in latency benchmark
+
+Times a clock in through the punch journal against the SQLite insert path,
+both with the connection already open and opening it per punch like a
+fresh tk process does, with synchronous NORMAL and FULL. Then times the
+read compacting the journaled punches.
+
+    python -m benchmarks.bench_journal [PUNCHES]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from timekeeper.database import DatabaseSettings, close_db, connections
+from timekeeper.journal import PunchJournal, journal_path
+from timekeeper.model import Times
+
+DEFAULT_PUNCHES = 500
+START_DATE = datetime(2020, 1, 1, 9, 0)
+
+
+def punches(count: int) -> list:
+    """Returns alternating punches five minutes apart"""
+    return [
+        ("IN" if index % 2 == 0 else "OUT", START_DATE + timedelta(minutes=5 * index))
+        for index in range(count)
+    ]
+
+
+def report(name: str, count: int, func: Callable) -> None:
+    """Prints the mean latency of count calls"""
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<26} {elapsed / count * 1e6:10.1f} us/punch")
+
+
+def sqlite_warm(database: str, rows: list) -> None:
+    """Registers through a connection kept open"""
+    times = Times(database)
+    for operation, date in rows:
+        times.register_row(operation, date)
+
+
+def sqlite_cold(database: str, rows: list) -> None:
+    """Registers opening, migrating and closing the connection every time"""
+    for operation, date in rows:
+        Times(database).register_row(operation, date)
+        close_db(database)
+
+
+def journal_append(database: str, rows: list) -> None:
+    """Appends to the punch journal"""
+    journal = PunchJournal(journal_path(database))
+    for operation, date in rows:
+        journal.append(operation, date)
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PUNCHES
+    rows = punches(count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for synchronous in ("NORMAL", "FULL"):
+            for name, func in (("warm", sqlite_warm), ("cold", sqlite_cold)):
+                database = os.path.join(directory, f"{name}-{synchronous}.db")
+                connections.configure(
+                    database, DatabaseSettings(synchronous=synchronous)
+                )
+                Times(database)
+                report(
+                    f"sqlite {name} {synchronous.lower()}",
+                    count,
+                    lambda: func(database, rows),
+                )
+                close_db(database)
+
+        database = os.path.join(directory, "journal.db")
+        Times(database)
+        close_db(database)
+        report("journal append", count, lambda: journal_append(database, rows))
+
+        journal = PunchJournal(journal_path(database))
+        report(
+            "journal compaction",
+            count,
+            lambda: Times(database, journal=journal).query_all(),
+        )
+        close_db(database)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Days query benchmark
+
+Times the Python stream, the SQLite aggregate and the daily summary days
+query modes over growing ranges of a synthetic history, showing where they
+cross over.
+
+    python -m benchmarks.bench_query_days [YEARS]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+from datetime import timedelta
+
+from benchmarks.datagen import DatasetSpec, populate
+from timekeeper.database import close_db
+from timekeeper.model import DAYS_AGGREGATE, DAYS_STREAM, DAYS_SUMMARY, Times
+
+DEFAULT_YEARS = 10
+RANGES = (1, 3, 7, 15, 30, 60, 90, 180, 365, 730, 1825, 3650)
+REPEAT = 5
+
+
+def measure(times: Times, filters: dict, mode: str) -> float:
+    """Returns the best time of a days query"""
+    return min(
+        timeit.repeat(
+            lambda: times.query_days(filters, mode=mode), number=1, repeat=REPEAT
+        )
+    )
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_YEARS
+    spec = DatasetSpec(years=years)
+    end = spec.end
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "bench.db")
+        populate(database, spec)
+        times = Times(database)
+
+        modes = (DAYS_STREAM, DAYS_AGGREGATE, DAYS_SUMMARY)
+        print(f"{'days':>6} " + " ".join(f"{mode:>10}" for mode in modes))
+        for days in RANGES:
+            filters = {
+                "date_from": end - timedelta(days=days),
+                "date_to": end,
+            }
+            results = {mode: measure(times, filters, mode) for mode in modes}
+            faster = min(results, key=results.get)
+            print(
+                f"{days:>6} "
+                + " ".join(f"{results[mode]:>10.5f}" for mode in modes)
+                + f" {faster}"
+            )
+
+        close_db(database)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Remote reporting benchmark
+
+Informs a month of days to the local Hiper stub with a simulated network
+latency, sequentially and with growing concurrency.
+
+    python -m benchmarks.bench_remote [DAYS] [LATENCY]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from test.hiper_stub import HiperStub
+from timekeeper.model import Day
+from timekeeper.remote import Hiper
+
+DEFAULT_DAYS = 30
+DEFAULT_LATENCY = 0.02
+WORKERS = (1, 2, 4, 8)
+START_DATE = datetime(2023, 1, 1, 9)
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DAYS
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LATENCY
+
+    days = [
+        Day(
+            START_DATE + timedelta(days=offset),
+            START_DATE + timedelta(days=offset, hours=8),
+            timedelta(hours=8),
+        )
+        for offset in range(count)
+    ]
+
+    with HiperStub(latency=latency) as stub:
+        for workers in WORKERS:
+            remote = Hiper(url=stub.url, workers=workers, rate=0)
+            remote.login("user", "password")
+
+            started = time.perf_counter()
+            informed = sum(comm for _, comm in remote.register_days(days))
+            elapsed = time.perf_counter() - started
+
+            print(
+                f"workers {workers:>2} {informed}/{count} days "
+                f"{elapsed:8.3f}s {count / elapsed:8.1f} days/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
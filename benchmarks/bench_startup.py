@@ -0,0 +1,72 @@
+"""CLI startup benchmark
+
+Runs ``tk start`` in fresh interpreters against a temporary home, reporting
+the wall time and the slowest imports measured with ``-X importtime``.
+
+    python -m benchmarks.bench_startup [RUNS]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+DEFAULT_RUNS = 10
+TOP_IMPORTS = 10
+COMMAND = "from timekeeper.cli import cli; cli(prog_name='tk')"
+
+
+def run(home: str, args: List[str], importtime: bool = False) -> str:
+    """Runs the CLI in a fresh interpreter, returns its stderr"""
+    options = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *options, "-c", COMMAND, *args],
+        env={**os.environ, "HOME": home},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stderr
+
+
+def imports(stderr: str) -> Dict[str, int]:
+    """Returns the cumulative microseconds of each top level import"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if name.startswith("  ") or not total.strip().isdigit():
+            continue
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS
+
+    with tempfile.TemporaryDirectory() as home:
+        run(home, ["start", "-d", "2023-01-01 09:00"])
+
+        for args in (["--help"], ["start", "-d", "2023-01-01 09:00"]):
+            started = time.perf_counter()
+            for _ in range(runs):
+                run(home, args)
+            elapsed = (time.perf_counter() - started) / runs
+            print(f"tk {' '.join(args):<30} {elapsed * 1000:8.1f} ms")
+
+        slowest = sorted(
+            imports(run(home, ["start"], importtime=True)).items(),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        print("\nslowest top level imports of tk start")
+        for name, total in slowest[:TOP_IMPORTS]:
+            print(f"{name:<40} {total / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
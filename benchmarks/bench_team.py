@@ -0,0 +1,78 @@
+"""Team report benchmark
+
+Times reading the days of one database per user with sequential
+Times.query_days calls, against team_reports with growing process pools.
+The first sequential pass fills the daily summaries, the next ones read
+them.
+
+    python -m benchmarks.bench_team [USERS] [YEARS]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.datagen import DatasetSpec, build_datasets
+from timekeeper.database import close_db
+from timekeeper.model import DAYS_AGGREGATE, DAYS_SUMMARY, Times
+from timekeeper.team import team_reports
+
+DEFAULT_USERS = 16
+DEFAULT_YEARS = 3
+
+
+def measure(func: Callable) -> float:
+    """Returns the time a call takes"""
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def sequential(databases: list, mode: str) -> None:
+    """Queries every database in turn, in this process"""
+    for database in databases:
+        Times(database).query_days(mode=mode)
+        close_db(database)
+
+
+def main() -> None:
+    """Benchmark entrypoint"""
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_YEARS
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        databases = build_datasets(directory, DatasetSpec(users=users, years=years))
+        print(f"{users} users, {years} years, {cpus} cpus")
+
+        results = [
+            (
+                f"sequential {DAYS_SUMMARY} cold",
+                lambda: sequential(databases, DAYS_SUMMARY),
+            ),
+            (f"sequential {DAYS_SUMMARY}", lambda: sequential(databases, DAYS_SUMMARY)),
+            (
+                f"sequential {DAYS_AGGREGATE}",
+                lambda: sequential(databases, DAYS_AGGREGATE),
+            ),
+        ]
+        workers = 1
+        while workers <= max(cpus, 4):
+            results.append(
+                (
+                    f"team_reports {workers} workers",
+                    lambda workers=workers: list(
+                        team_reports(databases, workers=workers)
+                    ),
+                )
+            )
+            workers *= 2
+
+        for name, func in results:
+            print(f"{name:<28} {measure(func):8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
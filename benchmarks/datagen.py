@@ -0,0 +1,91 @@
+"""Deterministic synthetic punch history generator"""
+
+import os
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+from timekeeper.database import close_db
+from timekeeper.model import Times
+
+SHIFT_LENGTH = timedelta(hours=4)
+SHIFT_GAP = timedelta(minutes=45)
+
+
+@dataclass
+class DatasetSpec:
+    """Shape of a synthetic history"""
+
+    users: int = 1
+    years: int = 1
+    shifts_per_day: int = 2
+    unclosed_ratio: float = 0.01
+    cross_midnight_ratio: float = 0.02
+    weekends: bool = False
+    seed: int = 42
+    start: datetime = datetime(2015, 1, 5)
+
+    @property
+    def end(self) -> datetime:
+        """First day after the generated history"""
+        return self.start + timedelta(days=self.years * 365)
+
+    def as_dict(self) -> dict:
+        """Returns the spec as JSON serializable values"""
+        values = asdict(self)
+        values["start"] = self.start.isoformat()
+        return values
+
+
+def generate_punches(
+    spec: DatasetSpec, user: int = 0
+) -> Iterator[Tuple[str, datetime]]:
+    """Yields time ordered punches of a user history
+
+    Working days get the configured shifts with some jitter. A few days end
+    with an unclosed IN, and a few are night shifts crossing midnight.
+    """
+    rand = random.Random(spec.seed * 1000 + user)
+
+    for offset in range(spec.years * 365):
+        day = spec.start + timedelta(days=offset)
+        if not spec.weekends and day.weekday() >= 5:
+            continue
+
+        if rand.random() < spec.cross_midnight_ratio:
+            start = day.replace(hour=22) + timedelta(minutes=5 * rand.randrange(12))
+            yield "IN", start
+            yield "OUT", start + timedelta(hours=6)
+            continue
+
+        start = day.replace(hour=8) + timedelta(minutes=5 * rand.randrange(24))
+        for shift in range(spec.shifts_per_day):
+            yield "IN", start
+            last = shift == spec.shifts_per_day - 1
+            if last and rand.random() < spec.unclosed_ratio:
+                break
+            yield "OUT", start + SHIFT_LENGTH
+            start += SHIFT_LENGTH + SHIFT_GAP
+
+
+def populate(database: str, spec: DatasetSpec, user: int = 0) -> int:
+    """Writes a user history into a database, returns the punch count"""
+    times = Times(database)
+    count = 0
+    with times.transaction():
+        for operation, date in generate_punches(spec, user):
+            times.register_row(operation, date)
+            count += 1
+    return count
+
+
+def build_datasets(directory: str, spec: DatasetSpec) -> List[str]:
+    """Creates one database per user in a directory, returns their paths"""
+    databases = []
+    for user in range(spec.users):
+        database = os.path.join(directory, f"user{user:03d}.db")
+        populate(database, spec, user)
+        close_db(database)
+        databases.append(database)
+    return databases
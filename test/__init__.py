@@ -0,0 +1 @@
+"""Timekeeper test suite"""
@@ -0,0 +1,130 @@
+"""Local stand-in for the Hiper HTTP server
+
+Answers the login and clock endpoints used by ``timekeeper.remote.Hiper``
+so remote reporting can be tested and measured offline.
+"""
+
+import json
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, Iterable
+
+SESSION_COOKIE = "stub-session"
+
+
+class HiperStub:
+    """Threaded Hiper stub server, usable as a context manager
+
+    Each clock request waits latency seconds. Days listed in failures answer
+    with a 503 that many times before being accepted, days in rejected are
+    always refused. Logins answer with a 503 login_failures times, and only
+    set the session cookie for a body naming the user.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failures: Dict[str, int] = None,
+        rejected: Iterable[str] = (),
+        login_failures: int = 0,
+    ):
+        self.latency = latency
+        self.failures = Counter(failures or {})
+        self.rejected = set(rejected)
+        self.login_failures = login_failures
+        self.registered: Dict[str, tuple] = {}
+        self.requests = Counter()
+        self.lock = Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread = Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        """Base url of the running stub"""
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "HiperStub":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handler(self) -> type:
+        """Returns the request handler class bound to this stub"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Hiper endpoints handler"""
+
+            def log_message(self, *_) -> None:
+                pass
+
+            def reply(self, status: int, body: str, headers: dict = None) -> None:
+                """Sends a response"""
+                payload = body.encode()
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self) -> None:
+                """Handles the login and clock endpoints"""
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+
+                with stub.lock:
+                    stub.requests[self.path] += 1
+
+                if self.path == "/login.cgi":
+                    with stub.lock:
+                        failed = stub.login_failures > 0
+                        stub.login_failures -= failed
+                    if failed:
+                        self.reply(503, "")
+                    elif b'name="usuario"' in body:
+                        self.reply(
+                            200, "", {"Set-Cookie": f"session={SESSION_COOKIE}; Path=/"}
+                        )
+                    else:
+                        self.reply(200, "")
+                    return
+
+                if self.path != "/aj_reloj.cgi":
+                    self.reply(404, "")
+                    return
+
+                if f"session={SESSION_COOKIE}" not in self.headers.get("Cookie", ""):
+                    self.reply(200, '{"estado":0}')
+                    return
+
+                data = json.loads(body)
+                day = data["dia"]
+                time.sleep(stub.latency)
+
+                with stub.lock:
+                    if stub.failures[day] > 0:
+                        stub.failures[day] -= 1
+                        self.reply(503, "")
+                        return
+
+                    if day in stub.rejected:
+                        self.reply(200, '{"estado":0}')
+                        return
+
+                    stub.registered[day] = (data["entrada"], data["salida"])
+
+                self.reply(200, '{"estado":1}')
+
+        return Handler
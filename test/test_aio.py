@@ -0,0 +1,116 @@
+"""Asyncio facades testing module"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from test.hiper_stub import HiperStub
+from timekeeper.aio import AsyncHiper, AsyncTimes
+from timekeeper.database import close_db, connections
+from timekeeper.model import DAYS_AGGREGATE, Day, Times
+
+TEST_DATABASE = "test_aio.db"
+TEST_DATE = datetime(2023, 4, 8, 9)
+COROUTINES = 300
+
+
+async def work_day(times: AsyncTimes, offset: int) -> int:
+    """Registers an eight hours day, then reads it back"""
+    start = TEST_DATE + timedelta(days=offset)
+    await times.register_in(start)
+    await times.register_out(start + timedelta(hours=8))
+    days = await times.query_days({"date_from": f"{start.date()} 00:00:00"})
+    return len(days)
+
+
+async def heartbeat(stop: asyncio.Event) -> int:
+    """Counts the loop iterations until stopped"""
+    beats = 0
+    while not stop.is_set():
+        beats += 1
+        await asyncio.sleep(0)
+    return beats
+
+
+async def concurrent_days() -> None:
+    """Runs the work days concurrently while the loop keeps running"""
+    async with AsyncTimes(TEST_DATABASE, batch_size=64) as times:
+        stop = asyncio.Event()
+        beats = asyncio.create_task(heartbeat(stop))
+
+        counts = await asyncio.gather(
+            *(work_day(times, offset) for offset in range(COROUTINES))
+        )
+        stop.set()
+
+        assert len(counts) == COROUTINES
+        assert await beats > COROUTINES
+
+        punches = [row async for row in times.iter_all()]
+        assert len(punches) == 2 * COROUTINES
+        assert punches[0] == ("IN", TEST_DATE)
+
+        days = [day async for day in times.iter_days(mode=DAYS_AGGREGATE)]
+        assert len(days) == COROUTINES
+        assert all(day.hours == timedelta(hours=8) for day in days)
+
+        async for _ in times.iter_all():
+            break
+        assert len(await times.query_all()) == 2 * COROUTINES
+
+
+def test_async_times():
+    """Tests hundreds of coroutines share the database without blocking"""
+    asyncio.run(concurrent_days())
+    os.remove(TEST_DATABASE)
+
+
+async def iterate_beside(times: Times) -> None:
+    """Iterates asynchronously while another thread uses the shared connection"""
+    async with AsyncTimes(TEST_DATABASE, batch_size=2) as async_times:
+        await async_times.register_rows(
+            [("IN", TEST_DATE + timedelta(hours=hour)) for hour in range(5)]
+        )
+        async for _ in async_times.iter_all():
+            query = asyncio.get_running_loop().run_in_executor(None, times.query_all)
+            rows = await asyncio.wait_for(query, 5)
+            assert len(rows) == 5
+            break
+
+
+def test_async_times_own_connection():
+    """Tests the facade neither holds nor closes the shared connection"""
+    times = Times(TEST_DATABASE)
+    shared = connections.connect(TEST_DATABASE)
+
+    asyncio.run(iterate_beside(times))
+
+    assert connections.connect(TEST_DATABASE) is shared
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+async def inform_days(url: str, days: list) -> dict:
+    """Logs in and informs the days"""
+    async with AsyncHiper(url=url, rate=0) as remote:
+        await remote.login("user", "password")
+        return {day.day_str(): comm async for day, comm in remote.register_days(days)}
+
+
+def test_async_hiper():
+    """Tests days are informed concurrently from coroutines"""
+    days = [
+        Day(
+            TEST_DATE + timedelta(days=offset),
+            TEST_DATE + timedelta(days=offset, hours=8),
+            timedelta(hours=8),
+        )
+        for offset in range(20)
+    ]
+
+    with HiperStub(latency=0.01) as stub:
+        results = asyncio.run(inform_days(stub.url, days))
+
+    assert len(results) == 20
+    assert all(results.values())
+    assert stub.requests["/login.cgi"] == 1
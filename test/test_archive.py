@@ -0,0 +1,87 @@
+"""Archive testing module"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, populate
+from timekeeper.database import close_db
+from timekeeper.model import (
+    DAYS_AGGREGATE,
+    DAYS_STREAM,
+    DAYS_SUMMARY,
+    TimekeeperModelError,
+    Times,
+)
+from timekeeper.report import rollup
+
+TEST_DATABASE = "test_archive.db"
+TEST_ARCHIVE = "test_archive.archive.db"
+SPEC = DatasetSpec(years=1, cross_midnight_ratio=0.05, unclosed_ratio=0.05)
+FILTERS = [
+    None,
+    {"date_from": "2015-03-01 00:00:00"},
+    {"date_from": "2015-09-01 00:00:00", "date_to": "2015-10-01 00:00:00"},
+]
+
+
+def paged(times: Times, filters: dict = None, descending: bool = False) -> list:
+    """Returns the registers read page by page"""
+    rows, cursor = [], None
+    while True:
+        page = times.query_page(filters, 97, cursor, descending)
+        rows.extend(page.rows)
+        if page.cursor is None:
+            return rows
+        cursor = page.cursor
+
+
+def snapshot(times: Times) -> list:
+    """Returns every way of reading the registers"""
+    return [
+        (
+            list(times.iter_all(filters)),
+            paged(times, filters),
+            paged(times, filters, descending=True)[::-1],
+            *(
+                list(times.iter_rows(filters, mode))
+                for mode in (DAYS_STREAM, DAYS_AGGREGATE, DAYS_SUMMARY)
+            ),
+        )
+        for filters in FILTERS
+    ] + [list(rollup(times))]
+
+
+def test_archive():
+    """Tests archiving keeps every read unchanged and archived days frozen"""
+    populate(TEST_DATABASE, SPEC)
+    times = Times(TEST_DATABASE)
+    times.register_row("IN", datetime(2015, 5, 31, 22))
+    times.register_row("OUT", datetime(2015, 6, 1, 2))
+    expected = snapshot(times)
+
+    moved, cutoff = times.archive(datetime(2015, 6, 1), TEST_ARCHIVE)
+    assert moved > 0
+    # The night shift crossing the bound stays with its day
+    assert cutoff == 20150531
+    assert snapshot(times) == expected
+
+    with pytest.raises(TimekeeperModelError):
+        times.register_row("IN", datetime(2015, 4, 1, 9))
+    with pytest.raises(TimekeeperModelError):
+        times.archive(datetime(2015, 7, 1), "elsewhere.db")
+    with pytest.raises(TimekeeperModelError):
+        times.query_page(after="not a cursor")
+
+    assert times.archive(datetime(2015, 3, 1), TEST_ARCHIVE) == (0, cutoff)
+    moved, _ = times.archive(datetime(2015, 8, 1), TEST_ARCHIVE)
+    assert moved > 0
+    assert snapshot(times) == expected
+
+    times.rebuild_summary()
+    assert snapshot(times) == expected
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+    os.remove(TEST_ARCHIVE)
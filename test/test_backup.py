@@ -0,0 +1,89 @@
+"""Backup testing module"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, populate
+from timekeeper.backup import (
+    TimekeeperBackupError,
+    backup,
+    list_snapshots,
+    restore,
+    snapshot,
+    verify,
+)
+from timekeeper.database import close_db
+from timekeeper.model import Times
+
+SPEC = DatasetSpec(years=2)
+
+
+def test_backup_while_writing(tmp_path):
+    """Tests backups stay consistent while another connection writes"""
+    database = str(tmp_path / "live.db")
+    populate(database, SPEC)
+    punches = len(Times(database).query_all())
+    stop = threading.Event()
+
+    def write() -> None:
+        times = Times(database)
+        date = datetime(2030, 1, 1)
+        while not stop.is_set():
+            times.register_row("IN", date)
+            date += timedelta(minutes=5)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for pages in (None, 16):
+            target = str(tmp_path / f"backup-{pages}.db")
+            backup(database, target, pages=pages)
+            verify(target)
+            assert len(Times(target).query_all()) >= punches
+            close_db(target)
+    finally:
+        stop.set()
+        writer.join()
+        close_db(database)
+
+
+def test_snapshots_rotated(tmp_path):
+    """Tests snapshots are compacted copies, only the newest ones kept"""
+    database = str(tmp_path / "timekeeper.db")
+    Times(database).register_in(datetime(2023, 4, 8, 9))
+    close_db(database)
+    directory = str(tmp_path / "snapshots")
+
+    for hour in range(4):
+        snapshot(database, directory, keep=2, when=datetime(2023, 4, 8, hour))
+
+    snapshots = list_snapshots(database, directory)
+    assert [path[-18:] for path in snapshots] == [
+        "20230408-020000.db",
+        "20230408-030000.db",
+    ]
+    verify(snapshots[-1])
+
+
+def test_restore(tmp_path):
+    """Tests restores verify the backup and keep the replaced database"""
+    database = str(tmp_path / "timekeeper.db")
+    target = str(tmp_path / "backup.db")
+    times = Times(database)
+    times.register_in(datetime(2023, 4, 8, 9))
+    backup(database, target)
+    times.register_out(datetime(2023, 4, 8, 17))
+
+    corrupt = tmp_path / "corrupt.db"
+    corrupt.write_bytes(b"not a database" * 100)
+    with pytest.raises(TimekeeperBackupError):
+        restore(str(corrupt), database)
+
+    previous = restore(target, database)
+    assert Times(database).query_all() == [("IN", datetime(2023, 4, 8, 9))]
+    assert len(Times(previous).query_all()) == 2
+
+    close_db(database)
+    close_db(previous)
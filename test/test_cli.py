@@ -0,0 +1,188 @@
+"""CLI testing module"""
+
+import json
+import os
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from timekeeper.cli import cli
+from timekeeper.database import close_db
+
+HEAVY_MODULES = (
+    "tabulate",
+    "requests",
+    "requests_toolbelt",
+    "timekeeper.remote",
+    "timekeeper.fill",
+    "timekeeper.report",
+)
+
+CHECK_IMPORTS = f"""
+import shlex
+import sys
+from timekeeper.cli import cli
+for command in sys.argv[1:]:
+    try:
+        cli(shlex.split(command))
+    except SystemExit:
+        pass
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+assert not loaded, loaded
+"""
+
+
+def test_start_skips_heavy_imports(tmp_path):
+    """Tests clocking in neither imports reporting modules nor needs a config"""
+    subprocess.run(
+        [sys.executable, "-c", CHECK_IMPORTS, "start -d '2023-04-08 09:00'"],
+        env={**os.environ, "HOME": str(tmp_path)},
+        check=True,
+    )
+
+    assert (tmp_path / "timekeeper.db").exists()
+
+
+def test_show_skips_heavy_imports(tmp_path):
+    """Tests showing days imports neither the remote nor the table modules"""
+    (tmp_path / "timekeeper.conf").write_text("[hiper]\nuser = test\n")
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHECK_IMPORTS,
+            "start -d '2023-04-08 09:00'",
+            "stop -d '2023-04-08 17:30'",
+            "show -f csv",
+        ],
+        env={**os.environ, "HOME": str(tmp_path)},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert "2023-04-08,09:00,17:30,30600" in result.stdout
+
+
+def test_show_formats(tmp_path, monkeypatch):
+    """Tests machine readable show formats stream every row"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    runner = CliRunner()
+
+    runner.invoke(cli, ["start", "-d", "2023-04-08 09:00"], catch_exceptions=False)
+    runner.invoke(cli, ["stop", "-d", "2023-04-08 17:30"], catch_exceptions=False)
+
+    result = runner.invoke(cli, ["show", "-f", "csv"], catch_exceptions=False)
+    assert result.output == "day,in,out,seconds\n2023-04-08,09:00,17:30,30600\n"
+
+    result = runner.invoke(cli, ["show", "-r", "-f", "jsonl"], catch_exceptions=False)
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"operation": "IN", "date": "2023-04-08 09:00:00"},
+        {"operation": "OUT", "date": "2023-04-08 17:30:00"},
+    ]
+
+    result = runner.invoke(cli, ["show", "-r", "-f", "tsv"], catch_exceptions=False)
+    assert result.output.splitlines()[1] == "IN\t2023-04-08 09:00:00"
+
+    close_db(str(tmp_path / "timekeeper.db"))
+
+
+def test_date_range(tmp_path, monkeypatch):
+    """Tests show and export filter the registers by whole days"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    runner = CliRunner()
+
+    for day in ("2023-04-07", "2023-04-08"):
+        runner.invoke(cli, ["start", "-d", f"{day} 09:00"], catch_exceptions=False)
+        runner.invoke(cli, ["stop", "-d", f"{day} 17:00"], catch_exceptions=False)
+
+    result = runner.invoke(
+        cli, ["show", "-df", "2023-04-08", "-f", "csv"], catch_exceptions=False
+    )
+    assert result.output.splitlines()[1:] == ["2023-04-08,09:00,17:00,28800"]
+
+    result = runner.invoke(
+        cli,
+        ["export", "-df", "2023-04-08", "-dt", "2023-04-08"],
+        catch_exceptions=False,
+    )
+    assert result.output.splitlines()[1:] == [
+        "IN,2023-04-08 09:00:00",
+        "OUT,2023-04-08 17:00:00",
+    ]
+
+    close_db(str(tmp_path / "timekeeper.db"))
+
+
+def test_import_archived_day(tmp_path, monkeypatch):
+    """Tests importing into an archived day fails without a traceback"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    runner = CliRunner()
+
+    runner.invoke(cli, ["start", "-d", "2023-04-07 09:00"], catch_exceptions=False)
+    runner.invoke(cli, ["stop", "-d", "2023-04-07 17:00"], catch_exceptions=False)
+    runner.invoke(cli, ["archive", "-b", "2023-04-08"], catch_exceptions=False)
+
+    source = tmp_path / "punches.csv"
+    source.write_text("operation,date\nIN,2023-04-06 09:00\n")
+    result = runner.invoke(cli, ["import", str(source)])
+    assert result.exit_code == 1
+    assert result.output.startswith("Error: Nothing imported.")
+
+    close_db(str(tmp_path / "timekeeper.db"))
+
+
+def test_show_pages(tmp_path, monkeypatch):
+    """Tests raw registers are paged with the cursor printed to stderr"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    runner = CliRunner(mix_stderr=False)
+
+    for day in range(10, 13):
+        runner.invoke(cli, ["start", "-d", f"2023-04-{day} 09:00"])
+        runner.invoke(cli, ["stop", "-d", f"2023-04-{day} 17:00"])
+
+    show = ["show", "-r", "-f", "csv", "-l", "4"]
+    first = runner.invoke(cli, show, catch_exceptions=False)
+    assert first.stdout.splitlines()[1:] == [
+        "IN,2023-04-10 09:00:00",
+        "OUT,2023-04-10 17:00:00",
+        "IN,2023-04-11 09:00:00",
+        "OUT,2023-04-11 17:00:00",
+    ]
+    cursor = first.stderr.split()[-1]
+
+    second = runner.invoke(cli, show + ["--after", cursor], catch_exceptions=False)
+    assert second.stdout.splitlines()[1:] == [
+        "IN,2023-04-12 09:00:00",
+        "OUT,2023-04-12 17:00:00",
+    ]
+    assert second.stderr == ""
+
+    newest = runner.invoke(cli, show + ["-l", "1", "--reverse"])
+    assert newest.stdout.splitlines()[1:] == ["OUT,2023-04-12 17:00:00"]
+
+    assert runner.invoke(cli, ["show", "-l", "4"]).exit_code == 2
+
+    invalid = runner.invoke(cli, show + ["--after", "!!!"])
+    assert invalid.exit_code == 2
+    assert "Invalid page cursor: !!!" in invalid.stderr
+
+    close_db(str(tmp_path / "timekeeper.db"))
+
+
+def test_journal_backend(tmp_path, monkeypatch):
+    """Tests the journal backend clocks without opening the database"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / "timekeeper.conf").write_text("[database]\nbackend = journal\n")
+    runner = CliRunner()
+
+    runner.invoke(cli, ["start", "-d", "2023-04-08 09:00"], catch_exceptions=False)
+    runner.invoke(cli, ["stop", "-d", "2023-04-08 17:00"], catch_exceptions=False)
+    assert not (tmp_path / "timekeeper.db").exists()
+
+    result = runner.invoke(cli, ["show", "-f", "csv"], catch_exceptions=False)
+    assert result.output.splitlines()[1:] == ["2023-04-08,09:00,17:00,28800"]
+    assert (tmp_path / "timekeeper.db.punches").stat().st_size == 0
+
+    close_db(str(tmp_path / "timekeeper.db"))
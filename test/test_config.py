@@ -0,0 +1,80 @@
+"""Configuration testing module"""
+
+from configparser import ConfigParser
+from datetime import date, time, timedelta
+
+import pytest
+
+from timekeeper.config import (
+    CONFIG_TEMPLATE,
+    ConfigError,
+    daily_target,
+    database_settings,
+    fill_calendar,
+    fill_template,
+)
+from timekeeper.database import DatabaseSettings
+from timekeeper.fill import Calendar
+
+
+def test_database_settings():
+    """Tests the [database] section overrides the default settings"""
+    conf = ConfigParser()
+    assert database_settings(conf) == DatabaseSettings()
+
+    conf.read_string("[database]\njournal_mode = delete\nbusy_timeout = 100\n")
+    settings = database_settings(conf)
+    assert settings.journal_mode == "DELETE"
+    assert settings.busy_timeout == 100
+    assert settings.synchronous == DatabaseSettings.synchronous
+
+
+@pytest.mark.parametrize(
+    "section", ["journal_mode = fast", "cache_size = big", "page_size = 4096"]
+)
+def test_invalid_database_settings(section: str):
+    """Tests invalid [database] settings are reported"""
+    conf = ConfigParser()
+    conf.read_string(f"[database]\n{section}\n")
+    with pytest.raises(ConfigError):
+        database_settings(conf)
+
+
+def test_daily_target():
+    """Tests the [report] daily target accepts hours and H:MM"""
+    conf = ConfigParser()
+    assert daily_target(conf) == timedelta(hours=8)
+
+    conf.read_string("[report]\ndaily_target = 7:30\n")
+    assert daily_target(conf) == timedelta(hours=7, minutes=30)
+
+    conf.set("report", "daily_target", "6.5")
+    assert daily_target(conf) == timedelta(hours=6, minutes=30)
+
+
+def test_fill_settings():
+    """Tests the [fill] section sets the calendar and default template"""
+    conf = ConfigParser()
+    assert fill_calendar(conf) == Calendar()
+    with pytest.raises(ConfigError):
+        fill_template(conf=conf)
+
+    conf.read_string(CONFIG_TEMPLATE)
+    assert fill_calendar(conf) == Calendar()
+    with pytest.raises(ConfigError):
+        fill_template(conf=conf)
+
+    conf.read_string(
+        "[fill]\nweekdays = sat,sun\nholidays = 2023-04-08\ntemplate = 10:00-14:00\n"
+    )
+    assert fill_calendar(conf) == Calendar(
+        frozenset({5, 6}), frozenset({date(2023, 4, 8)})
+    )
+    assert fill_template(conf=conf) == [(time(10), time(14))]
+    assert fill_template("08:00-12:00", conf) == [(time(8), time(12))]
+
+    conf.set("fill", "weekdays", "weekend")
+    with pytest.raises(ConfigError):
+        fill_calendar(conf)
+    with pytest.raises(ConfigError):
+        fill_template("8-12", conf)
@@ -0,0 +1,88 @@
+"""Daemon testing module"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from timekeeper.cli.session import CliSession
+from timekeeper.client import DaemonClient, DaemonUnavailable, socket_path
+from timekeeper.daemon import DaemonServer, GroupCommitter
+from timekeeper.database import close_db
+from timekeeper.model import Times
+from timekeeper.times import to_timestamp
+
+START = datetime(2023, 4, 8, 9)
+
+
+@pytest.fixture(name="server")
+def fixture_server(tmp_path):
+    """Serves a temporary database from a background thread"""
+    database = str(tmp_path / "timekeeper.db")
+    server = DaemonServer(database)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+    close_db(database)
+
+
+def test_group_commit(tmp_path):
+    """Tests punches queued during a commit are written in a single one"""
+    database = str(tmp_path / "timekeeper.db")
+    times = Times(database)
+    committer = GroupCommitter(times)
+
+    with times.transaction():
+        futures = [
+            committer.submit("IN", START + timedelta(minutes=minute))
+            for minute in range(50)
+        ]
+    for future in futures:
+        future.result()
+    committer.close()
+
+    assert committer.commits <= 2
+    assert len(times.query_all()) == 50
+    close_db(database)
+
+
+def test_daemon_requests(server):
+    """Tests concurrent clients clock in and read through the daemon"""
+    client = DaemonClient(server.path)
+    dates = [START + timedelta(days=day) for day in range(20)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda date: client.register("start", date), dates))
+        list(
+            executor.map(
+                lambda date: client.register("stop", date + timedelta(hours=8)), dates
+            )
+        )
+
+    assert server.committer.commits <= 40
+    assert [operation for operation, _ in client.iter_all()] == ["IN", "OUT"] * 20
+    assert list(client.iter_rows({"date_from": "2023-04-27 00:00:00"})) == [
+        (to_timestamp(dates[-1]), 8 * 3600)
+    ]
+
+
+def test_session_falls_back(tmp_path):
+    """Tests the CLI session writes itself when no daemon answers"""
+    database = str(tmp_path / "timekeeper.db")
+    with open(socket_path(database), "w", encoding="utf8"):
+        pass
+
+    with pytest.raises(DaemonUnavailable):
+        DaemonClient(socket_path(database)).request({"command": "ping"})
+
+    session = CliSession(database)
+    session.register("start", START)
+    assert session.daemon is None
+    assert list(session.iter_all()) == [("IN", START)]
+    close_db(database)
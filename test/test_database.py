@@ -1,7 +1,21 @@
 """Database testing module"""
+import multiprocessing
 import os
+import threading
+from datetime import datetime, timedelta
 
-from timekeeper.database import open_db
+import pytest
+
+from timekeeper.database import (
+    ConnectionManager,
+    DatabaseSettings,
+    TimekeeperDatabaseError,
+    close_db,
+    connections,
+    open_connection,
+    open_db,
+)
+from timekeeper.model import Session, SyncLedger, Times
 
 TEST_DATABASE = "test_database.db"
 TEST_TABLE = "test_times"
@@ -14,6 +28,9 @@ INSERT_STATEMENT = f"INSERT INTO `{TEST_TABLE}` (`operation`,`date`) VALUES (?,
 DROP_STATEMENT = f"DROP TABLE `{TEST_TABLE}`;"
 SELECT_STATEMENT = f"SELECT `operation`,`date` FROM `{TEST_TABLE}`;"
 
+WRITERS = 4
+PUNCHES_PER_WRITER = 50
+
 
 def test_open_db():
     """Tests database connections"""
@@ -25,3 +42,123 @@ def test_open_db():
         cursor.execute(DROP_STATEMENT)
 
     os.remove(TEST_DATABASE)
+
+
+def test_plain_file_names(tmp_path):
+    """Tests file names are opened as they are, read-only ones by URI"""
+    database = str(tmp_path / "odd?name#1.db")
+    with open_db(database) as cursor:
+        cursor.execute(CREATE_STATEMENT)
+
+    assert os.listdir(tmp_path) == ["odd?name#1.db"]
+
+    connection = open_connection(database, DatabaseSettings(read_only=True))
+    assert connection.uri
+    with pytest.raises(Exception, match="readonly"):
+        connection.execute(DROP_STATEMENT)
+    connection.close()
+
+
+def test_connection_manager_reuses_connection():
+    """Tests the same connection is shared for a database path"""
+    manager = ConnectionManager()
+
+    first = manager.connect(TEST_DATABASE)
+    second = manager.connect(TEST_DATABASE)
+    assert first is second
+
+    manager.close_all()
+    os.remove(TEST_DATABASE)
+
+
+def test_connection_manager_transaction():
+    """Tests transaction scopes commit once and roll back on errors"""
+    manager = ConnectionManager()
+
+    with manager.cursor(TEST_DATABASE) as cursor:
+        cursor.execute(CREATE_STATEMENT)
+
+    with manager.transaction(TEST_DATABASE):
+        with manager.cursor(TEST_DATABASE) as cursor:
+            cursor.execute(INSERT_STATEMENT, ("IN", "2023-01-01 08:00:00"))
+        with manager.cursor(TEST_DATABASE) as cursor:
+            cursor.execute(INSERT_STATEMENT, ("OUT", "2023-01-01 17:00:00"))
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction(TEST_DATABASE):
+            with manager.cursor(TEST_DATABASE) as cursor:
+                cursor.execute(INSERT_STATEMENT, ("IN", "2023-01-02 08:00:00"))
+            raise RuntimeError()
+
+    with manager.cursor(TEST_DATABASE) as cursor:
+        cursor.execute(SELECT_STATEMENT)
+        assert len(cursor.fetchall()) == 2
+
+    with pytest.raises(TimekeeperDatabaseError):
+        with manager.cursor(TEST_DATABASE) as cursor:
+            cursor.execute(INSERT_STATEMENT, ("LUNCH", "2023-01-02 12:00:00"))
+
+    manager.close_all()
+    os.remove(TEST_DATABASE)
+
+
+def test_models_share_manager(tmp_path):
+    """Tests every model runs on the connection manager it is given"""
+    database = str(tmp_path / "models.db")
+    manager = ConnectionManager()
+
+    models = [
+        model(database, manager=manager) for model in (Session, Times, SyncLedger)
+    ]
+    with manager.transaction(database):
+        for model in models:
+            with model.transaction(), model.connection() as cursor:
+                assert cursor.connection is manager.connect(database)
+
+    assert database not in connections._connections
+    manager.close_all()
+
+
+def test_busy_statement_retried(tmp_path):
+    """Tests a write finding the database locked is retried until it is free"""
+    database = str(tmp_path / "busy.db")
+    settings = DatabaseSettings(busy_timeout=0, retries=8, backoff=0.01)
+
+    holder = open_connection(database, DatabaseSettings())
+    holder.execute(CREATE_STATEMENT)
+    holder.execute("BEGIN IMMEDIATE;")
+    threading.Timer(0.05, holder.commit).start()
+
+    with open_db(database, settings) as cursor:
+        cursor.execute(INSERT_STATEMENT, ("IN", "2023-01-01 08:00:00"))
+
+    assert len(holder.execute(SELECT_STATEMENT).fetchall()) == 1
+    holder.close()
+
+
+def punch(database: str, writer: int) -> int:
+    """Registers punches one commit at a time, as separate tk calls would"""
+    times = Times(database)
+    start = datetime(2023, 1, 2, 8) + timedelta(minutes=writer)
+    for punch_number in range(PUNCHES_PER_WRITER):
+        times.register_row(
+            "IN" if punch_number % 2 == 0 else "OUT",
+            start + timedelta(hours=punch_number),
+        )
+    close_db(database)
+    return PUNCHES_PER_WRITER
+
+
+def test_concurrent_writers(tmp_path):
+    """Tests processes punching at once lose no punch"""
+    database = str(tmp_path / "stress.db")
+    Times(database)
+    close_db(database)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(WRITERS) as pool:
+        written = pool.starmap(punch, [(database, writer) for writer in range(WRITERS)])
+
+    times = Times(database)
+    assert sum(written) == len(times.query_all()) == WRITERS * PUNCHES_PER_WRITER
+    close_db(database)
@@ -0,0 +1,108 @@
+"""Integrity checks testing module"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+from timekeeper.database import close_db
+from timekeeper.model import (
+    DUPLICATE,
+    MISDATED,
+    OVERLAPPING,
+    UNPAIRED_IN,
+    UNPAIRED_OUT,
+    ZERO_LENGTH,
+    Times,
+)
+
+TEST_DATABASE = "test_doctor.db"
+TODAY = 20230420
+
+
+def punches(day: int, *clocks: str) -> list:
+    """Returns the punches of an April day, alternating from IN"""
+    return [
+        (operation, datetime(2023, 4, day, *map(int, clock.split(":"))))
+        for operation, clock in clocks
+    ]
+
+
+def test_doctor():
+    """Tests every issue is found and repaired into alternating punches"""
+    times = Times(TEST_DATABASE)
+    times.register_rows(
+        [("OUT", datetime(2023, 4, 3, 8))]
+        + punches(3, ("IN", "9:00"), ("OUT", "17:00"))
+        + punches(4, ("IN", "9:00"), ("IN", "9:05"), ("OUT", "17:00"))
+        + punches(5, ("IN", "9:00"), ("IN", "11:00"), ("OUT", "17:00"))
+        + punches(6, ("IN", "9:00"), ("OUT", "12:00"), ("OUT", "17:00"))
+        + punches(7, ("IN", "9:00"), ("OUT", "9:00"))
+        + punches(10, ("IN", "9:00"), ("OUT", "17:00"))
+        + punches(11, ("IN", "9:00"))
+    )
+    with sqlite3.connect(TEST_DATABASE) as connection:
+        connection.execute(
+            "UPDATE `times` SET `day` = 20230409 WHERE `date` = '2023-04-10 09:00:00';"
+        )
+    connection.close()
+
+    assert times.count_issues(TODAY) == {
+        MISDATED: 1,
+        ZERO_LENGTH: 2,
+        DUPLICATE: 1,
+        OVERLAPPING: 1,
+        UNPAIRED_OUT: 2,
+        UNPAIRED_IN: 1,
+    }
+    assert times.count_issues(20230411) == {
+        MISDATED: 1,
+        ZERO_LENGTH: 2,
+        DUPLICATE: 1,
+        OVERLAPPING: 1,
+        UNPAIRED_OUT: 2,
+    }
+
+    assert times.fix_issues(TODAY) == {
+        MISDATED: 1,
+        ZERO_LENGTH: 2,
+        DUPLICATE: 1,
+        OVERLAPPING: 1,
+        UNPAIRED_OUT: 2,
+    }
+    assert times.count_issues(TODAY) == {UNPAIRED_IN: 1}
+
+    operations = [operation for operation, _ in times.query_all()]
+    assert operations == ["IN", "OUT"] * 5 + ["IN"]
+    assert [worked for _, worked in times.iter_rows()] == [
+        8 * 3600,
+        8 * 3600,
+        8 * 3600,
+        8 * 3600,
+        8 * 3600,
+        0,
+    ]
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_doctor_keeps_conflicting_misdated(caplog):
+    """Tests a misdated punch colliding with another one is kept and logged"""
+    times = Times(TEST_DATABASE)
+    times.register_rows(punches(12, ("IN", "9:00"), ("OUT", "17:00")))
+    with sqlite3.connect(TEST_DATABASE) as connection:
+        connection.execute(
+            """INSERT INTO `times` (`operation`, `date`, `ts`, `day`)
+            SELECT `operation`, `date`, `ts` + 60, `day` FROM `times`
+            WHERE `operation` = 'IN';"""
+        )
+    connection.close()
+
+    assert times.count_issues(TODAY)[MISDATED] == 1
+    assert MISDATED not in times.fix_issues(TODAY)
+    assert "another punch has its time" in caplog.text
+    assert times.count_issues(TODAY) == {MISDATED: 1}
+    assert len(times.query_all()) == 3
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
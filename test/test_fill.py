@@ -0,0 +1,109 @@
+"""Fill testing module"""
+
+import os
+import sqlite3
+from datetime import date, datetime, time
+
+import pytest
+
+from timekeeper.database import close_db
+from timekeeper.fill import Calendar, day_punches, parse_template
+from timekeeper.model import Times
+
+TEST_DATABASE = "test_fill.db"
+
+
+def test_parse_template():
+    """Tests templates keep their periods in order, the last may end tomorrow"""
+    assert parse_template("09:00-13:00, 14:00-18:00") == [
+        (time(9), time(13)),
+        (time(14), time(18)),
+    ]
+    assert day_punches(date(2023, 4, 7), parse_template("22:00-06:00")) == [
+        ("IN", datetime(2023, 4, 7, 22)),
+        ("OUT", datetime(2023, 4, 8, 6)),
+    ]
+
+    for template in (
+        "9-13",
+        "09:00",
+        "09:00-09:00",
+        "09:00-13:00,12:00-18:00",
+        "14:00-18:00,09:00-13:00",
+        "22:00-02:00,09:00-10:00",
+        "08:00-20:00,22:00-09:00",
+    ):
+        with pytest.raises(ValueError):
+            parse_template(template)
+
+
+def test_calendar():
+    """Tests the calendar skips the other weekdays and the holidays"""
+    calendar = Calendar.parse("Mon, tue wednesday", "2023-04-11")
+    assert list(calendar.workdays(date(2023, 4, 9), date(2023, 4, 19))) == [
+        date(2023, 4, 10),
+        date(2023, 4, 12),
+        date(2023, 4, 17),
+        date(2023, 4, 18),
+        date(2023, 4, 19),
+    ]
+
+    with pytest.raises(ValueError):
+        Calendar.parse("mon,someday")
+    with pytest.raises(ValueError):
+        Calendar.parse(holidays="2023-02-30")
+
+
+def test_register_days():
+    """Tests filling skips worked days and registers the rest at once"""
+    times = Times(TEST_DATABASE)
+    times.register_rows(
+        [
+            ("IN", datetime(2023, 4, 11, 10)),
+            ("OUT", datetime(2023, 4, 11, 19)),
+            ("OUT", datetime(2023, 4, 12, 1)),
+        ]
+    )
+
+    template = parse_template("09:00-13:00,14:00-18:00")
+    days = Calendar().workdays(date(2023, 4, 10), date(2023, 4, 14))
+    assert times.register_days(day_punches(day, template) for day in days) == 4
+
+    punches = times.query_all({"date_from": "2023-04-11", "date_to": "2023-04-13"})
+    assert punches[:3] == [
+        ("IN", datetime(2023, 4, 11, 10)),
+        ("OUT", datetime(2023, 4, 11, 19)),
+        ("OUT", datetime(2023, 4, 12, 1)),
+    ]
+    assert punches[3:] == day_punches(date(2023, 4, 12), template)
+    assert [str(day) for day in times.query_days()][-1].startswith("2023-04-14")
+    assert times.register_days(day_punches(day, template) for day in days) == 0
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_register_days_locks_writers(monkeypatch):
+    """Tests no other writer can punch between the worked check and the fill"""
+    times = Times(TEST_DATABASE)
+    times.register_rows([("IN", datetime(2023, 4, 7, 9))])
+    archive_state = times.archive_state
+    locked = []
+
+    def punch_meanwhile():
+        other = sqlite3.connect(TEST_DATABASE, timeout=0)
+        try:
+            other.execute("BEGIN IMMEDIATE;")
+        except sqlite3.OperationalError:
+            locked.append(True)
+        finally:
+            other.close()
+        return archive_state()
+
+    monkeypatch.setattr(times, "archive_state", punch_meanwhile)
+    template = parse_template("09:00-13:00")
+    assert times.register_days([day_punches(date(2023, 4, 10), template)]) == 1
+    assert locked == [True]
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
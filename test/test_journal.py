@@ -0,0 +1,78 @@
+"""Punch journal testing module"""
+
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from timekeeper.database import close_db
+from timekeeper.journal import RECORD, PunchJournal, journal_path
+from timekeeper.model import Session, Times
+
+TEST_DATE = datetime(2023, 4, 8, 9)
+
+NO_FCNTL = """
+import sys
+sys.modules["fcntl"] = None
+from timekeeper.cli import cli
+cli(["start", "-d", "2023-04-08 09:00"])
+"""
+
+
+def test_journal_compacted_on_read(tmp_path):
+    """Tests journaled punches reach the database on the next read only"""
+    database = str(tmp_path / "journal.db")
+    journal = PunchJournal(journal_path(database))
+    times = Times(database, journal=journal)
+
+    journal.append("IN", TEST_DATE)
+    journal.append("OUT", TEST_DATE.replace(hour=17))
+    journal.append("OUT", TEST_DATE.replace(hour=17))
+    assert journal.pending()
+
+    assert times.query_all() == [
+        ("IN", TEST_DATE),
+        ("OUT", TEST_DATE.replace(hour=17)),
+    ]
+    assert not journal.pending()
+    assert list(times.iter_rows()) == [(1680944400, 8 * 3600)]
+
+    close_db(database)
+
+
+def test_journal_torn_record(tmp_path):
+    """Tests a record torn by a crash is skipped and then overwritten"""
+    journal = PunchJournal(str(tmp_path / "torn.punches"))
+    journal.append("IN", TEST_DATE)
+    with open(journal.path, "ab") as file:
+        file.write(b"O\0\0")
+
+    assert journal.read() == [("IN", TEST_DATE)]
+    journal.append("OUT", TEST_DATE.replace(hour=17))
+    assert journal.read() == [("IN", TEST_DATE), ("OUT", TEST_DATE.replace(hour=17))]
+    size = (tmp_path / "torn.punches").stat().st_size
+    assert size == 2 * RECORD.size
+
+
+def test_memory_database():
+    """Tests in-memory databases keep their data until closed"""
+    Times(":memory:").register_in(TEST_DATE)
+    Session(":memory:").set_cookies({"session": "1"})
+
+    assert Times(":memory:").query_all() == [("IN", TEST_DATE)]
+    assert Session(":memory:").get_cookies() == {"session": "1"}
+
+    close_db(":memory:")
+    assert Times(":memory:").query_all() == []
+    close_db(":memory:")
+
+
+def test_sqlite_backend_without_fcntl(tmp_path):
+    """Tests clocking in with the SQLite backend needs no fcntl"""
+    subprocess.run(
+        [sys.executable, "-c", NO_FCNTL],
+        env={**os.environ, "HOME": str(tmp_path)},
+        check=True,
+    )
+
+    assert (tmp_path / "timekeeper.db").exists()
@@ -0,0 +1,60 @@
+"""Profiling testing module"""
+
+import json
+import os
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from timekeeper import profiling
+from timekeeper.cli import cli
+from timekeeper.database import close_db
+from timekeeper.model import Times
+
+TEST_DATABASE = "test_profiling.db"
+
+
+def test_profiler_records_stages():
+    """Tests model calls and their statements are recorded, then unhooked"""
+    register_row = Times.register_row
+    profiler = profiling.enable()
+    try:
+        times = Times(TEST_DATABASE)
+        times.register_row("IN", datetime(2023, 4, 8, 9))
+        times.register_row("OUT", datetime(2023, 4, 8, 17))
+        assert len(list(times.iter_days())) == 1
+    finally:
+        assert profiling.disable() is profiler
+
+    assert Times.register_row is register_row
+    assert profiler.stages["times.register_row"].calls == 2
+    assert profiler.stages["times.iter_rows"].rows == 1
+    assert profiler.stages["day.from_timestamps"].calls == 1
+    assert profiler.stages["db.connect"].calls == 1
+
+    statements = [name for name in profiler.stages if name.startswith("sql: ")]
+    assert any("INSERT OR IGNORE INTO `times`" in name for name in statements)
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_profile_trace(tmp_path, monkeypatch):
+    """Tests the CLI writes a JSON trace of the command"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    trace = tmp_path / "trace.json"
+
+    result = CliRunner().invoke(
+        cli,
+        ["--profile-output", str(trace), "start", "-d", "2023-04-08 09:00"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert profiling.profiler is None
+
+    report = json.loads(trace.read_text())
+    names = {event["name"] for event in report["traceEvents"]}
+    assert "times.register_row" in names
+    assert report["stages"][0]["stage"] == "total"
+
+    close_db(str(tmp_path / "timekeeper.db"))
@@ -0,0 +1,78 @@
+"""Remote testing module"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from test.hiper_stub import HiperStub
+from timekeeper.model import Day
+from timekeeper.remote import Hiper, TimekeeperRemoteError
+
+TEST_DATE = datetime(2023, 4, 8, 9)
+
+
+def make_days(count: int) -> list:
+    """Returns consecutive eight hours days"""
+    return [
+        Day(
+            TEST_DATE + timedelta(days=offset),
+            TEST_DATE + timedelta(days=offset, hours=8),
+            timedelta(hours=8),
+        )
+        for offset in range(count)
+    ]
+
+
+def test_register_days():
+    """Tests days are informed concurrently reusing the login cookies"""
+    days = make_days(20)
+
+    with HiperStub(latency=0.01) as stub:
+        remote = Hiper(url=stub.url, rate=0)
+        remote.login("user", "password")
+        results = dict(
+            (day.day_str(), comm) for day, comm in remote.register_days(days)
+        )
+
+    assert all(results.values())
+    assert len(results) == 20
+    assert stub.registered["2023-04-08"] == ("09:00", "17:00")
+    assert stub.requests["/login.cgi"] == 1
+
+
+def test_register_days_failures():
+    """Tests transient failures are retried and refused days reported"""
+    days = make_days(3)
+
+    with HiperStub(failures={"2023-04-08": 2}, rejected=["2023-04-09"]) as stub:
+        remote = Hiper(url=stub.url, backoff=0, rate=0)
+        cookies = remote.login("user", "password")
+        results = dict(
+            (day.day_str(), comm) for day, comm in remote.register_days(days, cookies)
+        )
+
+    assert results == {"2023-04-08": True, "2023-04-09": False, "2023-04-10": True}
+    assert stub.requests["/aj_reloj.cgi"] == 5
+
+
+def test_register_date_unreachable():
+    """Tests unreachable servers are reported as failed days"""
+    remote = Hiper(url="http://127.0.0.1:9", retries=0, timeout=1)
+    assert remote.register_date(make_days(1)[0], {}) is False
+
+
+def test_login_retried_whole():
+    """Tests a failed login is posted again with its whole body"""
+    with HiperStub(login_failures=2) as stub:
+        remote = Hiper(url=stub.url, backoff=0, rate=0)
+        assert remote.login("user", "password") == {"session": "stub-session"}
+
+    assert stub.requests["/login.cgi"] == 3
+
+
+def test_login_refused():
+    """Tests a login granting no session raises a remote error"""
+    with HiperStub(login_failures=5) as stub:
+        remote = Hiper(url=stub.url, retries=1, backoff=0, rate=0)
+        with pytest.raises(TimekeeperRemoteError):
+            remote.login("user", "password")
@@ -0,0 +1,76 @@
+"""Rollup report testing module"""
+
+import os
+from datetime import date, datetime, timedelta
+
+from benchmarks.datagen import DatasetSpec, populate
+from timekeeper.database import close_db
+from timekeeper.model import DAYS_STREAM, Times
+from timekeeper.report import MONTH, WEEK, rollup
+from timekeeper.times import day_key, from_timestamp
+
+TEST_DATABASE = "test_report.db"
+SPEC = DatasetSpec(years=2, cross_midnight_ratio=0.05, unclosed_ratio=0.05)
+
+
+def brute_totals(times: Times, first: date, last: date) -> tuple:
+    """Sums every day of a range"""
+    worked = [
+        day_worked
+        for first_in, day_worked in times.iter_rows(mode=DAYS_STREAM)
+        if first <= from_timestamp(first_in).date() <= last and day_worked
+    ]
+    return sum(worked), len(worked)
+
+
+def test_range_totals():
+    """Tests range totals match summing the days, also after changes"""
+    populate(TEST_DATABASE, SPEC)
+    times = Times(TEST_DATABASE)
+    ranges = [
+        (SPEC.start.date(), SPEC.end.date()),
+        (date(2015, 3, 1), date(2015, 3, 31)),
+        (date(2015, 12, 24), date(2016, 1, 10)),
+        (date(2016, 2, 29), date(2016, 2, 29)),
+    ]
+
+    times.refresh_summary()
+    for first, last in ranges:
+        assert times.range_totals(day_key(first), day_key(last)) == brute_totals(
+            times, first, last
+        )
+
+    times.register_row("IN", datetime(2015, 3, 1, 9))
+    times.register_row("OUT", datetime(2015, 3, 1, 12))
+    times.remove_register(datetime(2015, 12, 28))
+    times.refresh_summary()
+    for first, last in ranges:
+        assert times.range_totals(day_key(first), day_key(last)) == brute_totals(
+            times, first, last
+        )
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_rollup():
+    """Tests periods are clipped to the range and compared to the target"""
+    times = Times(TEST_DATABASE)
+    for day in (date(2023, 3, 31), date(2023, 4, 3), date(2023, 4, 4)):
+        start = datetime.combine(day, datetime.min.time()) + timedelta(hours=9)
+        times.register_row("IN", start)
+        times.register_row("OUT", start + timedelta(hours=9))
+
+    weeks = list(rollup(times, WEEK, daily_target=timedelta(hours=8)))
+    assert [(week.period, week.days, week.balance) for week in weeks] == [
+        ("2023-W13", 1, 3600),
+        ("2023-W14", 2, 7200),
+    ]
+
+    months = list(rollup(times, MONTH, date_from=date(2023, 4, 4)))
+    assert [(month.period, month.days, month.worked) for month in months] == [
+        ("2023-04", 1, 9 * 3600)
+    ]
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
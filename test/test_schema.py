@@ -0,0 +1,48 @@
+"""Schema testing module"""
+import os
+from datetime import datetime
+
+from timekeeper.database import close_db, open_db
+from timekeeper.model import Times
+from timekeeper.schema import SCHEMA_VERSION
+
+TEST_DATABASE = "test_schema.db"
+
+LEGACY_CREATE_STATEMENT = """CREATE TABLE IF NOT EXISTS `times` (
+                    id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+                    operation TEXT CHECK( operation IN ('IN','OUT') ) NOT NULL,
+                    date TIMESTAMP);"""
+LEGACY_INSERT_STATEMENT = "INSERT INTO `times` (`operation`,`date`) VALUES (?, ?);"
+
+
+def test_legacy_database_migration():
+    """Tests legacy databases are migrated in place to the indexed layout"""
+    with open_db(TEST_DATABASE) as cursor:
+        cursor.execute(LEGACY_CREATE_STATEMENT)
+        cursor.execute(LEGACY_INSERT_STATEMENT, ("IN", datetime(2023, 4, 8, 9)))
+        cursor.execute(LEGACY_INSERT_STATEMENT, ("OUT", datetime(2023, 4, 8, 17)))
+        cursor.execute(LEGACY_INSERT_STATEMENT, ("IN", datetime(2023, 4, 9, 9)))
+
+    times = Times(TEST_DATABASE)
+
+    with times.connection() as cursor:
+        cursor.execute("PRAGMA user_version;")
+        assert cursor.fetchone()[0] == SCHEMA_VERSION
+
+        cursor.execute("SELECT `ts`, `day` FROM `times` ORDER BY `id`;")
+        assert cursor.fetchall() == [
+            (1680944400, 20230408),
+            (1680973200, 20230408),
+            (1681030800, 20230409),
+        ]
+
+        cursor.execute("EXPLAIN QUERY PLAN DELETE FROM `times` WHERE `day` = 1;")
+        assert "idx_times_day" in str(cursor.fetchall())
+
+    assert len(times.query_all({"date_from": "2023-04-08 12:00:00"})) == 2
+
+    times.remove_register(datetime(2023, 4, 8))
+    assert times.query_all() == [("IN", datetime(2023, 4, 9, 9))]
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
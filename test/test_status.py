@@ -0,0 +1,77 @@
+"""Live status testing module"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+from timekeeper.database import close_db
+from timekeeper.journal import PunchJournal, journal_path
+from timekeeper.model import Times
+from timekeeper.status import StatusWatcher, status_line
+from timekeeper.times import day_key, to_timestamp
+
+TEST_DATABASE = "test_status.db"
+NOW = datetime(2023, 4, 8, 12)
+
+
+def punch(operation: str, date: datetime) -> None:
+    """Registers a punch from another connection, like another process"""
+    with sqlite3.connect(TEST_DATABASE) as connection:
+        connection.execute(
+            "INSERT INTO `times` (`operation`,`date`,`ts`,`day`) VALUES (?,?,?,?);",
+            (operation, date, to_timestamp(date), day_key(date)),
+        )
+    connection.close()
+
+
+def test_status_watcher():
+    """Tests the watcher only reads again after other connections commit"""
+    times = Times(TEST_DATABASE)
+    times.register_rows([("IN", datetime(2023, 4, 8, 8)), ("OUT", NOW)])
+    watcher = StatusWatcher(times)
+
+    status = watcher.poll(NOW)
+    assert status.worked_at(NOW) == 4 * 3600
+    assert status_line(status, NOW) == "Today 4:00, out"
+    for _ in range(10):
+        watcher.poll(NOW)
+    assert watcher.reads == 1
+
+    punch("IN", datetime(2023, 4, 8, 13))
+    later = datetime(2023, 4, 8, 14, 30)
+    status = watcher.poll(later)
+    assert watcher.reads == 2
+    assert status.worked_at(later) == 5.5 * 3600
+    assert status_line(status, later) == "Today 5:30, in since 13:00"
+
+    # The open cycle counts from midnight on the next day
+    tomorrow = datetime(2023, 4, 9, 1)
+    status = watcher.poll(tomorrow)
+    assert watcher.reads == 3
+    assert status.worked_at(tomorrow) == 3600
+    assert status_line(status, tomorrow) == "Today 1:00, in since 2023-04-08 13:00"
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_status_watcher_journal():
+    """Tests the watcher reads again after compacting journaled punches"""
+    journal = PunchJournal(journal_path(TEST_DATABASE))
+    times = Times(TEST_DATABASE, journal=journal)
+    watcher = StatusWatcher(times)
+
+    assert watcher.poll(NOW).open_since is None
+    assert watcher.poll(NOW).open_since is None
+    assert watcher.reads == 1
+
+    journal.append("IN", datetime(2023, 4, 8, 9))
+    assert watcher.poll(NOW).open_since == to_timestamp(datetime(2023, 4, 8, 9))
+    assert watcher.reads == 2
+
+    watcher.poll(NOW)
+    assert watcher.reads == 2
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+    os.remove(journal_path(TEST_DATABASE))
@@ -0,0 +1,49 @@
+"""Sync testing module"""
+
+import os
+from datetime import datetime, timedelta
+
+from test.hiper_stub import HiperStub
+from timekeeper.database import close_db
+from timekeeper.model import Day, SyncLedger
+from timekeeper.remote import Hiper
+from timekeeper.sync import synchronize
+
+TEST_DATABASE = "test_sync.db"
+TEST_DATE = datetime(2023, 4, 8, 9)
+
+
+def make_day(offset: int, hours: int = 8) -> Day:
+    """Returns a day starting at nine"""
+    in_dt = TEST_DATE + timedelta(days=offset)
+    return Day(in_dt, in_dt + timedelta(hours=hours), timedelta(hours=hours))
+
+
+def test_synchronize_only_changed_days():
+    """Tests only new, changed or failed days are sent"""
+    ledger = SyncLedger(TEST_DATABASE)
+    days = [make_day(offset) for offset in range(5)]
+
+    with HiperStub(rejected=["2023-04-10"]) as stub:
+        remote = Hiper(url=stub.url, rate=0)
+        remote.login("user", "password")
+
+        first = list(synchronize(ledger, remote, days))
+        assert len(first) == 5
+        assert len(ledger.outbox()) == 1
+
+        stub.rejected.clear()
+        days[3] = make_day(3, hours=6)
+        second = {
+            day.day_str(): sent for day, sent in synchronize(ledger, remote, days)
+        }
+        assert second == {"2023-04-10": True, "2023-04-11": True}
+
+        assert list(synchronize(ledger, remote, days)) == []
+        assert stub.requests["/aj_reloj.cgi"] == 7
+        assert stub.registered["2023-04-11"] == ("09:00", "15:00")
+
+    assert not ledger.outbox()
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
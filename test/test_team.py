@@ -0,0 +1,67 @@
+"""Team report testing module"""
+
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, build_datasets
+from timekeeper.database import close_db, connections
+from timekeeper.model import DAYS_STREAM, Times
+from timekeeper.team import (
+    SCHEMA_OUTDATED,
+    TimekeeperTeamError,
+    discover,
+    team_reports,
+)
+
+SPEC = DatasetSpec(users=3, years=1)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("fresh", [False, True])
+def test_team_reports(tmp_path, workers: int, fresh: bool):
+    """Tests parallel reports match each user days, in order"""
+    databases = build_datasets(str(tmp_path), SPEC)
+    assert discover([str(tmp_path)]) == databases
+
+    if fresh:
+        for database in databases:
+            Times(database).refresh_summary()
+            close_db(database)
+
+    filters = {"date_from": "2015-06-01 00:00:00", "date_to": "2015-06-30 23:59:59"}
+    reports = list(team_reports(databases, filters, workers))
+
+    assert [report.user for report in reports] == ["user000", "user001", "user002"]
+    for database, report in zip(databases, reports):
+        assert report.days == Times(database).query_days(filters, mode=DAYS_STREAM)
+        assert database not in connections.settings
+        close_db(database)
+
+
+def test_team_report_missing_database(tmp_path):
+    """Tests unreadable databases are reported, never created"""
+    database = str(tmp_path / "missing.db")
+
+    with pytest.raises(TimekeeperTeamError, match="missing.db"):
+        list(team_reports([database]))
+    assert not os.path.exists(database)
+
+
+def test_team_report_outdated_database(tmp_path):
+    """Tests older databases are reported as such, left as they are"""
+    databases = build_datasets(str(tmp_path), SPEC)
+    legacy = str(tmp_path / "legacy.db")
+    connection = sqlite3.connect(legacy)
+    connection.execute("CREATE TABLE `times` (`operation` TEXT, `date` TIMESTAMP);")
+    connection.close()
+
+    reports = list(team_reports([legacy] + databases, workers=1))
+
+    assert reports[0].user == "legacy"
+    assert reports[0].problem == SCHEMA_OUTDATED
+    assert not reports[0].days
+    assert all(report.problem is None and report.days for report in reports[1:])
+    with sqlite3.connect(legacy) as connection:
+        assert connection.execute("PRAGMA user_version;").fetchone()[0] == 0
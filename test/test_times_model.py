@@ -1,8 +1,19 @@
 """Database testing module"""
+import builtins
 import os
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
 
-from timekeeper.model import Times
+from timekeeper.database import close_db
+from timekeeper.model import (
+    DAYS_AGGREGATE,
+    DAYS_STREAM,
+    Day,
+    DayBatch,
+    Times,
+    load_numpy,
+    sessionize,
+)
 
 TEST_DATABASE = "test.db"
 TEST_DATE = datetime(2023, 4, 8)
@@ -19,4 +30,189 @@ def test_times_instance():
     times.remove_register(TEST_DATE)
     times.clear_db()
 
+    close_db(TEST_DATABASE)
     os.remove(TEST_DATABASE)
+
+
+def test_sessionize():
+    """Tests punches are paired into days in a single ordered pass"""
+    punches = [
+        ("IN", datetime(2023, 4, 8, 9)),
+        ("OUT", datetime(2023, 4, 8, 13)),
+        ("IN", datetime(2023, 4, 8, 14)),
+        ("OUT", datetime(2023, 4, 8, 18)),
+        ("OUT", datetime(2023, 4, 8, 19)),
+        ("IN", datetime(2023, 4, 9, 22)),
+        ("OUT", datetime(2023, 4, 10, 2)),
+        ("IN", datetime(2023, 4, 11, 8)),
+        ("IN", datetime(2023, 4, 11, 9)),
+        ("OUT", datetime(2023, 4, 11, 10)),
+        ("IN", datetime(2023, 4, 12, 9)),
+    ]
+
+    assert list(sessionize(punches)) == [
+        Day(datetime(2023, 4, 8, 9), datetime(2023, 4, 8, 17), timedelta(hours=8)),
+        Day(datetime(2023, 4, 9, 22), datetime(2023, 4, 10, 2), timedelta(hours=4)),
+        Day(datetime(2023, 4, 11, 8), datetime(2023, 4, 11, 9), timedelta(hours=1)),
+        Day(datetime(2023, 4, 12, 9), datetime(2023, 4, 12, 9), timedelta()),
+    ]
+
+
+def test_query_days_orders_registers():
+    """Tests days are built from time ordered registers"""
+
+    times = Times(TEST_DATABASE)
+    times.register_out(datetime(2023, 4, 8, 17))
+    times.register_in(datetime(2023, 4, 8, 9))
+
+    assert times.query_days() == [
+        Day(datetime(2023, 4, 8, 9), datetime(2023, 4, 8, 17), timedelta(hours=8))
+    ]
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_days_modes_match():
+    """Tests every days query mode matches Day.from_dict on a shared corpus"""
+
+    times = Times(TEST_DATABASE)
+    expected = []
+    for offset in range(30):
+        day = TEST_DATE + timedelta(days=offset)
+        registers = {"IN": [], "OUT": []}
+        for hour_in, hour_out in ((9, 13), (14, 17 + offset % 3)):
+            registers["IN"].append(day.replace(hour=hour_in))
+            registers["OUT"].append(day.replace(hour=hour_out))
+            times.register_in(day.replace(hour=hour_in))
+            times.register_out(day.replace(hour=hour_out))
+        expected.append(Day.from_dict(registers))
+
+    filters = {"date_from": "2023-04-10 00:00:00", "date_to": "2023-04-20 23:59:59"}
+
+    assert times.query_days(mode=DAYS_STREAM) == expected
+    assert times.query_days(mode=DAYS_AGGREGATE) == expected
+    assert times.query_days(filters, mode=DAYS_STREAM) == expected[2:13]
+    assert times.query_days(filters, mode=DAYS_AGGREGATE) == expected[2:13]
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_aggregate_days_edge_cases():
+    """Tests the aggregate mode pairs punches like the stream mode"""
+
+    times = Times(TEST_DATABASE)
+    for operation, date in (
+        ("IN", datetime(2023, 4, 9, 22)),
+        ("OUT", datetime(2023, 4, 10, 2)),
+        ("IN", datetime(2023, 4, 11, 8)),
+        ("IN", datetime(2023, 4, 11, 9)),
+        ("OUT", datetime(2023, 4, 11, 10)),
+        ("OUT", datetime(2023, 4, 11, 11)),
+        ("IN", datetime(2023, 4, 12, 9)),
+    ):
+        times.register_row(operation, date)
+
+    assert times.query_days(mode=DAYS_AGGREGATE) == times.query_days(mode=DAYS_STREAM)
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_stream_days_closes_range_shift():
+    """Tests a shift crossing the end of the range is counted whole"""
+
+    times = Times(TEST_DATABASE)
+    times.register_in(datetime(2023, 4, 9, 22))
+    times.register_out(datetime(2023, 4, 10, 2))
+    times.register_in(datetime(2023, 4, 10, 9))
+    times.register_out(datetime(2023, 4, 10, 17))
+
+    filters = {"date_from": "2023-04-09 00:00:00", "date_to": "2023-04-09 23:59:59"}
+    assert times.query_days(filters, mode=DAYS_STREAM) == [
+        Day(datetime(2023, 4, 9, 22), datetime(2023, 4, 10, 2), timedelta(hours=4))
+    ]
+    assert times.query_days(filters, mode=DAYS_STREAM) == times.query_days(filters)
+    assert times.query_days(filters, mode=DAYS_AGGREGATE) == times.query_days(filters)
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_summary_days_incremental():
+    """Tests the daily summary follows registers and removals"""
+
+    times = Times(TEST_DATABASE)
+    times.register_in(datetime(2023, 4, 8, 9))
+    times.register_out(datetime(2023, 4, 8, 17))
+    times.register_in(datetime(2023, 4, 9, 22))
+
+    assert times.query_days() == times.query_days(mode=DAYS_AGGREGATE)
+    assert times.query_days()[-1].hours == timedelta()
+
+    times.register_out(datetime(2023, 4, 10, 2))
+    assert times.query_days()[-1].hours == timedelta(hours=4)
+
+    times.remove_register(datetime(2023, 4, 10))
+    assert times.query_days()[-1].hours == timedelta()
+
+    times.remove_register(datetime(2023, 4, 9))
+    assert times.query_days() == [
+        Day(datetime(2023, 4, 8, 9), datetime(2023, 4, 8, 17), timedelta(hours=8))
+    ]
+
+    times.rebuild_summary()
+    assert times.query_days({"date_from": "2023-04-09 00:00:00"}) == []
+
+    times.clear_db()
+    assert times.query_days() == []
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_day_batch():
+    """Tests the columnar days container"""
+
+    days = [
+        Day(datetime(2023, 4, 8, 9), datetime(2023, 4, 8, 15), timedelta(hours=6)),
+        Day(datetime(2023, 4, 9, 22), datetime(2023, 4, 10, 2), timedelta(hours=4)),
+        Day(datetime(2023, 4, 10, 8), datetime(2023, 4, 10, 16), timedelta(hours=8)),
+    ]
+    batch = DayBatch.from_days(days)
+
+    assert len(batch) == 3
+    assert batch == days
+    assert batch[1] == days[1]
+    assert list(batch.tuples()) == [day.tuple() for day in days]
+    assert batch.time_out_str(1) == "02:00"
+    assert batch.total() == timedelta(hours=18)
+    assert batch.worked_seconds() == 18 * 3600
+    assert batch.average() == timedelta(hours=6)
+    assert batch.percentile(50) == timedelta(hours=6)
+    assert batch.percentile(75) == timedelta(hours=7)
+    assert not DayBatch()
+
+
+def test_day_batch_without_numpy(monkeypatch):
+    """Tests the pure Python totals try to import NumPy only once"""
+    imports = []
+    real_import = builtins.__import__
+
+    def counting_import(name, *args, **kwargs):
+        imports.append(name)
+        return real_import(name, *args, **kwargs)
+
+    load_numpy.cache_clear()
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.setattr(builtins, "__import__", counting_import)
+
+    batch = DayBatch([(0, 3600), (86400, 7200)])
+    assert batch.total() == timedelta(hours=3)
+    assert batch.average() == timedelta(hours=1.5)
+    assert batch.percentile(50) == timedelta(hours=1.5)
+    assert imports.count("numpy") == 1
+
+    monkeypatch.undo()
+    load_numpy.cache_clear()
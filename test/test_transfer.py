@@ -0,0 +1,65 @@
+"""Import and export testing module"""
+
+import io
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from timekeeper.database import close_db
+from timekeeper.model import Times
+from timekeeper.transfer import (
+    CSV,
+    JSONL,
+    TimekeeperImportError,
+    read_punches,
+    write_punches,
+)
+
+TEST_DATABASE = "test_transfer.db"
+PUNCHES = [
+    ("IN", datetime(2023, 4, 8, 9)),
+    ("OUT", datetime(2023, 4, 8, 13)),
+    ("IN", datetime(2023, 4, 8, 14)),
+    ("OUT", datetime(2023, 4, 8, 18)),
+]
+
+
+@pytest.mark.parametrize("file_format", [CSV, JSONL])
+def test_round_trip(file_format: str):
+    """Tests exported punches import back, skipping the present ones"""
+    stream = io.StringIO()
+    assert write_punches(stream, PUNCHES, file_format) == 4
+
+    times = Times(TEST_DATABASE)
+    times.register_row(*PUNCHES[0])
+
+    stream.seek(0)
+    assert times.register_rows(read_punches(stream, file_format), chunk_size=3) == 3
+    assert times.query_all() == PUNCHES
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_invalid_import_rolls_back():
+    """Tests an invalid record aborts the whole import"""
+    stream = io.StringIO("operation,date\nIN,2023-04-08 09:00\nOUT,yesterday\n")
+
+    times = Times(TEST_DATABASE)
+    with pytest.raises(TimekeeperImportError, match="Line 3"):
+        times.register_rows(read_punches(stream, CSV))
+    assert times.query_all() == []
+
+    close_db(TEST_DATABASE)
+    os.remove(TEST_DATABASE)
+
+
+def test_import_converts_offsets():
+    """Tests dates with an UTC offset are imported as naive local time"""
+    stream = io.StringIO('{"operation": "IN", "date": "2023-04-08T09:00:00+02:00"}\n')
+
+    (operation, date), *_ = read_punches(stream, JSONL)
+    expected = datetime(2023, 4, 8, 7, tzinfo=timezone.utc).astimezone()
+    assert (operation, date) == ("IN", expected.replace(tzinfo=None))
+    assert date.tzinfo is None
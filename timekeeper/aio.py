@@ -0,0 +1,163 @@
+"""Asyncio facades module
+
+Lets event loop services use the models and the remote server without
+blocking. Every SQLite call of an AsyncTimes runs on its own single thread
+executor, through a connection of its own, so concurrent coroutines queue
+there instead of stalling the loop or the other users of the database.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from timekeeper.database import ConnectionManager, connections
+from timekeeper.model import DAYS_SUMMARY, Day, DayBatch, PunchPage, Times
+from timekeeper.remote import Hiper
+
+BATCH_SIZE = 500
+
+
+class AsyncTimes:
+    """Awaitable facade of a Times model"""
+
+    def __init__(self, database: str, batch_size: int = BATCH_SIZE):
+        self.database = database
+        self.batch_size = batch_size
+        self.manager = ConnectionManager()
+        if database in connections.settings:
+            self.manager.configure(database, connections.settings[database])
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="timekeeper-db"
+        )
+        self.times = self.executor.submit(Times, database, manager=self.manager)
+
+    async def __aenter__(self) -> "AsyncTimes":
+        await self.run(lambda times: None)
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def run(self, call: Callable[[Times], object]):
+        """Runs a call on the model in the database thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, lambda: call(self.times.result())
+        )
+
+    async def close(self) -> None:
+        """Closes its connection, then the database thread"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.manager.close_all)
+        self.executor.shutdown()
+
+    async def register_row(self, operation: str, date: datetime) -> None:
+        """Registers a punch"""
+        await self.run(lambda times: times.register_row(operation, date))
+
+    async def register_rows(self, rows: Iterable[Tuple[str, datetime]]) -> int:
+        """Registers many punches in a single commit"""
+        rows = list(rows)
+        return await self.run(lambda times: times.register_rows(rows))
+
+    async def register_in(self, date: datetime = None) -> None:
+        """Registers an IN punch, now by default"""
+        await self.run(lambda times: times.register_in(date))
+
+    async def register_out(self, date: datetime = None) -> None:
+        """Registers an OUT punch, now by default"""
+        await self.run(lambda times: times.register_out(date))
+
+    async def remove_register(self, date: datetime) -> None:
+        """Deletes the punches of a day"""
+        await self.run(lambda times: times.remove_register(date))
+
+    async def query_all(self, filters: dict = None) -> List[list]:
+        """Returns the filtered punches"""
+        return await self.run(lambda times: times.query_all(filters))
+
+    async def query_days(
+        self, filters: dict = None, mode: str = DAYS_SUMMARY
+    ) -> DayBatch:
+        """Returns the filtered days"""
+        return await self.run(lambda times: times.query_days(filters, mode))
+
+    async def iter_all(self, filters: dict = None) -> AsyncIterator[tuple]:
+        """Yields the filtered punches, fetched page by page
+
+        Each page is a separate call, so the connection is free for other
+        calls between them.
+        """
+        cursor: Optional[str] = None
+        while True:
+            page: PunchPage = await self.run(
+                lambda times: times.query_page(filters, self.batch_size, cursor)
+            )
+            for row in page.rows:
+                yield row
+            if page.cursor is None:
+                return
+            cursor = page.cursor
+
+    async def iter_days(
+        self, filters: dict = None, mode: str = DAYS_SUMMARY
+    ) -> AsyncIterator[Day]:
+        """Yields the filtered days, read in a single call into a DayBatch"""
+        days = await self.query_days(filters, mode)
+        for index, day in enumerate(days):
+            yield day
+            if (index + 1) % self.batch_size == 0:
+                await asyncio.sleep(0)
+
+
+class AsyncHiper:
+    """Awaitable facade of the remote server client
+
+    Requests run on a thread pool sized to the client workers, sharing its
+    pooled session, rate limits and cookies.
+    """
+
+    def __init__(self, hiper: Hiper = None, **options):
+        self.hiper = hiper or Hiper(**options)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.hiper.workers, thread_name_prefix="timekeeper-remote"
+        )
+
+    async def __aenter__(self) -> "AsyncHiper":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def run(self, call: Callable, *args):
+        """Runs a blocking client call on the request threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(call, *args))
+
+    async def close(self) -> None:
+        """Waits for running requests and closes the session"""
+        await asyncio.get_running_loop().run_in_executor(
+            None, partial(self.executor.shutdown, wait=True)
+        )
+        self.hiper.session.close()
+
+    async def login(self, username: str, password: str) -> dict:
+        """Logs in, returning the session cookies"""
+        return await self.run(self.hiper.login, username, password)
+
+    async def register_date(self, day: Day, cookies: dict = None) -> bool:
+        """Informs a day, telling whether the server accepted it"""
+        return await self.run(self.hiper.register_date, day, cookies)
+
+    async def register_days(
+        self, days: Iterable[Day], cookies: dict = None
+    ) -> AsyncIterator[Tuple[Day, bool]]:
+        """Informs days concurrently, yielding each result as it completes"""
+
+        async def register(day: Day) -> Tuple[Day, bool]:
+            return day, await self.register_date(day, cookies)
+
+        for result in asyncio.as_completed([register(day) for day in days]):
+            yield await result
@@ -0,0 +1,190 @@
+"""Backup module
+
+Copies a live database through SQLite, never through the file, so a punch
+committed meanwhile is either fully in the copy or not at all. Backups use
+the online backup API from a read-only connection. On WAL databases a
+single step reads one snapshot while writers go on. Other journal modes
+copy page batches, releasing the lock between them. Snapshots are
+compacted copies made with VACUUM INTO, rotated to keep the newest ones.
+Copies are written to a temporary file and renamed, so a target is always
+a complete database. Every backup and snapshot is a full copy, none is
+incremental: the backup API has no way to copy only the pages changed
+since a previous copy, and a timekeeper database stays small.
+"""
+
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from timekeeper.database import close_db, read_only_uri
+from timekeeper.schema import SCHEMA_VERSION
+
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.005
+SNAPSHOT_KEEP = 7
+SNAPSHOT_STAMP = "%Y%m%d-%H%M%S"
+TEMPORARY_SUFFIX = ".tmp"
+PRE_RESTORE_SUFFIX = ".pre-restore"
+
+
+class TimekeeperBackupError(Exception):
+    """backup module exception"""
+
+
+def open_source(database: str) -> sqlite3.Connection:
+    """Opens a read-only connection to a database that must exist"""
+    if not os.path.exists(database):
+        raise TimekeeperBackupError(f"{database} does not exist")
+    return sqlite3.connect(read_only_uri(database), uri=True)
+
+
+def replace_with(target: str, write: Callable[[str], None]) -> None:
+    """Writes a temporary file with write, then renames it over the target"""
+    temporary = target + TEMPORARY_SUFFIX
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    try:
+        write(temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def backup(
+    database: str,
+    target: str,
+    pages: Optional[int] = None,
+    progress: Callable[[int, int, int], None] = None,
+) -> None:
+    """Copies a live database to target with the online backup API
+
+    WAL databases are copied in a single step by default, other databases
+    in batches of BACKUP_PAGES pages.
+    """
+    source = open_source(database)
+
+    def write(path: str) -> None:
+        destination = sqlite3.connect(path)
+        try:
+            batch = pages
+            if batch is None:
+                mode = source.execute("PRAGMA journal_mode;").fetchone()[0]
+                batch = -1 if mode == "wal" else BACKUP_PAGES
+
+            source.backup(
+                destination, pages=batch, progress=progress, sleep=BACKUP_SLEEP
+            )
+            destination.execute("PRAGMA journal_mode = DELETE;")
+        finally:
+            destination.close()
+
+    try:
+        replace_with(target, write)
+    except sqlite3.Error as db_error:
+        raise TimekeeperBackupError(f"Backup failed: {db_error}") from db_error
+    finally:
+        source.close()
+
+
+def snapshot_name(database: str, when: datetime) -> str:
+    """Returns the file name of a database snapshot taken at a time"""
+    stem = os.path.splitext(os.path.basename(database))[0]
+    return f"{stem}-{when.strftime(SNAPSHOT_STAMP)}.db"
+
+
+def list_snapshots(database: str, directory: str) -> List[str]:
+    """Returns the snapshots of a database in a directory, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+
+    stem = re.escape(os.path.splitext(os.path.basename(database))[0])
+    pattern = re.compile(rf"{stem}-\d{{8}}-\d{{6}}\.db")
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if pattern.fullmatch(name)
+    ]
+
+
+def snapshot(
+    database: str, directory: str, keep: int = SNAPSHOT_KEEP, when: datetime = None
+) -> str:
+    """Writes a compacted snapshot, then deletes all but the keep newest
+
+    Returns the path of the new snapshot.
+    """
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, snapshot_name(database, when or datetime.now()))
+    source = open_source(database)
+
+    try:
+        replace_with(target, lambda path: source.execute("VACUUM INTO ?;", (path,)))
+    except sqlite3.Error as db_error:
+        raise TimekeeperBackupError(f"Snapshot failed: {db_error}") from db_error
+    finally:
+        source.close()
+
+    for old in list_snapshots(database, directory)[:-keep]:
+        os.remove(old)
+
+    return target
+
+
+def verify(path: str) -> None:
+    """Fails unless a file is an intact timekeeper database this version reads"""
+    try:
+        connection = open_source(path)
+    except sqlite3.Error as db_error:
+        raise TimekeeperBackupError(f"{path}: {db_error}") from db_error
+
+    try:
+        problems = [row[0] for row in connection.execute("PRAGMA integrity_check;")]
+        version = connection.execute("PRAGMA user_version;").fetchone()[0]
+        tables = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'times';"
+        ).fetchone()
+    except sqlite3.Error as db_error:
+        raise TimekeeperBackupError(f"{path}: {db_error}") from db_error
+    finally:
+        connection.close()
+
+    if problems != ["ok"]:
+        raise TimekeeperBackupError(f"{path} is corrupt: {'; '.join(problems[:5])}")
+    if tables is None:
+        raise TimekeeperBackupError(f"{path} is not a timekeeper database")
+    if version > SCHEMA_VERSION:
+        raise TimekeeperBackupError(f"{path} was written by a newer timekeeper")
+
+
+def restore(source: str, database: str) -> Optional[str]:
+    """Verifies a backup, then copies it over the database
+
+    The database is copied aside first and replaced through the backup API,
+    inside a single transaction, so other connections never see a partly
+    restored database. Older backups are migrated on their next use.
+    Returns the path of the copy of the replaced database, if there was one.
+    """
+    verify(source)
+    close_db(database)
+
+    previous = None
+    if os.path.exists(database):
+        previous = database + PRE_RESTORE_SUFFIX
+        backup(database, previous)
+
+    reader = open_source(source)
+    destination = sqlite3.connect(database, timeout=5)
+    try:
+        reader.backup(destination)
+    except sqlite3.Error as db_error:
+        raise TimekeeperBackupError(f"Restore failed: {db_error}") from db_error
+    finally:
+        destination.close()
+        reader.close()
+
+    return previous
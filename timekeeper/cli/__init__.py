@@ -1,20 +1,93 @@
 """CLI interface module"""
 
+from importlib import import_module
+from typing import List, Optional
+
 import click
 
-from timekeeper.cli.drop import drop
-from timekeeper.cli.session import CliSession
-from timekeeper.cli.show import show
-from timekeeper.cli.start import start
-from timekeeper.cli.stop import stop
+COMMANDS = {
+    "start": "timekeeper.cli.start:start",
+    "stop": "timekeeper.cli.stop:stop",
+    "show": "timekeeper.cli.show:show",
+    "drop": "timekeeper.cli.drop:drop",
+    "rebuild": "timekeeper.cli.rebuild:rebuild",
+    "sync": "timekeeper.cli.sync:sync",
+    "import": "timekeeper.cli.imports:import_punches",
+    "export": "timekeeper.cli.export:export",
+    "daemon": "timekeeper.cli.daemon:daemon",
+    "team-report": "timekeeper.cli.team:team_report",
+    "report": "timekeeper.cli.report:report",
+    "archive": "timekeeper.cli.archive:archive",
+    "status": "timekeeper.cli.status:status",
+    "doctor": "timekeeper.cli.doctor:doctor",
+    "backup": "timekeeper.cli.backup:backup",
+    "restore": "timekeeper.cli.backup:restore",
+    "fill": "timekeeper.cli.fill:fill",
+}
+
+
+class LazyGroup(click.Group):
+    """Group importing each command module only when the command is used"""
+
+    def __init__(self, *args, lazy_commands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+
+        module_name, command_name = self.lazy_commands[cmd_name].split(":")
+        command = getattr(import_module(module_name), command_name)
+        self.add_command(command, cmd_name)
+        del self.lazy_commands[cmd_name]
+        return command
 
 
-@click.group(commands=[start, stop, show, drop])
+def start_profiling(context: click.Context, output: Optional[str]) -> None:
+    """Profiles the command, reporting once it finishes"""
+    from timekeeper import profiling
+
+    profiler = profiling.enable(trace=bool(output))
+
+    def report() -> None:
+        profiling.disable()
+        if output:
+            profiler.write_trace(output)
+        else:
+            click.echo(profiler.report(), err=True)
+
+    context.call_on_close(report)
+
+
+@click.group(cls=LazyGroup, lazy_commands=dict(COMMANDS))
 @click.version_option(None, "--version", package_name="timekeeper")
+@click.option(
+    "--profile",
+    "profile",
+    is_flag=True,
+    envvar="TIMEKEEPER_PROFILE",
+    help="Prints where the command spent its time",
+)
+@click.option(
+    "--profile-output",
+    "profile_output",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar="TIMEKEEPER_PROFILE_OUTPUT",
+    help="Writes the profile as a JSON trace file",
+)
 @click.pass_context
-def cli(context=None) -> None:
+def cli(context=None, profile: bool = False, profile_output: str = None) -> None:
     """CLI Runner group"""
 
+    if profile or profile_output:
+        start_profiling(context, profile_output)
+
+    from timekeeper.cli.session import CliSession
+
     context.obj = CliSession()
 
 
@@ -0,0 +1,46 @@
+"""Archive Interface module"""
+
+import os
+from datetime import datetime
+
+import click
+
+from timekeeper.cli.session import CliSession
+from timekeeper.report import key_date
+
+ARCHIVE_SUFFIX = ".archive.db"
+
+
+def default_archive(database: str) -> str:
+    """Returns the archive path next to a database"""
+    return os.path.splitext(database)[0] + ARCHIVE_SUFFIX
+
+
+@click.command()
+@click.option(
+    "--before",
+    "-b",
+    "before",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    required=True,
+    help="Moves the registers of the days before this one",
+)
+@click.option(
+    "--path",
+    "-p",
+    "path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Archive database, next to the registers one by default",
+)
+@click.pass_obj
+def archive(session: CliSession, before: datetime, path: str = None) -> None:
+    """Moves old registers to an archive database
+
+    Days whose work cycle is still open are kept. Archived days are still
+    shown and reported, but can no longer be changed.
+    """
+    moved, cutoff = session.times_model.archive(
+        before, path or default_archive(session.database)
+    )
+    click.echo(f"{moved} registers archived, days before {key_date(cutoff)}.")
@@ -0,0 +1,98 @@
+"""Backup Interface module"""
+
+import os
+
+import click
+
+from timekeeper.backup import (
+    SNAPSHOT_KEEP,
+    TimekeeperBackupError,
+    backup as backup_database,
+    restore as restore_database,
+    snapshot,
+)
+from timekeeper.cli.session import CliSession
+
+BACKUP_SUFFIX = ".backup.db"
+SNAPSHOTS_DIRECTORY = "timekeeper-snapshots"
+
+
+def default_backup(database: str) -> str:
+    """Returns the backup path next to a database"""
+    return os.path.splitext(database)[0] + BACKUP_SUFFIX
+
+
+def default_snapshots(database: str) -> str:
+    """Returns the snapshots directory next to a database"""
+    return os.path.join(os.path.dirname(database), SNAPSHOTS_DIRECTORY)
+
+
+@click.command()
+@click.argument("target", type=click.Path(dir_okay=False), required=False)
+@click.option(
+    "--snapshot",
+    "-s",
+    "take_snapshot",
+    is_flag=True,
+    help="Writes a compacted, dated snapshot instead, rotating older ones",
+)
+@click.option(
+    "--dir",
+    "-d",
+    "directory",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Snapshots directory, timekeeper-snapshots next to the database",
+)
+@click.option(
+    "--keep",
+    "-k",
+    "keep",
+    type=click.IntRange(min=1),
+    default=SNAPSHOT_KEEP,
+    show_default=True,
+    help="Snapshots kept, older ones are deleted",
+)
+@click.pass_obj
+def backup(
+    session: CliSession,
+    target: str = None,
+    take_snapshot: bool = False,
+    directory: str = None,
+    keep: int = SNAPSHOT_KEEP,
+) -> None:
+    """Copies the database while it stays in use
+
+    Writes TARGET, the .backup.db file next to the database by default.
+    """
+    try:
+        if take_snapshot:
+            path = snapshot(
+                session.database, directory or default_snapshots(session.database), keep
+            )
+        else:
+            path = target or default_backup(session.database)
+            backup_database(session.database, path)
+    except TimekeeperBackupError as error:
+        raise click.ClickException(str(error)) from error
+
+    click.echo(f"Database copied to {path}.")
+
+
+@click.command()
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.option("--yes", "-y", "yes", is_flag=True, help="Skips the confirmation")
+@click.pass_obj
+def restore(session: CliSession, source: str, yes: bool = False) -> None:
+    """Replaces the database with a backup or snapshot, once verified"""
+    if not yes:
+        click.confirm(f"Replace {session.database} with {source}?", abort=True)
+
+    try:
+        previous = restore_database(source, session.database)
+    except TimekeeperBackupError as error:
+        raise click.ClickException(str(error)) from error
+
+    click.echo(f"Database restored from {source}.")
+    if previous:
+        click.echo(f"The replaced database was copied to {previous}.")
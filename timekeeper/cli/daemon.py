@@ -0,0 +1,35 @@
+"""Daemon Interface module"""
+
+import signal
+import sys
+
+import click
+
+from timekeeper.cli.session import CliSession
+from timekeeper.daemon import DaemonServer
+from timekeeper.database import connections
+
+
+def terminate(*_) -> None:
+    """Leaves the serving loop on SIGTERM, like on an interrupt"""
+    sys.exit(0)
+
+
+@click.command()
+@click.pass_obj
+def daemon(session: CliSession) -> None:
+    """Serves start, stop and show to other tk calls until interrupted"""
+    connections.configure(session.database, session.database_settings)
+    try:
+        server = DaemonServer(session.database, journal=session.punch_journal)
+    except OSError as error:
+        raise click.ClickException(str(error)) from error
+
+    signal.signal(signal.SIGTERM, terminate)
+    click.echo(f"Listening on {server.path}")
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,62 @@
+"""Doctor Interface module"""
+
+from datetime import datetime
+
+import click
+
+from timekeeper.cli.render import write_table
+from timekeeper.cli.session import CliSession
+from timekeeper.model import FIXABLE_ISSUES, ISSUES
+from timekeeper.times import day_key
+
+
+@click.command()
+@click.option(
+    "--fix",
+    "fix",
+    is_flag=True,
+    help="Repairs the fixable issues in a single transaction",
+)
+@click.option(
+    "--dry-run",
+    "-n",
+    "dry_run",
+    is_flag=True,
+    help="With --fix, lists the punches the first repair pass would change",
+)
+@click.pass_obj
+def doctor(session: CliSession, fix: bool = False, dry_run: bool = False) -> None:
+    """Checks the registers for unpaired, duplicate or overlapping punches
+
+    Unpaired INs of past days cannot be repaired, clock out with a date to
+    close them.
+    """
+    times = session.times_model
+    today = day_key(datetime.now())
+
+    if fix and dry_run:
+        issues = [
+            (issue, operation, date)
+            for issue, _, operation, date in times.iter_issues(today)
+            if issue in FIXABLE_ISSUES
+        ]
+        if not issues:
+            click.secho("Nothing to fix", fg="green")
+            return
+        write_table(issues, ["Issue", "Operation", "Date"], fg="yellow")
+        click.echo(f"{len(issues)} punches would be fixed.")
+        return
+
+    counts = times.count_issues(today)
+    fixed = times.fix_issues(today) if fix else {}
+
+    if not counts and not fixed:
+        click.secho("No issues found", fg="green")
+        return
+
+    rows = [
+        (issue, counts.get(issue, 0), fixed.get(issue, 0) if fix else "-")
+        for issue in ISSUES
+        if counts.get(issue) or fixed.get(issue)
+    ]
+    write_table(rows, ["Issue", "Punches", "Fixed"], fg="yellow")
@@ -0,0 +1,59 @@
+"""Export Interface module"""
+
+from datetime import datetime
+from typing import IO
+
+import click
+
+from timekeeper.cli.session import CliSession
+from timekeeper.transfer import CSV, FORMATS, write_punches
+
+
+@click.command()
+@click.option(
+    "--date-from",
+    "-df",
+    "date_from",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+)
+@click.option(
+    "--date-to",
+    "-dt",
+    "date_to",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+)
+@click.option(
+    "--format",
+    "-f",
+    "file_format",
+    type=click.Choice(FORMATS),
+    default=CSV,
+)
+@click.option(
+    "--output",
+    "-o",
+    "output",
+    type=click.File("w", encoding="utf8"),
+    default="-",
+    help="Destination file, stdout by default",
+)
+@click.pass_obj
+def export(
+    session: CliSession,
+    date_from: datetime,
+    date_to: datetime,
+    file_format: str,
+    output: IO[str],
+) -> None:
+    """Exports registers as CSV or JSON lines"""
+
+    filters = {}
+
+    if date_from:
+        filters["date_from"] = f"{date_from.date()} 00:00:00"
+    if date_to:
+        filters["date_to"] = f"{date_to.date()} 23:59:59"
+
+    write_punches(output, session.times_model.iter_all(filters), file_format)
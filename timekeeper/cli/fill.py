@@ -0,0 +1,55 @@
+"""Fill Interface module"""
+
+from datetime import datetime
+
+import click
+
+from timekeeper.cli.session import CliSession
+from timekeeper.config import fill_calendar, fill_template
+from timekeeper.fill import day_punches
+
+
+@click.command()
+@click.option(
+    "--from",
+    "--date-from",
+    "-df",
+    "date_from",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    required=True,
+    help="First day to fill",
+)
+@click.option(
+    "--to",
+    "--date-to",
+    "-dt",
+    "date_to",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    required=True,
+    help="Last day to fill",
+)
+@click.option(
+    "--template",
+    "-t",
+    "template",
+    default=None,
+    help="Work periods like 09:00-13:00,14:00-18:00, the [fill] one by default",
+)
+@click.pass_obj
+def fill(
+    session: CliSession, date_from: datetime, date_to: datetime, template: str = None
+) -> None:
+    """Registers a regular schedule for every working day of a range
+
+    Weekdays and holidays come from the [fill] configuration section. Days
+    with registers are left as they are.
+    """
+    if date_to < date_from:
+        raise click.BadParameter("must not be before --from", param_hint="--to")
+
+    periods = fill_template(template)
+    days = fill_calendar().workdays(date_from.date(), date_to.date())
+    filled = session.times_model.register_days(
+        day_punches(day, periods) for day in days
+    )
+    click.echo(f"{filled} days filled.")
@@ -0,0 +1,44 @@
+"""Import Interface module"""
+
+from typing import IO
+
+import click
+
+from timekeeper.cli.session import CliSession
+from timekeeper.model import TimekeeperModelError
+from timekeeper.transfer import (
+    FORMATS,
+    TimekeeperImportError,
+    guess_format,
+    read_punches,
+)
+
+
+@click.command("import")
+@click.argument("source", type=click.File("r", encoding="utf8"))
+@click.option(
+    "--format",
+    "-f",
+    "file_format",
+    type=click.Choice(FORMATS),
+    default=None,
+    help="Source format, guessed from the file extension by default",
+)
+@click.pass_obj
+def import_punches(session: CliSession, source: IO[str], file_format: str) -> None:
+    """Imports registers from a CSV or JSON lines file"""
+
+    if not file_format:
+        file_format = guess_format(source.name)
+
+    try:
+        inserted = session.times_model.register_rows(read_punches(source, file_format))
+    except TimekeeperImportError as import_error:
+        raise click.ClickException(
+            f"Nothing imported. {import_error}"
+        ) from import_error
+    except TimekeeperModelError as model_error:
+        cause = model_error.__cause__ or model_error
+        raise click.ClickException(f"Nothing imported. {cause}") from model_error
+
+    click.echo(f"{inserted} registers imported.")
@@ -0,0 +1,13 @@
+"""Rebuild Interface module"""
+
+import click
+
+from timekeeper.cli.session import CliSession
+
+
+@click.command()
+@click.pass_obj
+def rebuild(session: CliSession) -> None:
+    """Rebuilds the daily summaries from the registers"""
+    session.times_model.rebuild_summary()
+    click.echo("Daily summaries rebuilt.")
@@ -0,0 +1,99 @@
+"""Output rendering module
+
+Rows are written as they are produced, so memory stays constant whatever
+the number of rows. Tables are printed page by page.
+"""
+
+import csv
+import json
+from functools import partial
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import click
+
+TABLE = "table"
+CSV = "csv"
+TSV = "tsv"
+JSONL = "jsonl"
+FORMATS = (TABLE, CSV, TSV, JSONL)
+
+PAGE_SIZE = 100
+MAX_COLUMN_WIDTH = 40
+
+
+def header_style(text: str) -> str:
+    """Helper styling function"""
+    partial_func = partial(click.style, fg="green", bold=True)
+    return partial_func(text)
+
+
+def peek(rows: Iterable) -> Optional[Iterator]:
+    """Returns an iterator over the rows, or None when there are none"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None
+    return chain([first], rows)
+
+
+def table_pages(
+    rows: Iterable[Sequence], headers: Sequence[str], page_size: int = PAGE_SIZE
+) -> Iterator[str]:
+    """Yields the rows as bounded width tables of page_size rows each"""
+    from tabulate import tabulate
+
+    rows = iter(rows)
+    styled = [header_style(header) for header in headers]
+
+    page = list(islice(rows, page_size))
+    while page:
+        yield tabulate(
+            page,
+            headers=styled,
+            tablefmt="fancy_grid",
+            maxcolwidths=MAX_COLUMN_WIDTH,
+        )
+        page = list(islice(rows, page_size))
+
+
+def write_table(rows: Iterable[Sequence], headers: Sequence[str], **style) -> None:
+    """Prints the rows as tables, page by page"""
+    for page in table_pages(rows, headers):
+        click.secho(page, **style)
+
+
+def write_records(
+    rows: Iterable[Sequence], columns: Sequence[str], output_format: str
+) -> None:
+    """Streams the rows to stdout as CSV, TSV or JSON lines"""
+    stream = click.get_text_stream("stdout")
+
+    if output_format == JSONL:
+        for row in rows:
+            stream.write(json.dumps(dict(zip(columns, row)), default=str))
+            stream.write("\n")
+        return
+
+    writer = csv.writer(
+        stream, delimiter="\t" if output_format == TSV else ",", lineterminator="\n"
+    )
+    writer.writerow(columns)
+    writer.writerows(rows)
+
+
+def write_rows(
+    rows: Iterable,
+    output_format: str,
+    headers: Sequence[str],
+    table_row: Callable,
+    columns: Sequence[str],
+    record: Callable,
+    **style,
+) -> None:
+    """Writes rows in the requested format, mapping them for humans or scripts"""
+    if output_format == TABLE:
+        write_table(map(table_row, rows), headers, **style)
+        return
+
+    write_records(map(record, rows), columns, output_format)
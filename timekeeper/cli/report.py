@@ -0,0 +1,101 @@
+"""Report Interface module"""
+
+from datetime import datetime
+
+import click
+
+from timekeeper.cli.render import FORMATS, TABLE, peek, write_rows
+from timekeeper.cli.session import CliSession
+from timekeeper.config import daily_target, parse_duration
+from timekeeper.report import MONTH, PERIODS, PeriodTotal, rollup
+from timekeeper.times import duration_str
+
+
+def total_table_row(total: PeriodTotal) -> tuple:
+    """Returns the human readable values of a period total"""
+    return (
+        total.period,
+        total.days,
+        duration_str(total.worked),
+        duration_str(total.target),
+        duration_str(total.balance, signed=True),
+    )
+
+
+def total_record(total: PeriodTotal) -> tuple:
+    """Returns the machine readable values of a period total"""
+    return total.period, total.days, total.worked, total.target, total.balance
+
+
+@click.command()
+@click.option(
+    "--by",
+    "-b",
+    "by",
+    type=click.Choice(PERIODS),
+    default=MONTH,
+    help="Period to total the worked time by",
+)
+@click.option(
+    "--date-from",
+    "-df",
+    "date_from",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+)
+@click.option(
+    "--date-to",
+    "-dt",
+    "date_to",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+)
+@click.option(
+    "--target",
+    "-t",
+    "target",
+    default=None,
+    help="Daily target as hours or H:MM, [report] daily_target by default",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(FORMATS),
+    default=TABLE,
+    help="Output format, machine readable ones are streamed",
+)
+@click.pass_obj
+def report(
+    session: CliSession,
+    by: str,
+    date_from: datetime,
+    date_to: datetime,
+    target: str = None,
+    output_format: str = TABLE,
+) -> None:
+    """Totals the worked time per period, with overtime against the target"""
+
+    totals = peek(
+        rollup(
+            session.times_model,
+            by,
+            date_from.date() if date_from else None,
+            date_to.date() if date_to else None,
+            parse_duration(target) if target else daily_target(),
+        )
+    )
+
+    if totals is None:
+        click.secho("No registers available", fg="yellow")
+        return
+
+    write_rows(
+        totals,
+        output_format,
+        headers=[by.capitalize(), "Days", "Worked", "Target", "Balance"],
+        table_row=total_table_row,
+        columns=[by, "days", "seconds", "target_seconds", "balance_seconds"],
+        record=total_record,
+        fg="green",
+    )
@@ -2,23 +2,123 @@
 
 import os
 from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterator, Optional
 
-from timekeeper.config import Config
-from timekeeper.model import Session, Times
+from click import ClickException
+
+from timekeeper.client import DaemonClient, DaemonError, DaemonUnavailable, find_daemon
+from timekeeper.config import Config, database_settings
+from timekeeper.database import JOURNAL_BACKEND, DatabaseSettings, connections
+from timekeeper.model import Session, SyncLedger, Times
+from timekeeper.times import now_rounded
+
+if TYPE_CHECKING:
+    from timekeeper.journal import PunchJournal
+
+
+def default_database() -> str:
+    """Returns the path of the user database"""
+    home = os.path.expanduser("~")
+    return os.path.join(home, "timekeeper.db")
 
 
 @dataclass
 class CliSession:
-    """Session object for CLI interface"""
+    """Session object for CLI interface
+
+    The configuration and models are only built the first time a command
+    uses them, so commands pay for what they touch. Clocking and showing go
+    through a running daemon when there is one, and to the database
+    otherwise.
+    """
+
+    database: str = field(default_factory=default_database)
+
+    @cached_property
+    def config(self) -> Config:
+        """Timekeeper configuration"""
+        return Config()
+
+    @cached_property
+    def database_settings(self) -> DatabaseSettings:
+        """Connection settings, from the optional [database] section"""
+        return database_settings()
+
+    @cached_property
+    def punch_journal(self) -> Optional["PunchJournal"]:
+        """Journal clock ins and outs go to, None unless the backend is set
+
+        The journal locks its file with fcntl, it is only imported when the
+        backend is set, so other platforms can use the SQLite one.
+        """
+        if self.database_settings.backend != JOURNAL_BACKEND:
+            return None
+
+        from timekeeper.journal import PunchJournal, journal_path
+
+        return PunchJournal(journal_path(self.database))
+
+    def open_model(self, model: type, **options):
+        """Builds a model, configuring its database connection first"""
+        connections.configure(self.database, self.database_settings)
+        return model(self.database, **options)
+
+    @cached_property
+    def times_model(self) -> Times:
+        """Timekeeping registers model, compacting the journal if any"""
+        return self.open_model(Times, journal=self.punch_journal)
+
+    @cached_property
+    def session_model(self) -> Session:
+        """Remote login session model"""
+        return self.open_model(Session)
+
+    @cached_property
+    def sync_model(self) -> SyncLedger:
+        """Remote sync ledger model"""
+        return self.open_model(SyncLedger)
+
+    @cached_property
+    def daemon(self) -> Optional[DaemonClient]:
+        """Client of the daemon serving the database, None if none runs"""
+        return find_daemon(self.database)
+
+    def call_daemon(self, method: str, *args):
+        """Calls a daemon client method, returns None if no daemon answers"""
+        if self.daemon is None:
+            return None
+
+        try:
+            return getattr(self.daemon, method)(*args)
+        except DaemonUnavailable:
+            self.daemon = None
+            return None
+        except DaemonError as error:
+            raise ClickException(str(error)) from error
+
+    def register(self, command: str, date: Optional[datetime] = None) -> None:
+        """Clocks in or out, now by default"""
+        if self.call_daemon("register", command, date) is not None:
+            return
 
-    config: Config = field(init=False)
-    times_model: Times = field(init=False)
+        if self.punch_journal is not None:
+            operation = "IN" if command == "start" else "OUT"
+            self.punch_journal.append(operation, date or now_rounded())
+            return
 
-    def __post_init__(self):
-        self.config = Config()
+        if command == "start":
+            self.times_model.register_in(date)
+        else:
+            self.times_model.register_out(date)
 
-        home = os.path.expanduser("~")
-        database = os.path.join(home, "timekeeper.db")
+    def iter_rows(self, filters: dict = None) -> Iterator[tuple]:
+        """Yields the first IN timestamp and worked seconds of filtered days"""
+        rows = self.call_daemon("iter_rows", filters)
+        return self.times_model.iter_rows(filters) if rows is None else rows
 
-        self.times_model = Times(database)
-        self.session_model = Session(database)
+    def iter_all(self, filters: dict = None) -> Iterator[tuple]:
+        """Yields the filtered registers"""
+        rows = self.call_daemon("iter_all", filters)
+        return self.times_model.iter_all(filters) if rows is None else rows
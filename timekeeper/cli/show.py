@@ -1,20 +1,20 @@
 """Show Interface module"""
 
 from datetime import datetime
-from functools import partial
+from typing import Tuple
 
 import click
-from tabulate import tabulate
 
+from timekeeper.cli.render import FORMATS, TABLE, peek, write_rows
 from timekeeper.cli.session import CliSession
-from timekeeper.model import Session
-from timekeeper.remote import Hiper
+from timekeeper.model import PAGE_SIZE, DayBatch, TimekeeperModelError, day_tuple
+from timekeeper.times import clock_str, date_str
 
 
-def header_style(text: str) -> str:
-    """Helper styling function"""
-    partial_func = partial(click.style, fg="green", bold=True)
-    return partial_func(text)
+def day_record(row: Tuple[int, int]) -> tuple:
+    """Returns the machine readable values of a day"""
+    first_in, worked = row
+    return date_str(first_in), clock_str(first_in), clock_str(first_in + worked), worked
 
 
 @click.command()
@@ -46,6 +46,35 @@ def header_style(text: str) -> str:
     is_flag=True,
     help="Shows database registers with no modification",
 )
+@click.option(
+    "--limit",
+    "-l",
+    "limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="With --raw, shows a page of this many registers",
+)
+@click.option(
+    "--after",
+    "-a",
+    "after",
+    default=None,
+    help="With --raw, shows the page after this cursor",
+)
+@click.option(
+    "--reverse",
+    "reverse",
+    is_flag=True,
+    help="With --raw, shows the newest registers first",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(FORMATS),
+    default=TABLE,
+    help="Output format, machine readable ones are streamed",
+)
 @click.option(
     "--inform",
     "-i",
@@ -60,16 +89,26 @@ def show(
     date_to: datetime,
     today: bool = False,
     raw: bool = False,
+    limit: int = None,
+    after: str = None,
+    reverse: bool = False,
+    output_format: str = TABLE,
     inform_remote: bool = False,
 ) -> None:
-    """Shows current registers"""
+    """Shows current registers
+
+    Paged raw registers end with the cursor of the next page, on stderr.
+    """
+
+    if not raw and (limit or after or reverse):
+        raise click.UsageError("--limit, --after and --reverse need --raw")
 
     filters = {}
 
     if date_from:
-        filters["date_from"] = f"{date_from} 00:00:00"
+        filters["date_from"] = f"{date_from.date()} 00:00:00"
     if date_to:
-        filters["date_to"] = f"{date_to} 23:59:59"
+        filters["date_to"] = f"{date_to.date()} 23:59:59"
 
     if today:
         filters = {
@@ -77,64 +116,56 @@ def show(
             "date_to": datetime.today().strftime("%Y-%m-%d 23:59:59"),
         }
 
+    page = None
+    if raw and (limit or after or reverse):
+        try:
+            page = session.times_model.query_page(
+                filters, limit or PAGE_SIZE, after, descending=reverse
+            )
+        except TimekeeperModelError as model_error:
+            raise click.BadParameter(
+                str(model_error), param_hint="--after"
+            ) from model_error
+
     if raw:
-        registers = session.times_model.query_all(filters)
+        registers = peek(page.rows if page else session.iter_all(filters))
 
-        if not registers:
+        if registers is None:
             click.secho("No registers available", fg="yellow")
             return
 
-        click.echo(
-            tabulate(
-                session.times_model.query_all(filters=filters),
-                headers=[header_style("Operation"), header_style("Date")],
-                tablefmt="fancy_grid",
-            )
+        write_rows(
+            registers,
+            output_format,
+            headers=["Operation", "Date"],
+            table_row=tuple,
+            columns=["operation", "date"],
+            record=lambda register: (register[0], register[1].isoformat(sep=" ")),
         )
+        if page and page.cursor:
+            click.echo(f"Next page: --after {page.cursor}", err=True)
         return
 
-    days = session.times_model.query_days(filters=filters)
+    days = peek(session.iter_rows(filters))
 
-    if not days:
+    if days is None:
         click.secho("No registers available", fg="yellow")
         return
 
-    click.secho(
-        tabulate(
-            [day.tuple() for day in days],
-            headers=[
-                header_style("Day"),
-                header_style("From"),
-                header_style("To"),
-                header_style("Hours"),
-            ],
-            tablefmt="fancy_grid",
-        ),
+    if inform_remote:
+        days = DayBatch(days)
+
+    write_rows(
+        days.rows() if inform_remote else days,
+        output_format,
+        headers=["Day", "From", "To", "Hours"],
+        table_row=lambda row: day_tuple(*row),
+        columns=["day", "in", "out", "seconds"],
+        record=day_record,
         fg="green",
     )
 
     if inform_remote:
-        click.echo("Communicating to remote...")
-
-        remote = Hiper()
-
-        if not session.session_model.get_cookies():
-            session_cookies = remote.login(
-                session.config.hiper["user"], session.config.hiper["user"]
-            )
-            if not session_cookies:
-                click.Abort("Could not login to Hiper")
-
-            session.session_model.set_cookies(session_cookies)
-
-        for day in days:
-            comm = remote.register_date(
-                day,
-                session.session_model.get_cookies(),
-            )
-            if comm:
-                click.secho(f"{day.day_str()} informed correctly", fg="green")
-            else:
-                click.secho(f"{day.day_str()} could not be informed", fg="red")
+        from timekeeper.cli.sync import inform
 
-        click.echo("Communication finished...")
+        inform(session, days)
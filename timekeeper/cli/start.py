@@ -16,8 +16,6 @@ from timekeeper.cli.session import CliSession
 @click.pass_obj
 def start(session: CliSession, date: None) -> None:
     """Signals the begining of the clock"""
-    if date:
-        session.times_model.register_in(date)
-    else:
-        session.times_model.register_in()
+    session.register("start", date)
+    if not date:
         click.echo("Hi bro.")
@@ -0,0 +1,57 @@
+"""Status Interface module"""
+
+import time
+from datetime import datetime
+
+import click
+
+from timekeeper.cli.session import CliSession
+from timekeeper.status import StatusWatcher, status_line
+
+WATCH_INTERVAL = 5.0
+
+
+@click.command()
+@click.option(
+    "--watch",
+    "-w",
+    "watch",
+    is_flag=True,
+    help="Keeps refreshing the status until interrupted",
+)
+@click.option(
+    "--interval",
+    "-n",
+    "interval",
+    type=click.FloatRange(min=0.1),
+    default=WATCH_INTERVAL,
+    show_default=True,
+    help="Seconds between refreshes when watching",
+)
+@click.pass_obj
+def status(session: CliSession, watch: bool = False, interval: float = WATCH_INTERVAL):
+    """Shows today worked time and whether you are clocked in
+
+    When watching on a terminal the line is redrawn in place, otherwise a
+    line is printed per refresh, as status bars expect.
+    """
+    watcher = StatusWatcher(session.times_model)
+
+    if not watch:
+        now = datetime.now()
+        click.echo(status_line(watcher.poll(now), now))
+        return
+
+    redraw = click.get_text_stream("stdout").isatty()
+    try:
+        while True:
+            now = datetime.now()
+            line = status_line(watcher.poll(now), now)
+            if redraw:
+                click.echo(f"\r\x1b[K{line}", nl=False)
+            else:
+                click.echo(line)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        if redraw:
+            click.echo()
@@ -16,8 +16,6 @@ from timekeeper.cli.session import CliSession
 @click.pass_obj
 def stop(session: CliSession, date: None) -> None:
     """Signals the end of the clock"""
-    if date:
-        session.times_model.register_out(date)
-    else:
-        session.times_model.register_out()
+    session.register("stop", date)
+    if not date:
         click.echo("Bye bro.")
@@ -0,0 +1,62 @@
+"""Sync Interface module"""
+
+from typing import Iterable
+
+import click
+from requests import RequestException
+
+from timekeeper.cli.session import CliSession
+from timekeeper.model import Day
+from timekeeper.remote import Hiper, TimekeeperRemoteError
+from timekeeper.sync import synchronize
+
+
+def inform(session: CliSession, days: Iterable[Day] = ()) -> None:
+    """Sends the new or changed days and the queued ones to the remote"""
+    session.sync_model.enqueue(days)
+
+    click.echo("Communicating to remote...")
+
+    remote = Hiper()
+
+    cookies = session.session_model.get_cookies()
+    if not cookies:
+        try:
+            cookies = remote.login(
+                session.config.hiper["user"], session.config.hiper["user"]
+            )
+        except RequestException as request_error:
+            click.secho(f"Could not reach the remote: {request_error}", fg="red")
+            click.echo(f"{len(session.sync_model.outbox())} days queued for tk sync.")
+            return
+        except TimekeeperRemoteError as remote_error:
+            raise click.ClickException(
+                f"Could not login to Hiper: {remote_error}"
+            ) from remote_error
+
+        if not cookies:
+            raise click.ClickException("Could not login to Hiper")
+
+        session.session_model.set_cookies(cookies)
+
+    remote.cookies = cookies
+
+    informed = 0
+    for day, comm in synchronize(session.sync_model, remote):
+        informed += 1
+        if comm:
+            click.secho(f"{day.day_str()} informed correctly", fg="green")
+        else:
+            click.secho(f"{day.day_str()} could not be informed", fg="red")
+
+    if not informed:
+        click.echo("Nothing new to inform.")
+
+    click.echo("Communication finished...")
+
+
+@click.command()
+@click.pass_obj
+def sync(session: CliSession) -> None:
+    """Sends the days queued for the remote server"""
+    inform(session)
@@ -0,0 +1,157 @@
+"""Team Report Interface module"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Tuple
+
+import click
+
+from timekeeper.cli.render import FORMATS, TABLE, peek, write_rows
+from timekeeper.cli.session import CliSession
+from timekeeper.model import day_tuple
+from timekeeper.team import (
+    TimekeeperTeamError,
+    UserReport,
+    discover,
+    team_reports,
+)
+from timekeeper.times import clock_str, date_str
+
+
+def readable(reports: Iterable[UserReport]) -> Iterator[UserReport]:
+    """Yields the reports read, warning about the users that could not be"""
+    for report in reports:
+        if report.problem:
+            click.secho(f"{report.user}: {report.problem}", fg="yellow", err=True)
+            continue
+        yield report
+
+
+def day_rows(reports: Iterable[UserReport]) -> Iterator[Tuple[str, int, int]]:
+    """Yields the user, first IN timestamp and worked seconds of every day"""
+    for report in reports:
+        for first_in, worked in report.days.rows():
+            yield report.user, first_in, worked
+
+
+def total_rows(reports: Iterable[UserReport]) -> Iterator[Tuple[str, int, int]]:
+    """Yields the user, worked days and worked seconds of every user"""
+    for report in reports:
+        yield report.user, len(report.days), report.days.worked_seconds()
+
+
+def day_record(row: Tuple[str, int, int]) -> tuple:
+    """Returns the machine readable values of a user day"""
+    user, first_in, worked = row
+    return (
+        user,
+        date_str(first_in),
+        clock_str(first_in),
+        clock_str(first_in + worked),
+        worked,
+    )
+
+
+def total_table_row(row: Tuple[str, int, int]) -> tuple:
+    """Returns the human readable values of a user total"""
+    user, days, worked = row
+    average = worked // days if days else 0
+    return user, days, timedelta(seconds=worked), timedelta(seconds=average)
+
+
+@click.command("team-report")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--date-from",
+    "-df",
+    "date_from",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+)
+@click.option(
+    "--date-to",
+    "-dt",
+    "date_to",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+)
+@click.option(
+    "--totals",
+    "-t",
+    "totals",
+    is_flag=True,
+    help="Shows a total per user instead of every day",
+)
+@click.option(
+    "--workers",
+    "-w",
+    "workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes, one per CPU by default",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(FORMATS),
+    default=TABLE,
+    help="Output format, machine readable ones are streamed",
+)
+@click.pass_obj
+def team_report(
+    session: CliSession,
+    paths: Tuple[str, ...],
+    date_from: datetime,
+    date_to: datetime,
+    totals: bool = False,
+    workers: int = None,
+    output_format: str = TABLE,
+) -> None:
+    """Reports the days of many databases, one per user
+
+    PATHS are databases, or directories holding them. Users are named after
+    their database file.
+    """
+    del session
+
+    filters = {}
+    if date_from:
+        filters["date_from"] = f"{date_from.date()} 00:00:00"
+    if date_to:
+        filters["date_to"] = f"{date_to.date()} 23:59:59"
+
+    databases = discover(paths)
+    if not databases:
+        raise click.ClickException("No databases found")
+
+    reports = readable(team_reports(databases, filters, workers))
+
+    try:
+        if totals:
+            write_rows(
+                total_rows(reports),
+                output_format,
+                headers=["User", "Days", "Hours", "Average"],
+                table_row=total_table_row,
+                columns=["user", "days", "seconds"],
+                record=tuple,
+                fg="green",
+            )
+            return
+
+        rows = peek(day_rows(reports))
+        if rows is None:
+            click.secho("No registers available", fg="yellow")
+            return
+
+        write_rows(
+            rows,
+            output_format,
+            headers=["User", "Day", "From", "To", "Hours"],
+            table_row=lambda row: (row[0], *day_tuple(row[1], row[2])),
+            columns=["user", "day", "in", "out", "seconds"],
+            record=day_record,
+            fg="green",
+        )
+    except TimekeeperTeamError as error:
+        raise click.ClickException(str(error)) from error
@@ -0,0 +1,86 @@
+"""Daemon client module
+
+Kept apart from the daemon so clients only import what talking to it takes.
+"""
+
+import json
+import os
+import socket
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from timekeeper.times import parse_datetime
+
+SOCKET_SUFFIX = ".sock"
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is serving the database"""
+
+
+class DaemonError(Exception):
+    """The daemon failed to run a request"""
+
+
+def socket_path(database: str) -> str:
+    """Returns the socket a daemon serving the database listens to"""
+    return f"{database}{SOCKET_SUFFIX}"
+
+
+def find_daemon(database: str) -> Optional["DaemonClient"]:
+    """Returns a client of the daemon serving the database, if it has one"""
+    path = socket_path(database)
+    return DaemonClient(path) if os.path.exists(path) else None
+
+
+class DaemonClient:
+    """Thin client of a running daemon"""
+
+    def __init__(self, path: str, timeout: float = CONNECT_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+
+    def request(self, payload: dict) -> dict:
+        """Sends a request, returns the response values
+
+        Raises DaemonUnavailable when no daemon answers, so callers can go
+        to the database themselves.
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(self.timeout)
+                client.connect(self.path)
+                client.settimeout(None)
+                client.sendall(json.dumps(payload).encode() + b"\n")
+                with client.makefile("rb") as stream:
+                    line = stream.readline()
+        except OSError as error:
+            raise DaemonUnavailable(self.path) from error
+
+        if not line:
+            raise DaemonUnavailable(self.path)
+
+        response = json.loads(line)
+        if not response.pop("ok"):
+            raise DaemonError(response["error"])
+        return response
+
+    def register(self, command: str, date: Optional[datetime] = None) -> datetime:
+        """Clocks in or out, returns the registered date"""
+        response = self.request(
+            {"command": command, "date": date.isoformat(sep=" ") if date else None}
+        )
+        return parse_datetime(response["date"])
+
+    def iter_rows(self, filters: dict = None) -> Iterator[Tuple[int, int]]:
+        """Returns the first IN timestamp and worked seconds of filtered days"""
+        response = self.request({"command": "rows", "filters": filters})
+        return (tuple(row) for row in response["rows"])
+
+    def iter_all(self, filters: dict = None) -> Iterator[tuple]:
+        """Returns the filtered registers"""
+        response = self.request({"command": "registers", "filters": filters})
+        return (
+            (operation, parse_datetime(date)) for operation, date in response["rows"]
+        )
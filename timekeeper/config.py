@@ -2,13 +2,40 @@
 
 import os
 from configparser import ConfigParser
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from datetime import timedelta
+from typing import TYPE_CHECKING
 
 from click import ClickException
 
+from timekeeper.database import DatabaseSettings
+
+if TYPE_CHECKING:
+    from timekeeper.fill import Calendar, Template
+
 CONFIG_TEMPLATE = """
 [hiper]
 user = USERNAME
+
+# Optional, the defaults are shown
+[database]
+journal_mode = WAL
+synchronous = NORMAL
+busy_timeout = 5000
+cache_size = -2000
+mmap_size = 0
+# journal appends clock ins and outs to a file, moved to SQLite on read
+backend = sqlite
+
+# Optional, worked time expected per day, as hours or H:MM
+[report]
+daily_target = 8:00
+
+# Optional, the days and periods tk fill registers, examples are shown
+[fill]
+# weekdays = mon,tue,wed,thu,fri
+# holidays = 2023-01-01, 2023-12-25
+# template = 09:00-13:00,14:00-18:00
 """
 
 
@@ -21,11 +48,11 @@ class Config:
     """Timekeeper Configuration object"""
 
     hiper: dict = field(init=False)
+    database: DatabaseSettings = field(init=False)
+    daily_target: timedelta = field(init=False)
 
     def __post_init__(self):
-        home = os.path.expanduser("~")
-
-        configuration = os.path.join(home, "timekeeper.conf")
+        configuration = config_path()
         if not os.path.exists(configuration):
             raise ConfigError(
                 (
@@ -37,3 +64,105 @@ class Config:
         conf.read(configuration)
 
         self.hiper = conf["hiper"]
+        self.database = database_settings(conf)
+        self.daily_target = daily_target(conf)
+
+
+def config_path() -> str:
+    """Returns the path of the user configuration file"""
+    home = os.path.expanduser("~")
+    return os.path.join(home, "timekeeper.conf")
+
+
+def read_optional() -> ConfigParser:
+    """Parses the configuration file, empty if there is none"""
+    conf = ConfigParser()
+    conf.read(config_path())
+    return conf
+
+
+def database_settings(conf: ConfigParser = None) -> DatabaseSettings:
+    """Returns the [database] settings, the defaults for the missing ones
+
+    Reads the configuration file when no parsed one is given. Unlike the
+    rest of the configuration the file and section are optional.
+    """
+    if conf is None:
+        conf = read_optional()
+
+    if not conf.has_section("database"):
+        return DatabaseSettings()
+
+    names = {setting.name for setting in fields(DatabaseSettings)}
+    section = conf["database"]
+    unknown = set(section) - names
+    if unknown:
+        raise ConfigError(f"Unknown [database] settings: {', '.join(sorted(unknown))}")
+
+    try:
+        return DatabaseSettings(**dict(section))
+    except ValueError as error:
+        raise ConfigError(f"Invalid [database] setting: {error}") from error
+
+
+def parse_duration(value: str) -> timedelta:
+    """Returns the duration of hours, like 7.5, or H:MM, like 7:30"""
+    hours, _, minutes = value.strip().partition(":")
+    try:
+        if minutes:
+            return timedelta(hours=int(hours), minutes=int(minutes))
+        return timedelta(hours=float(hours))
+    except ValueError as error:
+        raise ConfigError(f"Invalid duration: {value}") from error
+
+
+def daily_target(conf: ConfigParser = None) -> timedelta:
+    """Returns the [report] daily target, 8 hours if not configured
+
+    Reads the configuration file when no parsed one is given, the file and
+    section are optional.
+    """
+    from timekeeper.report import DAILY_TARGET
+
+    if conf is None:
+        conf = read_optional()
+
+    value = conf.get("report", "daily_target", fallback=None)
+    return DAILY_TARGET if value is None else parse_duration(value)
+
+
+def fill_calendar(conf: ConfigParser = None) -> "Calendar":
+    """Returns the [fill] weekdays and holidays, weekdays only by default
+
+    Reads the configuration file when no parsed one is given, the file and
+    section are optional.
+    """
+    from timekeeper.fill import WORKDAYS, Calendar
+
+    if conf is None:
+        conf = read_optional()
+
+    try:
+        return Calendar.parse(
+            conf.get("fill", "weekdays", fallback=WORKDAYS),
+            conf.get("fill", "holidays", fallback=""),
+        )
+    except ValueError as error:
+        raise ConfigError(f"Invalid [fill] setting: {error}") from error
+
+
+def fill_template(value: str = None, conf: ConfigParser = None) -> "Template":
+    """Returns the periods of a template, the [fill] one if none is given"""
+    from timekeeper.fill import parse_template
+
+    if value is None:
+        if conf is None:
+            conf = read_optional()
+        value = conf.get("fill", "template", fallback=None)
+        if value is None:
+            raise ConfigError("No template given and no [fill] template configured")
+
+    try:
+        return parse_template(value)
+    except ValueError as error:
+        raise ConfigError(str(error)) from error
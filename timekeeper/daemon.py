@@ -0,0 +1,165 @@
+"""Resident daemon module
+
+The daemon keeps the models and their connection open and serves clock
+ins, clock outs and queries over a Unix domain socket, one JSON document
+per line. Punches arriving while a commit is running are written together
+in the next one, so bursts of concurrent clients share a single commit.
+"""
+
+import json
+import logging
+import os
+import socketserver
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from queue import Empty, Queue
+from typing import Iterator, List, Optional
+
+from timekeeper.client import DaemonClient, DaemonUnavailable, socket_path
+from timekeeper.journal import PunchJournal
+from timekeeper.model import Times
+from timekeeper.times import now_rounded, parse_datetime
+
+MAX_BATCH = 1000
+BACKLOG = 128
+OPERATIONS = {"start": "IN", "stop": "OUT"}
+
+
+class GroupCommitter:
+    """Writes queued punches, every punch queued meanwhile in one commit"""
+
+    def __init__(self, times: Times, max_batch: int = MAX_BATCH):
+        self.times = times
+        self.max_batch = max_batch
+        self.queue: Queue = Queue()
+        self.commits = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, operation: str, date: datetime) -> Future:
+        """Queues a punch, the future resolves once it is committed"""
+        future: Future = Future()
+        self.queue.put((operation, date, future))
+        return future
+
+    def close(self) -> None:
+        """Commits the queued punches and stops the writer"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def batches(self) -> Iterator[List[tuple]]:
+        """Yields the queued punches, waiting only when there are none"""
+        while True:
+            item = self.queue.get()
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) == self.max_batch:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except Empty:
+                    break
+
+            if batch:
+                yield batch
+            if item is None:
+                return
+
+    def run(self) -> None:
+        """Writer loop"""
+        for batch in self.batches():
+            try:
+                self.times.register_rows(
+                    (operation, date) for operation, date, _ in batch
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                logging.error("Group commit failed: %s", error)
+                for *_, future in batch:
+                    future.set_exception(error)
+                continue
+
+            self.commits += 1
+            for *_, future in batch:
+                future.set_result(True)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Answers each request line of a client connection"""
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = {"ok": True, **self.server.dispatch(json.loads(line))}
+            except Exception as error:  # pylint: disable=broad-except
+                response = {"ok": False, "error": str(error) or type(error).__name__}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server holding the resident models"""
+
+    daemon_threads = True
+    request_queue_size = BACKLOG
+
+    def __init__(
+        self, database: str, path: str = None, journal: Optional[PunchJournal] = None
+    ):
+        self.database = database
+        self.path = path or socket_path(database)
+        self.times = Times(database, journal=journal)
+        self.committer = GroupCommitter(self.times)
+
+        claim_socket(self.path)
+        super().__init__(self.path, RequestHandler)
+
+    def dispatch(self, request: dict) -> dict:
+        """Runs a request, returning the response values"""
+        command = request.get("command")
+
+        if command in OPERATIONS:
+            date = request.get("date")
+            date = parse_datetime(date) if date else now_rounded()
+            self.committer.submit(OPERATIONS[command], date).result()
+            return {"date": date.isoformat(sep=" ")}
+
+        if command == "rows":
+            return {"rows": list(self.times.iter_rows(request.get("filters")))}
+
+        if command == "registers":
+            return {
+                "rows": [
+                    (operation, date.isoformat(sep=" "))
+                    for operation, date in self.times.iter_all(request.get("filters"))
+                ]
+            }
+
+        if command == "ping":
+            return {"pid": os.getpid()}
+
+        raise ValueError(f"Unknown command: {command}")
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.committer.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def claim_socket(path: str) -> None:
+    """Removes a stale socket, failing if a daemon still listens to it"""
+    if not os.path.exists(path):
+        return
+
+    try:
+        DaemonClient(path).request({"command": "ping"})
+    except DaemonUnavailable:
+        os.remove(path)
+        return
+
+    raise OSError(f"A daemon is already listening on {path}")
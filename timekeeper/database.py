@@ -2,9 +2,31 @@
 
 import datetime
 import logging
+import os
 import sqlite3
+import time
 from contextlib import contextmanager
-from sqlite3 import PARSE_COLNAMES, PARSE_DECLTYPES, Cursor, DatabaseError, connect
+from dataclasses import dataclass
+from sqlite3 import (
+    PARSE_COLNAMES,
+    PARSE_DECLTYPES,
+    Connection,
+    Cursor,
+    DatabaseError,
+    OperationalError,
+    connect,
+)
+from threading import Lock, RLock
+from typing import Dict, Iterator, List
+from urllib.parse import quote
+
+STATEMENT_CACHE_SIZE = 128
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+BUSY_ERRORS = ("database is locked", "database is busy")
+SQLITE_BACKEND = "sqlite"
+JOURNAL_BACKEND = "journal"
+BACKENDS = (SQLITE_BACKEND, JOURNAL_BACKEND)
 
 
 class TimekeeperDatabaseError(DatabaseError):
@@ -48,20 +70,289 @@ class TimekeeperDatabaseError(DatabaseError):
 # sqlite3.register_converter("timestamp", convert_timestamp)
 
 
-@contextmanager
-def open_db(db_name: str) -> Cursor:
-    """Database manager"""
+@dataclass
+class DatabaseSettings:
+    """SQLite tuning applied to every new connection
+
+    Writes take the database lock when their transaction begins, waiting up
+    to busy_timeout milliseconds for other writers. Statements still finding
+    the database busy are retried with exponential backoff, as long as no
+    earlier statement of the transaction would be lost.
+
+    With the journal backend clock ins and outs are appended to a punch
+    journal instead, and moved to the database when it is next read.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    busy_timeout: int = 5000
+    cache_size: int = -2000
+    mmap_size: int = 0
+    retries: int = 5
+    backoff: float = 0.05
+    read_only: bool = False
+    backend: str = SQLITE_BACKEND
+
+    def __post_init__(self):
+        self.journal_mode = self.journal_mode.upper()
+        self.synchronous = self.synchronous.upper()
+
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal mode: {self.journal_mode}")
+        if self.synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unknown synchronous level: {self.synchronous}")
+        self.backend = self.backend.lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {self.backend}")
+        for name in ("busy_timeout", "cache_size", "mmap_size", "retries"):
+            setattr(self, name, int(getattr(self, name)))
+        self.backoff = float(self.backoff)
+        if isinstance(self.read_only, str):
+            self.read_only = self.read_only.lower() in ("1", "yes", "true", "on")
+
+    def pragmas(self) -> List[str]:
+        """Returns the statements configuring a connection
+
+        The journal mode is kept as is on read-only connections, changing it
+        would need writing.
+        """
+        pragmas = [
+            f"PRAGMA busy_timeout = {self.busy_timeout};",
+            f"PRAGMA synchronous = {self.synchronous};",
+            f"PRAGMA cache_size = {self.cache_size};",
+            f"PRAGMA mmap_size = {self.mmap_size};",
+        ]
+        if not self.read_only:
+            pragmas.insert(1, f"PRAGMA journal_mode = {self.journal_mode};")
+        return pragmas
+
+
+def is_busy(db_error: DatabaseError) -> bool:
+    """Tells whether an error comes from another connection holding a lock"""
+    return isinstance(db_error, OperationalError) and str(db_error) in BUSY_ERRORS
+
+
+class RetryingCursor(Cursor):
+    """Cursor retrying the statements that find the database busy
+
+    A statement is only retried when it would begin the transaction, a
+    failure later on could have lost the statements run before it.
+    """
+
+    def execute(self, *args):
+        return self.retry(Cursor.execute, *args)
+
+    def executemany(self, *args):
+        return self.retry(Cursor.executemany, *args)
+
+    def retry(self, method, *args):
+        """Runs a statement, retrying it while the database is busy"""
+        connection = self.connection
+        attempt = 0
+        while True:
+            began = not connection.in_transaction
+            try:
+                return method(self, *args)
+            except OperationalError as db_error:
+                if not began or attempt >= connection.retries or not is_busy(db_error):
+                    raise
+                if connection.in_transaction:
+                    connection.rollback()
+
+            time.sleep(connection.backoff * 2**attempt)
+            attempt += 1
+
+
+class RetryingConnection(Connection):
+    """Connection handing out retrying cursors"""
+
+    retries: int = DatabaseSettings.retries
+    backoff: float = DatabaseSettings.backoff
+    uri: bool = False
+
+    def cursor(self, factory=RetryingCursor):
+        return super().cursor(factory)
+
+
+def configure(connection: Connection, settings: DatabaseSettings) -> None:
+    """Applies the settings to a new connection"""
+    connection.retries = settings.retries
+    connection.backoff = settings.backoff
+    for pragma in settings.pragmas():
+        connection.execute(pragma).close()
+
+
+def read_only_uri(db_name: str) -> str:
+    """Returns the URI opening a database file read-only"""
+    return f"file:{quote(os.path.abspath(db_name))}?mode=ro"
+
+
+def takes_uris(connection: Connection) -> bool:
+    """Tells whether SQLite reads URI file names on every connection"""
+    options = connection.execute("PRAGMA compile_options;").fetchall()
+    return ("USE_URI",) in options
+
+
+def open_connection(
+    db_name: str,
+    settings: DatabaseSettings,
+    cached_statements: int = STATEMENT_CACHE_SIZE,
+) -> Connection:
+    """Opens a configured connection
+
+    Writes begin immediate transactions, so they wait for the lock before
+    reading anything and never need to be retried midway. Read-only
+    connections fail on any write. Only those are opened by URI, other
+    file names are taken as they are.
+    """
+    database = db_name
+    if settings.read_only:
+        database = read_only_uri(db_name)
+
     connection = connect(
-        db_name,
+        database,
+        uri=settings.read_only,
         detect_types=PARSE_DECLTYPES | PARSE_COLNAMES,
+        isolation_level="IMMEDIATE",
+        check_same_thread=False,
+        cached_statements=cached_statements,
+        factory=RetryingConnection,
     )
+    try:
+        configure(connection, settings)
+        connection.uri = settings.read_only or takes_uris(connection)
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+@contextmanager
+def open_db(db_name: str, settings: DatabaseSettings = None) -> Cursor:
+    """Database manager"""
+    connection = open_connection(db_name, settings or DatabaseSettings())
 
     try:
         cursor = connection.cursor()
         yield cursor
     except DatabaseError as db_error:
         logging.error("Database error: %s", db_error)
+        connection.rollback()
         raise TimekeeperDatabaseError() from db_error
-    finally:
+    except BaseException:
+        connection.rollback()
+        raise
+    else:
         connection.commit()
+    finally:
         connection.close()
+
+
+class ConnectionManager:
+    """Keeps one long-lived connection per database path
+
+    Connections are shared by every model working on the same database for
+    the life of the process, so sqlite's prepared statement cache is reused
+    across calls. Access to each connection is serialized with a reentrant
+    lock, which makes the manager safe to use from several threads.
+    """
+
+    def __init__(self, cached_statements: int = STATEMENT_CACHE_SIZE):
+        self.cached_statements = cached_statements
+        self.settings: Dict[str, DatabaseSettings] = {}
+        self._connections: Dict[str, Connection] = {}
+        self._locks: Dict[str, RLock] = {}
+        self._depth: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def connect(self, db_name: str) -> Connection:
+        """Returns the connection for a database, opening it if needed"""
+        with self._lock:
+            connection = self._connections.get(db_name)
+            if connection is None:
+                connection = open_connection(
+                    db_name,
+                    self.settings.get(db_name) or DatabaseSettings(),
+                    self.cached_statements,
+                )
+                self._connections[db_name] = connection
+                self._locks[db_name] = RLock()
+                self._depth[db_name] = 0
+            return connection
+
+    def configure(self, db_name: str, settings: DatabaseSettings) -> None:
+        """Sets the settings of a database, applied from its next connection"""
+        self.settings[db_name] = settings
+
+    @contextmanager
+    def cursor(self, db_name: str) -> Iterator[Cursor]:
+        """Yields a cursor, committing afterwards unless inside a transaction"""
+        connection = self.connect(db_name)
+
+        with self._locks[db_name]:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            except DatabaseError as db_error:
+                logging.error("Database error: %s", db_error)
+                self._rollback(db_name, connection)
+                raise TimekeeperDatabaseError() from db_error
+            except BaseException:
+                self._rollback(db_name, connection)
+                raise
+            else:
+                if not self._depth[db_name]:
+                    connection.commit()
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self, db_name: str) -> Iterator[Connection]:
+        """Groups every statement run inside the scope into a single commit
+
+        Scopes can be nested, only the outermost one commits. Other threads
+        wait for the scope to finish before using the connection.
+        """
+        connection = self.connect(db_name)
+
+        with self._locks[db_name]:
+            self._depth[db_name] += 1
+            try:
+                yield connection
+            except BaseException:
+                self._depth[db_name] -= 1
+                self._rollback(db_name, connection)
+                raise
+            else:
+                self._depth[db_name] -= 1
+                if not self._depth[db_name]:
+                    connection.commit()
+
+    def close(self, db_name: str) -> None:
+        """Closes the connection of a database, if open"""
+        with self._lock:
+            connection = self._connections.pop(db_name, None)
+            self._locks.pop(db_name, None)
+            self._depth.pop(db_name, None)
+
+        if connection is not None:
+            connection.commit()
+            connection.close()
+
+    def close_all(self) -> None:
+        """Closes every open connection"""
+        for db_name in list(self._connections):
+            self.close(db_name)
+
+    def _rollback(self, db_name: str, connection: Connection) -> None:
+        """Rolls back the current transaction if no outer scope owns it"""
+        if not self._depth[db_name]:
+            connection.rollback()
+
+
+connections = ConnectionManager()
+
+
+def close_db(db_name: str) -> None:
+    """Closes the shared connection of a database"""
+    connections.close(db_name)
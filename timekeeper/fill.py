@@ -0,0 +1,113 @@
+"""Fill module
+
+Generates the punches of a regular schedule, from a template of work
+periods like 09:00-13:00,14:00-18:00, for every day of a range the
+calendar counts as a working day.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import FrozenSet, Iterator, List, Tuple
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+WORKDAYS = "mon,tue,wed,thu,fri"
+
+Template = List[Tuple[time, time]]
+
+
+def split_list(value: str) -> List[str]:
+    """Returns the items of a comma or whitespace separated list"""
+    return value.replace(",", " ").split()
+
+
+def parse_template(value: str) -> Template:
+    """Returns the periods of a template like 09:00-13:00,14:00-18:00
+
+    Periods must be in order and must not overlap, the last one may end
+    the next day.
+    """
+    periods = []
+    for period in value.split(","):
+        start, separator, end = period.strip().partition("-")
+        try:
+            if not separator:
+                raise ValueError
+            periods.append(
+                (
+                    datetime.strptime(start.strip(), "%H:%M").time(),
+                    datetime.strptime(end.strip(), "%H:%M").time(),
+                )
+            )
+        except ValueError as error:
+            raise ValueError(f"Invalid template period: {period.strip()}") from error
+
+    for index, (start, end) in enumerate(periods):
+        if start == end:
+            raise ValueError(f"Empty template period: {start:%H:%M}-{end:%H:%M}")
+        if index and start <= periods[index - 1][1]:
+            raise ValueError(f"Template periods overlap or are unordered: {value}")
+        if end < start and (index < len(periods) - 1 or end > periods[0][0]):
+            raise ValueError(f"Template periods overlap the next day: {value}")
+
+    return periods
+
+
+@dataclass(frozen=True)
+class Calendar:
+    """Days tk fill registers, the weekdays minus the holidays"""
+
+    weekdays: FrozenSet[int] = frozenset(range(5))
+    holidays: FrozenSet[date] = field(default_factory=frozenset)
+
+    @classmethod
+    def parse(cls, weekdays: str = WORKDAYS, holidays: str = "") -> "Calendar":
+        """Builds a calendar from weekday names and ISO dates, like the config"""
+        numbers = set()
+        for name in split_list(weekdays.lower()):
+            matches = [
+                number
+                for number, weekday in enumerate(WEEKDAYS)
+                if len(name) >= 3 and weekday.startswith(name)
+            ]
+            if not matches:
+                raise ValueError(f"Unknown weekday: {name}")
+            numbers.add(matches[0])
+
+        try:
+            dates = {date.fromisoformat(day) for day in split_list(holidays)}
+        except ValueError as error:
+            raise ValueError(f"Invalid holiday: {error}") from error
+
+        return cls(frozenset(numbers), frozenset(dates))
+
+    def is_workday(self, day: date) -> bool:
+        """Tells whether a day is filled"""
+        return day.weekday() in self.weekdays and day not in self.holidays
+
+    def workdays(self, first: date, last: date) -> Iterator[date]:
+        """Yields the working days from first to last, both included"""
+        day = first
+        while day <= last:
+            if self.is_workday(day):
+                yield day
+            day += timedelta(days=1)
+
+
+def day_punches(day: date, template: Template) -> List[Tuple[str, datetime]]:
+    """Returns the punches of a template on a day"""
+    punches = []
+    for start, end in template:
+        clock_in = datetime.combine(day, start)
+        clock_out = datetime.combine(day, end)
+        if end < start:
+            clock_out += timedelta(days=1)
+        punches += [("IN", clock_in), ("OUT", clock_out)]
+    return punches
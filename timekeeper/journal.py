@@ -0,0 +1,104 @@
+"""Punch journal module
+
+Clocking in or out appends one fixed-size record to a journal file next to
+the database, with a single write and fsync, without opening SQLite. The
+journal is compacted into the database the next time a model reads it.
+Appends and compactions hold an exclusive lock on the file, so punches
+appended by other processes meanwhile are never lost. Records replay
+idempotently, a crash between the compaction commit and the journal
+truncation inserts nothing twice.
+"""
+
+import fcntl
+import logging
+import os
+import struct
+from contextlib import contextmanager
+from datetime import datetime
+from threading import RLock
+from typing import Iterator, List
+
+from timekeeper.times import from_timestamp, to_timestamp
+
+JOURNAL_SUFFIX = ".punches"
+RECORD = struct.Struct("<c7xq")
+OPERATIONS = {"IN": b"I", "OUT": b"O"}
+CODES = {code: operation for operation, code in OPERATIONS.items()}
+
+
+class TimekeeperJournalError(Exception):
+    """journal module exception"""
+
+
+def journal_path(database: str) -> str:
+    """Returns the path of the punch journal of a database"""
+    return database + JOURNAL_SUFFIX
+
+
+class PunchJournal:
+    """Append-only file of punches waiting to be written to the database"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = RLock()
+
+    def append(self, operation: str, date: datetime) -> None:
+        """Appends a punch, durable once this returns"""
+        record = RECORD.pack(OPERATIONS[operation], to_timestamp(date))
+
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX)
+            torn = os.fstat(descriptor).st_size % RECORD.size
+            if torn:
+                os.ftruncate(descriptor, os.fstat(descriptor).st_size - torn)
+            if os.write(descriptor, record) != RECORD.size:
+                raise TimekeeperJournalError(f"Short write to {self.path}")
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Keeps other threads and processes from appending meanwhile"""
+        with self.lock:
+            descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(descriptor)
+
+    def pending(self) -> bool:
+        """Tells whether punches wait to be compacted, with a single stat"""
+        try:
+            return os.stat(self.path).st_size >= RECORD.size
+        except FileNotFoundError:
+            return False
+
+    def read(self) -> List[tuple]:
+        """Returns the journaled operations and dates, in append order
+
+        A torn record left by a crash while appending is ignored, the next
+        append overwrites it.
+        """
+        try:
+            with open(self.path, "rb") as journal:
+                data = journal.read()
+        except FileNotFoundError:
+            return []
+
+        size = len(data) - len(data) % RECORD.size
+        punches = []
+        for code, timestamp in RECORD.iter_unpack(data[:size]):
+            if code not in CODES:
+                logging.warning("Skipping corrupt punch journal record")
+                continue
+            punches.append((CODES[code], from_timestamp(timestamp)))
+        return punches
+
+    def clear(self) -> None:
+        """Empties the journal, durably"""
+        with open(self.path, "r+b") as journal:
+            journal.truncate()
+            os.fsync(journal.fileno())
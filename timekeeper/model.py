@@ -1,20 +1,72 @@
 """Database module"""
 
+import base64
+import binascii
+import hashlib
 import json
+import os
+import time
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from functools import partial
-from typing import Callable, List
+from functools import lru_cache, partial
+from itertools import chain, islice
+from sqlite3 import Cursor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import logging
-from timekeeper.database import open_db
-from timekeeper.times import now_rounded
+from timekeeper.database import ConnectionManager, connections, read_only_uri
+from timekeeper.schema import create_archive, migrate
+from timekeeper.times import (
+    clock_str,
+    date_str,
+    day_key,
+    from_timestamp,
+    now_rounded,
+    parse_datetime,
+    to_timestamp,
+)
+
+if TYPE_CHECKING:
+    from timekeeper.journal import PunchJournal
 
 SESSION_TABLE_NAME = "session"
 TIMES_TABLE_NAME = "times"
+SUMMARY_TABLE_NAME = "day_summary"
+SYNC_TABLE_NAME = "sync_ledger"
+ARCHIVE_TABLE_NAME = "archive_state"
+ARCHIVE_SCHEMA = "archive"
 DATE_FMT = "%Y-%m-%d"
 TIME_FMT = "%H:%M"
 
+DAYS_STREAM = "stream"
+DAYS_AGGREGATE = "aggregate"
+DAYS_SUMMARY = "summary"
+CHUNK_SIZE = 1000
+PAGE_SIZE = 100
+
+MISDATED = "misdated"
+ZERO_LENGTH = "zero_length"
+DUPLICATE = "duplicate"
+OVERLAPPING = "overlapping"
+UNPAIRED_OUT = "unpaired_out"
+UNPAIRED_IN = "unpaired_in"
+ISSUES = (MISDATED, ZERO_LENGTH, DUPLICATE, OVERLAPPING, UNPAIRED_OUT, UNPAIRED_IN)
+FIXABLE_ISSUES = ISSUES[:-1]
+DUPLICATE_WINDOW = 300
+MAX_FIX_PASSES = 10
+
 
 class TimekeeperModelError(Exception):
     """database module exception"""
@@ -24,6 +76,8 @@ class TimekeeperModelError(Exception):
 class Day:
     """Represents a days work time"""
 
+    __slots__ = ("in_dt", "out_dt", "hours")
+
     in_dt: datetime
     out_dt: datetime
     hours: timedelta
@@ -48,32 +102,236 @@ class Day:
 
         return Day(in_dt=ins[0], out_dt=ins[0] + delta, hours=delta)
 
+    @classmethod
+    def from_timestamps(cls, first_in: int, worked: int) -> "Day":
+        """Creates a Day from its first IN timestamp and worked seconds"""
+        in_dt = from_timestamp(first_in)
+        hours = timedelta(seconds=worked)
+        return Day(in_dt=in_dt, out_dt=in_dt + hours, hours=hours)
+
     def __str__(self) -> str:
-        day = self.in_dt.strftime(DATE_FMT)
-        time_in = self.in_dt.strftime(TIME_FMT)
-        time_out = self.out_dt.strftime(TIME_FMT)
-        return f"{day}: {time_in} - {time_out}"
+        return f"{self.day_str()}: {self.time_in_str()} - {self.time_out_str()}"
 
     def tuple(self) -> tuple:
         """Returns the object represented as a tuple"""
         return (
-            self.in_dt.strftime(DATE_FMT),
-            self.in_dt.strftime(TIME_FMT),
-            self.out_dt.strftime(TIME_FMT),
+            self.day_str(),
+            self.time_in_str(),
+            self.time_out_str(),
             self.hours,
         )
 
     def day_str(self) -> str:
         """Returns the day as a formated string"""
-        return self.in_dt.strftime(DATE_FMT)
+        return self.in_dt.date().isoformat()
 
     def time_in_str(self) -> str:
         """Returns the in time as a formated string"""
-        return self.in_dt.strftime(TIME_FMT)
+        return f"{self.in_dt.hour:02d}:{self.in_dt.minute:02d}"
 
     def time_out_str(self) -> str:
         """Returns the out time as a formated string"""
-        return self.out_dt.strftime(TIME_FMT)
+        return f"{self.out_dt.hour:02d}:{self.out_dt.minute:02d}"
+
+
+@dataclass
+class PunchPage:
+    """Registers of a page, and the cursor of the next one if any"""
+
+    rows: List[tuple]
+    cursor: Optional[str] = None
+
+
+def encode_cursor(ts: int, row_id: int) -> str:
+    """Returns the opaque page cursor of the last register seen"""
+    return base64.urlsafe_b64encode(f"{ts}:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Returns the timestamp and id a page cursor points after"""
+    try:
+        ts, row_id = (
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            .decode()
+            .split(":")
+        )
+        return int(ts), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise TimekeeperModelError(f"Invalid page cursor: {cursor}") from error
+
+
+def day_tuple(first_in: int, worked: int) -> tuple:
+    """Returns a day represented as a tuple from its stored values"""
+    return (
+        date_str(first_in),
+        clock_str(first_in),
+        clock_str(first_in + worked),
+        timedelta(seconds=worked),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_numpy():
+    """Returns the NumPy module, or None when it is not installed
+
+    The import is only tried once, and not before the first columnar total.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class DayBatch:
+    """Columnar collection of days
+
+    Keeps the first IN timestamps and worked seconds of each day in parallel
+    arrays. Day objects and formatted strings are only built on demand.
+    """
+
+    __slots__ = ("starts", "worked")
+
+    def __init__(self, rows: Iterable[Tuple[int, int]] = ()):
+        columns = array("q", chain.from_iterable(rows))
+        self.starts = columns[0::2]
+        self.worked = columns[1::2]
+
+    @classmethod
+    def from_days(cls, days: Iterable[Day]) -> "DayBatch":
+        """Creates a DayBatch from Day objects"""
+        return cls(
+            (to_timestamp(day.in_dt), int(day.hours.total_seconds())) for day in days
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Day:
+        return Day.from_timestamps(self.starts[index], self.worked[index])
+
+    def __iter__(self) -> Iterator[Day]:
+        return map(Day.from_timestamps, self.starts, self.worked)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DayBatch):
+            return self.starts == other.starts and self.worked == other.worked
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def day_str(self, index: int) -> str:
+        """Returns a day as a formated string"""
+        return date_str(self.starts[index])
+
+    def time_in_str(self, index: int) -> str:
+        """Returns a day in time as a formated string"""
+        return clock_str(self.starts[index])
+
+    def time_out_str(self, index: int) -> str:
+        """Returns a day out time as a formated string"""
+        return clock_str(self.starts[index] + self.worked[index])
+
+    def rows(self) -> Iterator[Tuple[int, int]]:
+        """Yields the first IN timestamp and worked seconds of every day"""
+        return zip(self.starts, self.worked)
+
+    def tuples(self) -> Iterator[tuple]:
+        """Yields every day represented as a tuple, formatting on demand"""
+        return (day_tuple(first_in, worked) for first_in, worked in self.rows())
+
+    def arrays(self) -> tuple:
+        """Returns the starts and worked columns, as NumPy arrays if available"""
+        numpy = load_numpy()
+        if numpy is None:
+            return self.starts, self.worked
+        return (
+            numpy.frombuffer(self.starts, dtype=numpy.int64),
+            numpy.frombuffer(self.worked, dtype=numpy.int64),
+        )
+
+    def worked_seconds(self) -> int:
+        """Returns the worked seconds of every day, summed over the column"""
+        numpy = load_numpy()
+        if numpy is None:
+            return sum(self.worked)
+        _, worked = self.arrays()
+        return int(worked.sum())
+
+    def total(self) -> timedelta:
+        """Returns the worked time of every day"""
+        return timedelta(seconds=self.worked_seconds())
+
+    def average(self) -> timedelta:
+        """Returns the average worked time per day"""
+        if not self.worked:
+            return timedelta()
+        return timedelta(seconds=self.worked_seconds() / len(self.worked))
+
+    def percentile(self, percent: float) -> timedelta:
+        """Returns the worked time percentile, interpolating linearly"""
+        if not self.worked:
+            return timedelta()
+
+        numpy = load_numpy()
+        if numpy is not None:
+            _, worked = self.arrays()
+            return timedelta(seconds=float(numpy.percentile(worked, percent)))
+
+        ordered = sorted(self.worked)
+        position = (len(ordered) - 1) * percent / 100
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        fraction = position - lower
+        seconds = ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+        return timedelta(seconds=seconds)
+
+
+def sessionize(punches: Iterable[Tuple[str, datetime]]) -> Iterator[Day]:
+    """Pairs time ordered IN/OUT punches into days in a single pass
+
+    Every interval belongs to the day of its IN punch, so shifts crossing
+    midnight are counted whole on the day they started. An IN punch followed
+    by another IN, or by nothing at all, is an unclosed interval and adds no
+    time. OUT punches with no IN before them are ignored. A day is yielded as
+    soon as a punch of a later day starts, keeping memory constant.
+    """
+
+    current = None
+    first_in = None
+    pending = None
+    delta = timedelta()
+
+    for operation, date in punches:
+        if operation == "IN":
+            if pending is not None:
+                logging.warning(
+                    "Seems you haven't closed this cicle.\nIn: %s\n", pending
+                )
+
+            if date.date() != current:
+                if current is not None:
+                    yield Day(in_dt=first_in, out_dt=first_in + delta, hours=delta)
+
+                current = date.date()
+                first_in = date
+                delta = timedelta()
+
+            pending = date
+            continue
+
+        if pending is None:
+            logging.warning("Ignoring an OUT register with no IN.\nOut: %s\n", date)
+            continue
+
+        delta += date - pending
+        pending = None
+
+    if pending is not None:
+        logging.warning("Seems you haven't closed this cicle.\nIn: %s\n", pending)
+
+    if current is not None:
+        yield Day(in_dt=first_in, out_dt=first_in + delta, hours=delta)
 
 
 class Session:
@@ -83,24 +341,23 @@ class Session:
     connection: Callable
     table: str = SESSION_TABLE_NAME
 
-    def __init__(self, database):
+    def __init__(self, database, manager: ConnectionManager = connections):
         self.database = database
-        self.connection = partial(open_db, database)
+        self.manager = manager
+        self.connection = partial(manager.cursor, database)
 
         self.initialize_db()
 
+    def transaction(self) -> ContextManager:
+        """Groups several model calls into a single commit"""
+        return self.manager.transaction(self.database)
+
     def initialize_db(self) -> None:
-        """Creates the session tables"""
-        with self.connection() as cursor:
-            try:
-                cursor.execute(
-                    f"""CREATE TABLE IF NOT EXISTS `{self.table}` (
-                    id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
-                    session_cookie TEXT
-                    );"""
-                )
-            except Exception as db_error:
-                raise TimekeeperModelError from db_error
+        """Migrates the database schema, creating the session tables"""
+        try:
+            migrate(self.database, self.manager)
+        except Exception as db_error:
+            raise TimekeeperModelError from db_error
 
     def get_cookies(self) -> str:
         with self.connection() as cursor:
@@ -134,108 +391,1029 @@ class Times:
     database: str
     connection: Callable
     table: str = TIMES_TABLE_NAME
+    summary_table: str = SUMMARY_TABLE_NAME
+    archive_table: str = ARCHIVE_TABLE_NAME
 
-    def __init__(self, database):
+    def __init__(
+        self,
+        database,
+        journal: Optional["PunchJournal"] = None,
+        manager: ConnectionManager = connections,
+    ):
         self.database = database
-        self.connection = partial(open_db, database)
+        self.manager = manager
+        self.connection = partial(manager.cursor, database)
+        self.journal = journal
+        self.compacting = False
+        self.compacted = 0
+
+        if journal is not None:
+            self.connection = self.journaled_cursor
 
         self.initialize_db()
 
+    def transaction(self) -> ContextManager:
+        """Groups several model calls into a single commit"""
+        return self.manager.transaction(self.database)
+
+    @contextmanager
+    def journaled_cursor(self) -> Iterator[Cursor]:
+        """Yields a cursor once the punch journal is compacted"""
+        if not self.compacting and self.journal.pending():
+            self.compact_journal()
+
+        with self.manager.cursor(self.database) as cursor:
+            yield cursor
+
+    def compact_journal(self) -> int:
+        """Moves the journaled punches to the database in a single commit
+
+        Punches on archived days can no longer be registered, they are
+        dropped. Returns how many punches were inserted, compacted counts
+        them all.
+        """
+        with self.journal.locked():
+            self.compacting = True
+            try:
+                punches = self.journal.read()
+                state = self.archive_state()
+                if state is not None:
+                    kept = [punch for punch in punches if day_key(punch[1]) >= state[0]]
+                    if len(kept) < len(punches):
+                        logging.warning(
+                            "Dropped %d journaled punches on archived days",
+                            len(punches) - len(kept),
+                        )
+                    punches = kept
+
+                inserted = self.register_rows(punches)
+                self.journal.clear()
+                self.compacted += inserted
+            finally:
+                self.compacting = False
+
+        return inserted
+
     def initialize_db(self) -> None:
-        """Creates the timekeeper database and tables"""
+        """Migrates the database schema, creating the timekeeper tables"""
+        try:
+            migrate(self.database, self.manager)
+        except Exception as db_error:
+            raise TimekeeperModelError from db_error
+
+    def register_row(self, operation: str, date: datetime) -> None:
+        """Registers a row, ignoring it if the punch is already registered"""
+
         with self.connection() as cursor:
             try:
                 cursor.execute(
-                    f"""CREATE TABLE IF NOT EXISTS `{self.table}` (
-                    id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
-                    operation TEXT CHECK( operation IN ('IN','OUT') ) NOT NULL,
-                    date TIMESTAMP);"""
+                    f"""INSERT OR IGNORE INTO `{self.table}`
+                    (`operation`,`date`,`ts`,`day`) VALUES (?, ?, ?, ?);""",
+                    (operation, date, to_timestamp(date), day_key(date)),
                 )
             except Exception as db_error:
                 raise TimekeeperModelError from db_error
 
-    def register_row(self, operation: str, date: datetime) -> None:
-        """Registers a row"""
+    def register_rows(
+        self, rows: Iterable[Tuple[str, datetime]], chunk_size: int = CHUNK_SIZE
+    ) -> int:
+        """Registers many rows in a single transaction
+
+        Rows are inserted chunk by chunk with executemany. Punches already
+        registered are skipped, returns how many rows were inserted.
+        """
+        rows = iter(rows)
+        inserted = 0
+
+        with self.transaction(), self.connection() as cursor:
+            while True:
+                chunk = [
+                    (operation, date, to_timestamp(date), day_key(date))
+                    for operation, date in islice(rows, chunk_size)
+                ]
+                if not chunk:
+                    break
+
+                try:
+                    cursor.executemany(
+                        f"""INSERT OR IGNORE INTO `{self.table}`
+                        (`operation`,`date`,`ts`,`day`) VALUES (?, ?, ?, ?);""",
+                        chunk,
+                    )
+                except Exception as db_error:
+                    raise TimekeeperModelError from db_error
+
+                inserted += cursor.rowcount
+
+        return inserted
+
+    def register_days(self, days: Iterable[List[Tuple[str, datetime]]]) -> int:
+        """Registers the punches of each day not worked yet, in one transaction
+
+        A day is worked once it has an IN. Days starting before the archive
+        bound are skipped too, they can no longer change. Returns how many
+        days were registered.
+        """
+        days = {day_key(punches[0][1]): punches for punches in days if punches}
+        if not days:
+            return 0
+
+        with self.transaction(), self.connection() as cursor:
+            try:
+                if not cursor.connection.in_transaction:
+                    cursor.execute("BEGIN IMMEDIATE;")
+                cursor.execute(
+                    f"""SELECT DISTINCT `day` FROM `{self.table}`
+                    WHERE `operation` = 'IN' AND `day` BETWEEN ? AND ?;""",
+                    (min(days), max(days)),
+                )
+                worked = {row[0] for row in cursor}
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+            state = self.archive_state()
+            before = state[0] if state else 0
+            fill = [key for key in sorted(days) if key not in worked and key >= before]
+
+            self.register_rows(punch for key in fill for punch in days[key])
+
+        return len(fill)
+
+    def register_in(self, date: datetime = None) -> None:
+        """Registers a user entrance, now by default"""
+        self.register_row("IN", date or now_rounded())
+
+    def register_out(self, date: datetime = None) -> None:
+        """Registers a user exit, now by default"""
+        self.register_row("OUT", date or now_rounded())
+
+    def issues_query(self) -> str:
+        """Returns the query classifying the punches with an issue
+
+        A single window pass over the ts index compares every punch with
+        its neighbours, packed with their operation into one integer to
+        keep the window cheap. Rows are the issue, id, operation and date,
+        each punch with at most one issue. The fixes remove the later IN of
+        two consecutive ones and the earlier OUT of two consecutive ones,
+        which keeps the widest cycle. Binds the day key of today.
+        """
+        misdated = (
+            "(`day` IS NULL OR `ts` != CAST(strftime('%s', `date`) AS INTEGER) "
+            "OR `day` != CAST(replace(substr(`date`, 1, 10), '-', '') AS INTEGER))"
+        )
+        first_in = f"(SELECT MIN(`ts`) FROM `{self.table}` WHERE `operation` = 'IN')"
+
+        return f"""SELECT `issue`, `id`, `operation`, `date` FROM (
+            SELECT CASE
+                WHEN `misdated` THEN '{MISDATED}'
+                WHEN `prev` / 2 = `ts` AND `prev` % 2 != `is_in`
+                OR `next` / 2 = `ts` AND `next` % 2 != `is_in`
+                THEN '{ZERO_LENGTH}'
+                WHEN `is_in` AND `prev` % 2 THEN
+                    CASE WHEN `ts` - `prev` / 2 <= {DUPLICATE_WINDOW}
+                    THEN '{DUPLICATE}' ELSE '{OVERLAPPING}' END
+                WHEN NOT `is_in` AND `next` % 2 = 0 THEN
+                    CASE WHEN `next` / 2 - `ts` <= {DUPLICATE_WINDOW}
+                    THEN '{DUPLICATE}' ELSE '{UNPAIRED_OUT}' END
+                WHEN NOT `is_in` AND `ts` < COALESCE({first_in}, `ts` + 1)
+                THEN '{UNPAIRED_OUT}'
+                WHEN `is_in` AND `next` IS NULL AND `day` < ?
+                THEN '{UNPAIRED_IN}'
+                END AS `issue`, `id`
+            FROM (
+                SELECT `id`, `ts`, `day`, `operation` = 'IN' AS `is_in`,
+                {misdated} AS `misdated`,
+                LAG(`ts` * 2 + (`operation` = 'IN')) OVER `sequence` AS `prev`,
+                LEAD(`ts` * 2 + (`operation` = 'IN')) OVER `sequence` AS `next`
+                FROM `{self.table}`
+                WINDOW `sequence` AS (ORDER BY `ts`, `id`)
+            )
+        ) JOIN `{self.table}` USING (`id`) WHERE `issue` IS NOT NULL"""
+
+    def iter_issues(self, today: int) -> Iterator[tuple]:
+        """Yields the issue, id, operation and date of the faulty punches"""
+
+        with self.connection() as cursor:
+            try:
+                cursor.execute(f"{self.issues_query()} ORDER BY `date`;", (today,))
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+            yield from cursor
+
+    def count_issues(self, today: int) -> Dict[str, int]:
+        """Returns how many punches have each issue"""
 
         with self.connection() as cursor:
             try:
                 cursor.execute(
-                    f"INSERT INTO `{self.table}` (`operation`,`date`) VALUES (?, ?);",
-                    (operation, date),
+                    f"""SELECT `issue`, COUNT(*) FROM ({self.issues_query()})
+                    GROUP BY `issue`;""",
+                    (today,),
+                )
+                return dict(cursor.fetchall())
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def fix_issues(self, today: int) -> Dict[str, int]:
+        """Repairs the fixable issues in a single transaction
+
+        Misdated punches get their ts and day recomputed from their date,
+        unless another punch already has that operation and ts. Those are
+        left misdated and logged. Then faulty punches are deleted pass after
+        pass, as deletions can reveal new neighbours. Returns how many
+        punches of each issue were fixed. Unpaired INs of past days are only
+        reported.
+        """
+        fixable = ", ".join(
+            f"'{issue}'" for issue in FIXABLE_ISSUES if issue != MISDATED
+        )
+        fixed: Dict[str, int] = {}
+        punch = f"`{self.table}`"
+        date_ts = f"CAST(strftime('%s', {punch}.`date`) AS INTEGER)"
+        misdated = f"""({punch}.`day` IS NULL OR {punch}.`ts` != {date_ts}
+            OR {punch}.`day` !=
+            CAST(replace(substr({punch}.`date`, 1, 10), '-', '') AS INTEGER))"""
+        taken = f"""EXISTS (SELECT 1 FROM {punch} AS `other`
+            WHERE `other`.`operation` = {punch}.`operation`
+            AND `other`.`ts` = {date_ts} AND `other`.`id` != {punch}.`id`)"""
+
+        with self.transaction(), self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"""SELECT `operation`, `date` FROM {punch}
+                    WHERE {misdated} AND {taken};"""
+                )
+                for operation, date in cursor.fetchall():
+                    logging.warning(
+                        "Not fixing the misdated %s punch of %s, "
+                        "another punch has its time",
+                        operation,
+                        date,
+                    )
+
+                cursor.execute(
+                    f"""UPDATE {punch} SET `ts` = {date_ts},
+                    `day` = CAST(strftime('%Y%m%d', {punch}.`date`) AS INTEGER)
+                    WHERE {misdated} AND NOT {taken};"""
+                )
+                if cursor.rowcount:
+                    fixed[MISDATED] = cursor.rowcount
+
+                cursor.execute(
+                    """CREATE TEMP TABLE IF NOT EXISTS `doctor_fixes`
+                    (`id` INTEGER PRIMARY KEY, `issue` TEXT);"""
                 )
+                for _ in range(MAX_FIX_PASSES):
+                    cursor.execute("DELETE FROM `doctor_fixes`;")
+                    cursor.execute(
+                        f"""INSERT INTO `doctor_fixes` SELECT `id`, `issue`
+                        FROM ({self.issues_query()}) WHERE `issue` IN ({fixable});""",
+                        (today,),
+                    )
+                    if not cursor.rowcount:
+                        break
+
+                    cursor.execute(
+                        f"""DELETE FROM `{self.table}`
+                        WHERE `id` IN (SELECT `id` FROM `doctor_fixes`);"""
+                    )
+                    cursor.execute(
+                        "SELECT `issue`, COUNT(*) FROM `doctor_fixes` GROUP BY `issue`;"
+                    )
+                    for issue, count in cursor.fetchall():
+                        fixed[issue] = fixed.get(issue, 0) + count
+
+                cursor.execute("DROP TABLE `doctor_fixes`;")
             except Exception as db_error:
                 raise TimekeeperModelError from db_error
 
-    def register_in(self, date: datetime = now_rounded()) -> None:
-        """Registers a user entrance"""
-        self.register_row("IN", date)
+            # Updates do not dirty the daily summary like deletions do
+            if MISDATED in fixed:
+                self.rebuild_summary()
 
-    def register_out(self, date: datetime = now_rounded()) -> None:
-        """Registers a user exit"""
-        self.register_row("OUT", date)
+        return fixed
 
     def remove_register(self, date: datetime) -> None:
         """Removes a all registers related to a day"""
         with self.connection() as cursor:
             try:
                 cursor.execute(
-                    f"DELETE FROM `{self.table}` WHERE `date` LIKE ?;",
-                    (f"{date.strftime('%Y-%m-%d')}%",),
+                    f"DELETE FROM `{self.table}` WHERE `day` = ?;",
+                    (day_key(date),),
                 )
             except Exception as db_error:
                 raise TimekeeperModelError from db_error
 
     def clear_db(self) -> None:
-        """Clears the database tables"""
+        """Clears the database tables, forgetting the archive if any"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(f"DELETE FROM `{self.table}`;")
+                cursor.execute(f"DELETE FROM `{self.summary_table}`;")
+                cursor.execute(f"DELETE FROM `{self.archive_table}`;")
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def filter_conditions(self, filters: dict = None) -> Tuple[List[str], list]:
+        """Returns the conditions and binds matching the filters"""
+
+        if filters is None:
+            filters = {}
+
+        where = []
+        binds = []
+
+        if filters.get("date_from"):
+            where.append("`ts` >= ?")
+            binds.append(to_timestamp(parse_datetime(filters.get("date_from"))))
+
+        if filters.get("date_to"):
+            where.append("`ts` <= ?")
+            binds.append(to_timestamp(parse_datetime(filters.get("date_to"))))
+
+        return where, binds
+
+    def filter_clause(self, filters: dict = None) -> Tuple[str, list]:
+        """Returns the WHERE clause and binds matching the filters"""
+
+        where, binds = self.filter_conditions(filters)
+
+        if not where:
+            return "", binds
+
+        return f" WHERE {' AND '.join(where)}", binds
+
+    def archive_state(self) -> Optional[Tuple[int, str]]:
+        """Returns the archive bound day key and path, None if not archived"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"SELECT `before`, `path` FROM `{self.archive_table}` WHERE id = 1;"
+                )
+                return cursor.fetchone()
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def attached_archive(self) -> Optional[str]:
+        """Returns the file of the attached archive, None if not attached"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    "SELECT `file` FROM pragma_database_list WHERE `name` = ?;",
+                    (ARCHIVE_SCHEMA,),
+                )
+                row = cursor.fetchone()
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+        return None if row is None else row[0]
+
+    def attach_archive(self, path: str, writable: bool = False) -> None:
+        """Attaches the archive database, read-only unless writable
+
+        Read-only attachment needs a URI file name, connections of SQLite
+        builds not reading them attach the file as it is.
+        """
         with self.connection() as cursor:
             try:
-                cursor.execute(f"DROP TABLE `{self.table}`;")
+                if self.attached_archive() is not None:
+                    cursor.execute(f"DETACH DATABASE `{ARCHIVE_SCHEMA}`;")
+                read_only = not writable and cursor.connection.uri
+                cursor.execute(
+                    f"ATTACH DATABASE ? AS `{ARCHIVE_SCHEMA}`;",
+                    (read_only_uri(path) if read_only else path,),
+                )
             except Exception as db_error:
                 raise TimekeeperModelError from db_error
 
+    def detach_archive(self) -> None:
+        """Detaches the archive database if attached"""
+        with self.connection() as cursor:
+            try:
+                if self.attached_archive() is not None:
+                    cursor.execute(f"DETACH DATABASE `{ARCHIVE_SCHEMA}`;")
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def punch_tables(self, filters: dict = None) -> List[Tuple[str, List[str]]]:
+        """Returns the tables holding the filtered punches, oldest first
+
+        The archive is only attached when the range starts before its bound.
+        Each table comes with the conditions selecting its own days, so rows
+        copied but not yet deleted by a running archive are read once.
+        """
+        hot = [(f"`{self.table}`", [])]
+
+        state = self.archive_state()
+        if state is None:
+            return hot
+
+        before, path = state
+        date_from = (filters or {}).get("date_from")
+        if date_from and day_key(parse_datetime(date_from)) >= before:
+            return hot
+
+        if self.attached_archive() is None:
+            self.attach_archive(path)
+
+        archived = (f"`{ARCHIVE_SCHEMA}`.`{self.table}`", [f"`day` < {before:d}"])
+        return [archived] + [(f"`{self.table}`", [f"`day` >= {before:d}"])]
+
+    def iter_punches(self, columns: str, filters: dict = None) -> Iterator[tuple]:
+        """Yields columns of the filtered punches in order, archived ones first"""
+
+        where, binds = self.filter_conditions(filters)
+
+        with self.connection() as cursor:
+            for table, conditions in self.punch_tables(filters):
+                query = f"SELECT {columns} FROM {table}"
+                if where + conditions:
+                    query += f" WHERE {' AND '.join(where + conditions)}"
+                query += " ORDER BY `ts`, `id`;"
+
+                try:
+                    cursor.execute(query, binds)
+                except Exception as db_error:
+                    raise TimekeeperModelError from db_error
+
+                yield from cursor
+
+    def iter_all(self, filters: dict = None) -> Iterator[tuple]:
+        """Yields all registers, straight from the cursor"""
+        return self.iter_punches("`operation`,`date`", filters)
+
     def query_all(self, filters: dict = None) -> List[list]:
         """Queries all registers"""
+        return list(self.iter_all(filters))
+
+    def query_page(
+        self,
+        filters: dict = None,
+        limit: int = PAGE_SIZE,
+        after: Optional[str] = None,
+        descending: bool = False,
+    ) -> PunchPage:
+        """Returns a page of the filtered registers, oldest first by default
+
+        Pages start after the cursor of the previous one and are read from
+        the ts index, without OFFSET, so a page costs the same however deep
+        into the history it is.
+        """
+        where, binds = self.filter_conditions(filters)
+        if after is not None:
+            where.append(f"(`ts`, `id`) {'<' if descending else '>'} (?, ?)")
+            binds.extend(decode_cursor(after))
+
+        order = "DESC" if descending else "ASC"
+        queries = []
+        for table, conditions in self.punch_tables(filters):
+            query = f"SELECT `operation`, `date`, `ts`, `id` FROM {table}"
+            if where + conditions:
+                query += f" WHERE {' AND '.join(where + conditions)}"
+            queries.append(
+                f"SELECT * FROM ({query} ORDER BY `ts` {order}, `id` {order} LIMIT ?)"
+            )
+
+        with self.connection() as cursor:
+            query = (
+                f"{' UNION ALL '.join(queries)} "
+                f"ORDER BY `ts` {order}, `id` {order} LIMIT ?;"
+            )
+
+            try:
+                cursor.execute(
+                    query, (binds + [limit + 1]) * len(queries) + [limit + 1]
+                )
+                rows = cursor.fetchall()
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+        if len(rows) <= limit:
+            return PunchPage([row[:2] for row in rows])
+
+        last = rows[limit - 1]
+        return PunchPage([row[:2] for row in rows[:limit]], encode_cursor(*last[2:]))
+
+    def iter_rows(
+        self, filters: dict = None, mode: str = DAYS_SUMMARY
+    ) -> Iterator[Tuple[int, int]]:
+        """Yields the first IN timestamp and worked seconds of filtered days
+
+        By default closed days are read from the daily summary, refreshing
+        only the days changed since the last read. The aggregate and stream
+        modes compute every day from the registers, in SQLite or in Python.
+        """
+        if mode == DAYS_SUMMARY:
+            return self.summary_rows(filters)
+
+        if mode == DAYS_AGGREGATE:
+            return self.aggregate_rows(filters)
+
+        if mode == DAYS_STREAM:
+            return (
+                (to_timestamp(day.in_dt), int(day.hours.total_seconds()))
+                for day in self.stream_days(filters)
+            )
+
+        raise TimekeeperModelError(f"Unknown days query mode: {mode}")
+
+    def iter_days(
+        self, filters: dict = None, mode: str = DAYS_SUMMARY
+    ) -> Iterator[Day]:
+        """Yields filtered registers as days"""
+        if mode == DAYS_STREAM:
+            return self.stream_days(filters)
+
+        return (Day.from_timestamps(*row) for row in self.iter_rows(filters, mode))
+
+    def paired_days_query(
+        self, punches: List[str], following: List[str], table: str = None
+    ) -> str:
+        """Returns the query summarizing the days of the matching IN punches
+
+        Each IN is paired with the punch following it, looked up through the
+        ts index, which beats a LEAD window over the whole range. The query
+        yields the day, first IN, worked seconds and open cycle flag.
+        """
+        table = table or f"`{self.table}`"
+        following = " AND ".join(
+            ["(`ts`, `id`) > (`punch`.`ts`, `punch`.`id`)"] + following
+        )
+        punches = " AND ".join(["`operation` = 'IN'"] + punches)
+
+        return f"""SELECT `day`, MIN(`ts`) AS `first_in`,
+            SUM(COALESCE(`paired`, 0)) AS `worked`,
+            MAX(`paired` IS NULL) AS `open`
+            FROM (
+                SELECT `day`, `ts`, (
+                    SELECT CASE WHEN `operation` = 'OUT' THEN `ts` - `punch`.`ts` END
+                    FROM {table}
+                    WHERE {following}
+                    ORDER BY `ts`, `id`
+                    LIMIT 1
+                ) AS `paired`
+                FROM {table} AS `punch`
+                WHERE {punches}
+            )
+            GROUP BY `day`"""
+
+    def aggregate_rows(self, filters: dict = None) -> Iterator[Tuple[int, int]]:
+        """Yields filtered days first IN and worked seconds, summed by SQLite
+
+        The range bounds the IN punches only, the OUT closing one may fall on
+        the next day.
+        """
+
+        where, binds = self.filter_conditions(filters)
+
+        queries = []
+        for table, conditions in self.punch_tables(filters):
+            queries.append(
+                self.paired_days_query(where + conditions, conditions, table)
+            )
+
+        with self.connection() as cursor:
+            query = f"{' UNION ALL '.join(queries)} ORDER BY `day`;"
+
+            try:
+                cursor.execute(query, binds * len(queries))
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+            for _, first_in, worked, _ in cursor:
+                yield first_in, worked
+
+    def data_version(self) -> int:
+        """Returns a number changing whenever another connection commits"""
+
+        with self.connection() as cursor:
+            try:
+                cursor.execute("PRAGMA data_version;")
+                return cursor.fetchone()[0]
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def last_punch(self) -> Optional[Tuple[str, int]]:
+        """Returns the operation and timestamp of the latest register"""
+
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"""SELECT `operation`, `ts` FROM `{self.table}`
+                    ORDER BY `ts` DESC, `id` DESC LIMIT 1;"""
+                )
+                return cursor.fetchone()
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def summary_is_fresh(self) -> bool:
+        """Tells whether no day of the daily summary waits to be recomputed"""
+
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"SELECT 1 FROM `{self.summary_table}` WHERE `dirty` LIMIT 1;"
+                )
+                return cursor.fetchone() is None
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def refresh_summary(self) -> None:
+        """Recomputes the dirty days of the daily summary from the registers
+
+        Running totals are then recomputed from the first dirty day on, so
+        clocking in today only updates today.
+        """
+
+        query = self.paired_days_query(
+            [f"`day` IN (SELECT `day` FROM `{self.summary_table}` WHERE `dirty`)"],
+            [],
+        )
+
+        with self.transaction(), self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"SELECT MIN(`day`) FROM `{self.summary_table}` WHERE `dirty`;"
+                )
+                first_dirty = cursor.fetchone()[0]
+                if first_dirty is None:
+                    return
+
+                cursor.execute(
+                    f"""INSERT INTO `{self.summary_table}`
+                    (`day`, `first_in`, `out_ts`, `worked`, `open`, `dirty`)
+                    SELECT `day`, `first_in`, `first_in` + `worked`, `worked`, `open`, 0
+                    FROM ({query})
+                    WHERE true
+                    ON CONFLICT (`day`) DO UPDATE SET
+                    `first_in` = excluded.`first_in`,
+                    `out_ts` = excluded.`out_ts`,
+                    `worked` = excluded.`worked`,
+                    `open` = excluded.`open`,
+                    `dirty` = 0;"""
+                )
+                cursor.execute(f"DELETE FROM `{self.summary_table}` WHERE `dirty`;")
+                self.accumulate(cursor, first_dirty)
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def accumulate(self, cursor: Cursor, first_day: int) -> None:
+        """Recomputes the running totals of the days from first_day on"""
+        cursor.execute(
+            f"""SELECT `cum_worked`, `cum_days` FROM `{self.summary_table}`
+            WHERE `day` < ? ORDER BY `day` DESC LIMIT 1;""",
+            (first_day,),
+        )
+        cum_worked, cum_days = cursor.fetchone() or (0, 0)
+
+        cursor.execute(
+            f"""INSERT INTO `{self.summary_table}` (`day`, `cum_worked`, `cum_days`)
+            SELECT `day`,
+            ? + SUM(`worked`) OVER `previous`,
+            ? + SUM(`worked` > 0) OVER `previous`
+            FROM `{self.summary_table}` WHERE `day` >= ?
+            WINDOW `previous` AS (ORDER BY `day`)
+            ON CONFLICT (`day`) DO UPDATE SET
+            `cum_worked` = excluded.`cum_worked`,
+            `cum_days` = excluded.`cum_days`;""",
+            (cum_worked, cum_days, first_day),
+        )
 
+    def running_totals(self, day: int) -> Tuple[int, int]:
+        """Returns the worked seconds and days from the first day until day"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"""SELECT `cum_worked`, `cum_days` FROM `{self.summary_table}`
+                    WHERE `day` <= ? ORDER BY `day` DESC LIMIT 1;""",
+                    (day,),
+                )
+                return cursor.fetchone() or (0, 0)
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def summary_bounds(self) -> Optional[Tuple[int, int]]:
+        """Returns the first and last worked day keys, None if there are none"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"""SELECT MIN(`day`), MAX(`day`) FROM `{self.summary_table}`
+                    WHERE `worked` > 0;"""
+                )
+                first, last = cursor.fetchone()
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+        return None if first is None else (first, last)
+
+    def range_totals(self, first_day: int, last_day: int) -> Tuple[int, int]:
+        """Returns the worked seconds and days between two day keys
+
+        Reads two running totals of the daily summary, whatever the range.
+        The summary must be fresh, see refresh_summary.
+        """
+        worked, days = self.running_totals(last_day)
+        worked_before, days_before = self.running_totals(first_day - 1)
+        return worked - worked_before, days - days_before
+
+    def rebuild_summary(self) -> None:
+        """Rebuilds the daily summary from the registers
+
+        Archived days keep their summaries, their punches are not here.
+        """
+        state = self.archive_state()
+        before = state[0] if state else 0
+
+        with self.transaction(), self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"DELETE FROM `{self.summary_table}` WHERE `day` >= ?;", (before,)
+                )
+                cursor.execute(
+                    f"""INSERT INTO `{self.summary_table}` (`day`)
+                    SELECT DISTINCT `day` FROM `{self.table}`
+                    WHERE `day` IS NOT NULL;"""
+                )
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+            self.refresh_summary()
+
+    def closed_cutoff(self, cutoff: int) -> int:
+        """Moves a day key back until no work cycle crosses it
+
+        A cycle crosses the cutoff when the last punch before it is an IN
+        that is not followed by an OUT before it.
+        """
+        with self.connection() as cursor:
+            try:
+                while True:
+                    cursor.execute(
+                        f"""SELECT `operation`, `day` FROM `{self.table}`
+                        WHERE `day` < ? ORDER BY `ts` DESC, `id` DESC LIMIT 1;""",
+                        (cutoff,),
+                    )
+                    last = cursor.fetchone()
+                    if last is None or last[0] != "IN":
+                        return cutoff
+                    cutoff = last[1]
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def archive(self, before: datetime, path: str) -> Tuple[int, int]:
+        """Moves the punches of the days before a date to an archive database
+
+        The cutoff is moved back so no open work cycle is split. Summaries
+        of the archived days stay here, reports never read the archive.
+        Returns the number of punches moved and the cutoff day key.
+        """
+        self.refresh_summary()
+
+        state = self.archive_state()
+        if state is not None and os.path.abspath(state[1]) != os.path.abspath(path):
+            raise TimekeeperModelError(f"Punches are already archived in {state[1]}")
+
+        cutoff = self.closed_cutoff(day_key(before))
+        if state is not None and cutoff <= state[0]:
+            return 0, state[0]
+
+        self.attach_archive(path, writable=True)
+        try:
+            # Attached WAL databases do not commit atomically together: the
+            # punches are copied first, then deleted along with the bound
+            # move. Readers split tables by the bound, so they never see
+            # a punch twice or miss one in between.
+            with self.transaction(), self.connection() as cursor:
+                try:
+                    create_archive(cursor, ARCHIVE_SCHEMA)
+                    cursor.execute(
+                        f"""INSERT OR IGNORE INTO `{ARCHIVE_SCHEMA}`.`{self.table}`
+                        (`id`, `operation`, `date`, `ts`, `day`)
+                        SELECT `id`, `operation`, `date`, `ts`, `day`
+                        FROM `{self.table}` WHERE `day` < ?;""",
+                        (cutoff,),
+                    )
+                except Exception as db_error:
+                    raise TimekeeperModelError from db_error
+
+            with self.transaction(), self.connection() as cursor:
+                self.refresh_summary()
+                try:
+                    # Punches registered since the copy keep their days here
+                    cursor.execute(
+                        f"""SELECT MIN(`day`) FROM `{self.table}` WHERE `day` < ?
+                        AND `id` NOT IN
+                        (SELECT `id` FROM `{ARCHIVE_SCHEMA}`.`{self.table}`);""",
+                        (cutoff,),
+                    )
+                    cutoff = cursor.fetchone()[0] or cutoff
+                    cursor.execute(
+                        f"DELETE FROM `{self.table}` WHERE `day` < ?;", (cutoff,)
+                    )
+                    moved = cursor.rowcount
+                    # The deletions dirty the archived days, their summaries
+                    # stay as they are, days only the delete triggers added go
+                    cursor.execute(
+                        f"""DELETE FROM `{self.summary_table}`
+                        WHERE `day` < ? AND `first_in` IS NULL;""",
+                        (cutoff,),
+                    )
+                    cursor.execute(
+                        f"""UPDATE `{self.summary_table}` SET `dirty` = 0
+                        WHERE `day` < ?;""",
+                        (cutoff,),
+                    )
+                    cursor.execute(
+                        f"""INSERT INTO `{self.archive_table}` (id, `before`, `path`)
+                        VALUES (1, ?, ?)
+                        ON CONFLICT (id) DO UPDATE SET `before` = excluded.`before`;""",
+                        (cutoff, os.path.abspath(path)),
+                    )
+                except Exception as db_error:
+                    raise TimekeeperModelError from db_error
+        finally:
+            self.detach_archive()
+
+        return moved, cutoff
+
+    def summary_rows(self, filters: dict = None) -> Iterator[Tuple[int, int]]:
+        """Yields filtered days first IN and worked seconds from the summary
+
+        Days changed since the last read are recomputed first. Filters are
+        applied on whole days.
+        """
         if filters is None:
             filters = {}
 
+        self.refresh_summary()
+
         where = []
         binds = []
 
         if filters.get("date_from"):
-            where.append("`date` >= ?")
-            binds.append(filters.get("date_from"))
+            where.append("`day` >= ?")
+            binds.append(day_key(parse_datetime(filters.get("date_from"))))
 
         if filters.get("date_to"):
-            where.append("`date` <= ?")
-            binds.append(filters.get("date_to"))
+            where.append("`day` <= ?")
+            binds.append(day_key(parse_datetime(filters.get("date_to"))))
 
         with self.connection() as cursor:
-            query = f"SELECT `operation`,`date` FROM `{self.table}`"
+            query = f"SELECT `first_in`, `worked` FROM `{self.summary_table}`"
             if where:
-                query += f"WHERE {' AND '.join(where)}"
+                query += f" WHERE {' AND '.join(where)}"
+            query += " ORDER BY `day`;"
 
             try:
                 cursor.execute(query, binds)
-                fetched_data = cursor.fetchall()
-                return fetched_data
             except Exception as db_error:
                 raise TimekeeperModelError from db_error
 
-    def query_days(self, filters: dict = None) -> List[Day]:
+            yield from cursor
+
+    def stream_days(self, filters: dict = None) -> Iterator[Day]:
+        """Yields filtered registers as days, reading them in a single pass"""
+
+        yield from sessionize(
+            (operation, from_timestamp(ts))
+            for operation, ts in self.day_punches(filters)
+        )
+
+    def day_punches(self, filters: dict = None) -> Iterator[Tuple[str, int]]:
+        """Yields the operation and ts of the filtered punches
+
+        The range bounds the IN punches only, an OUT closing the last IN is
+        yielded even when it falls after the range, on the next day.
+        """
+        last = None
+        for last in self.iter_punches("`operation`,`ts`,`id`", filters):
+            yield last[:2]
+
+        if last is None or last[0] != "IN" or not (filters or {}).get("date_to"):
+            return
+
+        with self.connection() as cursor:
+            for table, conditions in self.punch_tables(filters):
+                query = (
+                    f"SELECT `operation`, `ts` FROM {table} WHERE "
+                    f"{' AND '.join(['(`ts`, `id`) > (?, ?)'] + conditions)} "
+                    "ORDER BY `ts`, `id` LIMIT 1;"
+                )
+
+                try:
+                    cursor.execute(query, last[1:])
+                    following = cursor.fetchone()
+                except Exception as db_error:
+                    raise TimekeeperModelError from db_error
+
+                if following is not None:
+                    if following[0] == "OUT":
+                        yield following
+                    return
+
+    def query_days(self, filters: dict = None, mode: str = DAYS_SUMMARY) -> DayBatch:
         """Returns filtered registers as days"""
-        query = self.query_all(filters=filters)
+        return DayBatch(self.iter_rows(filters=filters, mode=mode))
 
-        days = {}
-        for reg_operation, reg_date in query:
-            day_key = reg_date.strftime("%Y-%m-%d")
 
-            if not days.get(day_key):
-                days[day_key] = {}
+class SyncLedger:
+    """Represents what was sent to the remote server for each day
+
+    Days not sent yet, or whose last send failed, form the outbox.
+    """
+
+    database: str
+    connection: Callable
+    table: str = SYNC_TABLE_NAME
+
+    def __init__(self, database, manager: ConnectionManager = connections):
+        self.database = database
+        self.manager = manager
+        self.connection = partial(manager.cursor, database)
+
+        self.initialize_db()
+
+    def transaction(self) -> ContextManager:
+        """Groups several model calls into a single commit"""
+        return self.manager.transaction(self.database)
+
+    def initialize_db(self) -> None:
+        """Migrates the database schema, creating the ledger tables"""
+        try:
+            migrate(self.database, self.manager)
+        except Exception as db_error:
+            raise TimekeeperModelError from db_error
 
-            if not days[day_key].get(reg_operation):
-                days[day_key][reg_operation] = []
+    @staticmethod
+    def digest(day: Day) -> str:
+        """Returns the hash of what is sent to the remote server for a day"""
+        sent = f"{day.day_str()}|{day.time_in_str()}|{day.time_out_str()}"
+        return hashlib.sha1(sent.encode()).hexdigest()
 
-            days[day_key][reg_operation].append(reg_date)
+    def enqueue(self, days: Iterable[Day]) -> int:
+        """Queues the new or changed days, returns how many were queued"""
 
-        return [Day.from_dict(day) for day in days.values()]
+        rows = [
+            (
+                day_key(day.in_dt),
+                self.digest(day),
+                to_timestamp(day.in_dt),
+                int(day.hours.total_seconds()),
+                int(time.time()),
+            )
+            for day in days
+        ]
+
+        with self.connection() as cursor:
+            try:
+                cursor.execute("SELECT total_changes();")
+                before = cursor.fetchone()[0]
+                cursor.executemany(
+                    f"""INSERT INTO `{self.table}`
+                    (`day`, `digest`, `first_in`, `worked`, `status`, `updated`)
+                    VALUES (?, ?, ?, ?, 'pending', ?)
+                    ON CONFLICT (`day`) DO UPDATE SET
+                    `digest` = excluded.`digest`,
+                    `first_in` = excluded.`first_in`,
+                    `worked` = excluded.`worked`,
+                    `status` = 'pending',
+                    `attempts` = 0,
+                    `updated` = excluded.`updated`
+                    WHERE `digest` != excluded.`digest`;""",
+                    rows,
+                )
+                cursor.execute("SELECT total_changes();")
+                return cursor.fetchone()[0] - before
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def outbox(self) -> DayBatch:
+        """Returns the days waiting to be sent"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"""SELECT `first_in`, `worked` FROM `{self.table}`
+                    WHERE `status` != 'sent' ORDER BY `day`;"""
+                )
+                return DayBatch(cursor)
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
+
+    def mark(self, day: Day, sent: bool) -> None:
+        """Records the result of sending a day"""
+        with self.connection() as cursor:
+            try:
+                cursor.execute(
+                    f"""UPDATE `{self.table}` SET
+                    `status` = ?, `attempts` = `attempts` + 1, `updated` = ?
+                    WHERE `day` = ? AND `digest` = ?;""",
+                    (
+                        "sent" if sent else "failed",
+                        int(time.time()),
+                        day_key(day.in_dt),
+                        self.digest(day),
+                    ),
+                )
+            except Exception as db_error:
+                raise TimekeeperModelError from db_error
@@ -0,0 +1,383 @@
+"""Profiling module
+
+Counts calls and wall time of every stage of an invocation: database
+connects, each SQL statement and the fetching of its rows, the model
+queries, day construction, rendering and the Hiper requests.
+
+Hooks are installed by replacing the instrumented callables, modules not
+imported yet are hooked right after their import. Nothing is replaced, nor
+this module imported, unless profiling is enabled, so disabled runs execute
+the original code untouched. Stage times are inclusive, a query includes
+the SQL statements it runs.
+"""
+
+import importlib.abc
+import inspect
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from timekeeper.database import RetryingConnection, RetryingCursor
+
+STATEMENT_WIDTH = 80
+
+# (module, owner, attribute, stage), owner None for module level callables
+HOOKS = (
+    ("timekeeper.database", None, "connect", "db.connect"),
+    ("timekeeper.model", None, "migrate", "db.migrate"),
+    ("timekeeper.model", "Day", "from_dict", "day.from_dict"),
+    ("timekeeper.model", "Day", "from_timestamps", "day.from_timestamps"),
+    ("timekeeper.model", None, "sessionize", "day.sessionize"),
+    ("timekeeper.model", "Times", "register_row", "times.register_row"),
+    ("timekeeper.model", "Times", "register_rows", "times.register_rows"),
+    ("timekeeper.model", "Times", "remove_register", "times.remove_register"),
+    ("timekeeper.model", "Times", "iter_all", "times.iter_all"),
+    ("timekeeper.model", "Times", "iter_rows", "times.iter_rows"),
+    ("timekeeper.model", "Times", "refresh_summary", "times.refresh_summary"),
+    ("timekeeper.model", "Times", "rebuild_summary", "times.rebuild_summary"),
+    ("timekeeper.model", "Times", "query_days", "times.query_days"),
+    ("timekeeper.model", "SyncLedger", "enqueue", "ledger.enqueue"),
+    ("timekeeper.model", "SyncLedger", "outbox", "ledger.outbox"),
+    ("timekeeper.model", "SyncLedger", "mark", "ledger.mark"),
+    ("timekeeper.cli.render", None, "write_table", "render.table"),
+    ("timekeeper.cli.render", None, "write_records", "render.records"),
+    ("timekeeper.remote", "Hiper", "post", "hiper.post"),
+    ("timekeeper.remote", "Hiper", "login", "hiper.login"),
+    ("timekeeper.remote", "Hiper", "register_days", "hiper.register_days"),
+)
+
+
+class Stage:
+    """Accumulated calls, rows and wall time of a stage"""
+
+    __slots__ = ("calls", "rows", "elapsed")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.elapsed = 0.0
+
+
+class Profiler:
+    """Collects stage timings, and trace events when a trace is requested"""
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.started = perf_counter()
+        self.stages: Dict[str, Stage] = {}
+        self.events: List[dict] = []
+        self.lock = threading.Lock()
+        self.originals: List[Tuple[object, str, object]] = []
+        self.finder: Optional[HookFinder] = None
+
+    def record(
+        self, stage: str, started: float, elapsed: float, calls: int = 1, rows: int = 0
+    ) -> None:
+        """Adds a timing to a stage"""
+        with self.lock:
+            totals = self.stages.get(stage)
+            if totals is None:
+                totals = self.stages[stage] = Stage()
+            totals.calls += calls
+            totals.rows += rows
+            totals.elapsed += elapsed
+
+            if self.trace and calls:
+                self.events.append(
+                    {
+                        "name": stage,
+                        "ph": "X",
+                        "ts": (started - self.started) * 1e6,
+                        "dur": elapsed * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    }
+                )
+
+    def timed(self, func: Callable, stage: str) -> Callable:
+        """Wraps a callable so its calls are recorded under a stage
+
+        Returned generators are timed while they produce items, so a lazily
+        consumed query is charged for its own work only.
+        """
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def generator(*args, **kwargs):
+                started = perf_counter()
+                return (yield from self.consume(func(*args, **kwargs), stage, started))
+
+            return generator
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                self.record(stage, started, perf_counter() - started)
+                raise
+
+            if inspect.isgenerator(result):
+                return self.consume(result, stage, started, perf_counter() - started)
+
+            self.record(stage, started, perf_counter() - started)
+            return result
+
+        return wrapper
+
+    def consume(
+        self, iterator: Iterator, stage: str, started: float, elapsed: float = 0.0
+    ) -> Iterator:
+        """Yields from an iterator, recording the time spent producing items"""
+        rows = 0
+        try:
+            while True:
+                resumed = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += perf_counter() - resumed
+                rows += 1
+                yield item
+        finally:
+            iterator.close()
+            self.record(stage, started, elapsed, rows=rows)
+
+    def connect(self, func: Callable) -> Callable:
+        """Wraps sqlite3.connect so connections time their statements"""
+        timed = self.timed(func, "db.connect")
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            kwargs["factory"] = ProfiledConnection
+            return timed(*args, **kwargs)
+
+        return wrapper
+
+    def hook(self, module: object) -> None:
+        """Replaces the instrumented callables of an imported module"""
+        for module_name, owner_name, attribute, stage in HOOKS:
+            if module_name != module.__name__:
+                continue
+
+            owner = getattr(module, owner_name) if owner_name else module
+            raw = vars(owner)[attribute]
+            self.originals.append((owner, attribute, raw))
+
+            if stage == "db.connect":
+                setattr(owner, attribute, self.connect(raw))
+            elif isinstance(raw, (classmethod, staticmethod)):
+                setattr(owner, attribute, type(raw)(self.timed(raw.__func__, stage)))
+            else:
+                setattr(owner, attribute, self.timed(raw, stage))
+
+    def install(self) -> None:
+        """Hooks the imported modules, and the rest as they get imported"""
+        modules = {module_name for module_name, *_ in HOOKS}
+        for module_name in modules & set(sys.modules):
+            self.hook(sys.modules[module_name])
+
+        self.finder = HookFinder(self, modules - set(sys.modules))
+        sys.meta_path.insert(0, self.finder)
+
+    def uninstall(self) -> None:
+        """Restores every replaced callable"""
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+
+        for owner, attribute, raw in reversed(self.originals):
+            setattr(owner, attribute, raw)
+        self.originals.clear()
+
+    def summary(self) -> List[tuple]:
+        """Returns the stages sorted by wall time, with the whole run first"""
+        total = perf_counter() - self.started
+        rows = [("total", 1, 0, total * 1000, total * 1000, 100.0)]
+        with self.lock:
+            stages = sorted(
+                self.stages.items(), key=lambda item: item[1].elapsed, reverse=True
+            )
+        for name, stage in stages:
+            rows.append(
+                (
+                    name,
+                    stage.calls,
+                    stage.rows,
+                    stage.elapsed * 1000,
+                    stage.elapsed * 1000 / stage.calls if stage.calls else 0.0,
+                    stage.elapsed / total * 100 if total else 0.0,
+                )
+            )
+        return rows
+
+    def report(self) -> str:
+        """Returns the summary as a table"""
+        from tabulate import tabulate
+
+        return tabulate(
+            self.summary(),
+            headers=["Stage", "Calls", "Rows", "Total ms", "Mean ms", "%"],
+            floatfmt=".3f",
+        )
+
+    def write_trace(self, path: str) -> None:
+        """Writes the events and the summary as a Chrome trace JSON file"""
+        columns = ("stage", "calls", "rows", "total_ms", "mean_ms", "percent")
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf8") as output:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "stages": [dict(zip(columns, row)) for row in self.summary()],
+                },
+                output,
+            )
+
+
+class HookFinder(importlib.abc.MetaPathFinder):
+    """Hooks the instrumented modules right after they get imported"""
+
+    def __init__(self, profiler: Profiler, modules: set):
+        self.profiler = profiler
+        self.modules = modules
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.modules:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        self.modules.discard(fullname)
+        exec_module = spec.loader.exec_module
+
+        def exec_and_hook(module):
+            exec_module(module)
+            self.profiler.hook(module)
+
+        spec.loader.exec_module = exec_and_hook
+        return spec
+
+
+def normalize(statement: str) -> str:
+    """Returns a statement on a single line, shortened for reporting"""
+    statement = re.sub(r"\s+", " ", statement).strip()
+    if len(statement) > STATEMENT_WIDTH:
+        return f"{statement[:STATEMENT_WIDTH - 3]}..."
+    return statement
+
+
+class ProfiledCursor(RetryingCursor):
+    """Cursor timing its statements and the fetching of their rows"""
+
+    statement: Optional[str] = None
+
+    def timed_call(self, method: Callable, statement: str, *args):
+        """Runs a statement, recording it when profiling is still enabled"""
+        active = profiler
+        if active is None:
+            return method(self, statement, *args)
+
+        self.statement = f"sql: {normalize(statement)}"
+        started = perf_counter()
+        try:
+            return method(self, statement, *args)
+        finally:
+            active.record(self.statement, started, perf_counter() - started)
+
+    def timed_fetch(self, method: Callable, *args):
+        """Fetches rows, adding their count and time to the last statement"""
+        active = profiler
+        if active is None or self.statement is None:
+            return method(self, *args)
+
+        started = perf_counter()
+        rows = method(self, *args)
+        count = len(rows) if isinstance(rows, list) else int(rows is not None)
+        active.record(
+            self.statement, started, perf_counter() - started, calls=0, rows=count
+        )
+        return rows
+
+    def execute(self, statement, *args):
+        return self.timed_call(RetryingCursor.execute, statement, *args)
+
+    def executemany(self, statement, *args):
+        return self.timed_call(RetryingCursor.executemany, statement, *args)
+
+    def executescript(self, statement):
+        return self.timed_call(sqlite3.Cursor.executescript, statement)
+
+    def fetchone(self):
+        return self.timed_fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self.timed_fetch(sqlite3.Cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self.timed_fetch(sqlite3.Cursor.fetchall)
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        row = self.timed_fetch(sqlite3.Cursor.fetchone)
+        if row is None:
+            raise StopIteration
+        return row
+
+
+class ProfiledConnection(RetryingConnection):
+    """Connection handing out profiled cursors"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+    def executescript(self, *args):
+        return self.cursor().executescript(*args)
+
+
+profiler: Optional[Profiler] = None
+
+
+def enable(trace: bool = False) -> Profiler:
+    """Starts profiling the process, returns the active profiler"""
+    global profiler  # pylint: disable=global-statement
+
+    if profiler is None:
+        profiler = Profiler(trace=trace)
+        profiler.install()
+    return profiler
+
+
+def disable() -> Optional[Profiler]:
+    """Stops profiling, returns the profiler with what it collected"""
+    global profiler  # pylint: disable=global-statement
+
+    stopped, profiler = profiler, None
+    if stopped is not None:
+        stopped.uninstall()
+    return stopped
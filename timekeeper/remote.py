@@ -1,14 +1,115 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+from typing import Dict, Iterable, Iterator, Tuple
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 
 from timekeeper.model import Day
 
+WORKERS = 4
+TIMEOUT = 10
+RETRIES = 3
+BACKOFF = 0.5
+RATE = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TimekeeperRemoteError(Exception):
+    """remote module exception"""
+
+
+class RateLimiter:
+    """Spaces out calls so no more than rate of them start per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self.next_call = 0.0
+        self.lock = Lock()
+
+    def wait(self) -> None:
+        """Blocks until the next call is allowed"""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
 
 class Hiper:
     url: str = "http://hiper.e-ducativa.x"
 
+    def __init__(
+        self,
+        url: str = None,
+        workers: int = WORKERS,
+        timeout: float = TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        rate: float = RATE,
+    ):
+        if url:
+            self.url = url
+
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.rate = rate
+        self.cookies: dict = None
+        self.limiters: Dict[str, RateLimiter] = {}
+        self.limiters_lock = Lock()
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=workers,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff,
+                status_forcelist=RETRY_STATUSES,
+                raise_on_status=False,
+            ),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, url: str, retry: bool = False, **kwargs) -> requests.Response:
+        """Posts through the pooled session, rate limited per host
+
+        The session only retries idempotent methods. With retry, refused
+        connections and retryable statuses are posted again with backoff,
+        for posts that are safe to repeat and whose body is not a stream.
+        """
+        host = urlsplit(url).netloc
+        with self.limiters_lock:
+            limiter = self.limiters.setdefault(host, RateLimiter(self.rate))
+
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            limiter.wait()
+            try:
+                response = self.session.post(url=url, timeout=self.timeout, **kwargs)
+            except requests.ConnectionError:
+                if attempt == attempts - 1:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt == attempts - 1
+                ):
+                    return response
+                response.close()
+
+            time.sleep(self.backoff * 2**attempt)
+
     def login(self, username: str, password: str) -> dict:
         login_url = f"{self.url}/login.cgi"
         encoder = MultipartEncoder(
@@ -18,24 +119,25 @@ class Hiper:
                 "password": password,
             }
         )
-        session = requests.Session()
 
-        session.post(
-            url=login_url,
+        self.post(
+            login_url,
+            retry=True,
             headers={
                 "Content-Type": encoder.content_type,
             },
-            data=encoder,
+            data=encoder.to_string(),
             allow_redirects=True,
         )
-        session_cookies = session.cookies.get_dict()
+        session_cookies = self.session.cookies.get_dict()
 
         if not session_cookies:
-            raise Exception("Can't login.")
+            raise TimekeeperRemoteError("Can't login.")
 
-        return session.cookies.get_dict()
+        self.cookies = session_cookies
+        return session_cookies
 
-    def register_date(self, day: Day, cookies: dict) -> dict:
+    def register_date(self, day: Day, cookies: dict = None) -> bool:
         reloj_url = f"{self.url}/aj_reloj.cgi"
         request_data = {
             "accion": "validar_guardar_teletrabajo",
@@ -44,10 +146,31 @@ class Hiper:
             "salida": day.time_out_str(),
         }
 
-        response = requests.post(url=reloj_url, json=request_data, cookies=cookies)
+        try:
+            response = self.post(
+                reloj_url,
+                retry=True,
+                json=request_data,
+                cookies=cookies or self.cookies,
+            )
+        except requests.RequestException as request_error:
+            logging.warning(request_error)
+            return False
 
         if response.status_code == 200 and response.text == '{"estado":1}':
             return True
 
         logging.warning(response.text)
         return False
+
+    def register_days(
+        self, days: Iterable[Day], cookies: dict = None
+    ) -> Iterator[Tuple[Day, bool]]:
+        """Registers days concurrently, yielding each result as it completes"""
+        if cookies:
+            self.cookies = cookies
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.register_date, day): day for day in days}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
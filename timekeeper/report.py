@@ -0,0 +1,108 @@
+"""Rollup report module
+
+Totals worked time per day, week, month or year. Each period total is the
+difference of two running totals of the daily summary, so a report costs
+two indexed lookups per period whatever the number of punches.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator, Optional
+
+from timekeeper.model import Times
+from timekeeper.times import day_key
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+YEAR = "year"
+PERIODS = (DAY, WEEK, MONTH, YEAR)
+
+DAILY_TARGET = timedelta(hours=8)
+
+
+@dataclass
+class PeriodTotal:
+    """Worked time of a period, against the daily target of its worked days"""
+
+    period: str
+    days: int
+    worked: int
+    target: int
+
+    @property
+    def balance(self) -> int:
+        """Overtime seconds, negative when short of the target"""
+        return self.worked - self.target
+
+
+def period_start(day: date, by: str) -> date:
+    """Returns the first day of the period a day belongs to"""
+    if by == WEEK:
+        return day - timedelta(days=day.weekday())
+    if by == MONTH:
+        return day.replace(day=1)
+    if by == YEAR:
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_period(start: date, by: str) -> date:
+    """Returns the first day of the period following the one at start"""
+    if by == WEEK:
+        return start + timedelta(days=7)
+    if by == MONTH:
+        return (start + timedelta(days=32)).replace(day=1)
+    if by == YEAR:
+        return start.replace(year=start.year + 1)
+    return start + timedelta(days=1)
+
+
+def period_label(start: date, by: str) -> str:
+    """Returns the name of the period starting on a day"""
+    if by == WEEK:
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if by == MONTH:
+        return start.strftime("%Y-%m")
+    if by == YEAR:
+        return str(start.year)
+    return start.isoformat()
+
+
+def key_date(key: int) -> date:
+    """Returns the date of a YYYYMMDD day key"""
+    return date(key // 10000, key // 100 % 100, key % 100)
+
+
+def rollup(
+    times: Times,
+    by: str = DAY,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    daily_target: timedelta = DAILY_TARGET,
+) -> Iterator[PeriodTotal]:
+    """Yields the totals of every period with worked days in the range
+
+    The range defaults to the first and last summarized days. Periods are
+    clipped to the range.
+    """
+    times.refresh_summary()
+
+    bounds = times.summary_bounds()
+    if bounds is None:
+        return
+
+    first = max(date_from or key_date(bounds[0]), key_date(bounds[0]))
+    last = min(date_to or key_date(bounds[1]), key_date(bounds[1]))
+    target = int(daily_target.total_seconds())
+
+    start = period_start(first, by)
+    while start <= last:
+        end = next_period(start, by)
+        worked, days = times.range_totals(
+            day_key(max(start, first)), day_key(min(end - timedelta(days=1), last))
+        )
+        if days:
+            yield PeriodTotal(period_label(start, by), days, worked, days * target)
+        start = end
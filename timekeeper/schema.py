@@ -0,0 +1,231 @@
+"""Database schema module
+
+The schema version is tracked with ``PRAGMA user_version``. Each entry of
+``MIGRATIONS`` upgrades a database from the version matching its position to
+the next one, so existing databases are migrated in place and up to date
+ones skip every schema statement.
+"""
+
+from sqlite3 import Connection, Cursor
+from typing import Callable, Dict, List
+
+from timekeeper.database import ConnectionManager, connections
+
+
+class TimekeeperSchemaError(Exception):
+    """schema module exception"""
+
+
+def create_tables(cursor: Cursor) -> None:
+    """Version 1: original session and times tables"""
+    cursor.execute(
+        """CREATE TABLE IF NOT EXISTS `session` (
+        id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+        session_cookie TEXT
+        );"""
+    )
+    cursor.execute(
+        """CREATE TABLE IF NOT EXISTS `times` (
+        id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+        operation TEXT CHECK( operation IN ('IN','OUT') ) NOT NULL,
+        date TIMESTAMP);"""
+    )
+
+
+def index_times(cursor: Cursor) -> None:
+    """Version 2: numeric timestamp and day key columns, both indexed"""
+    cursor.execute("ALTER TABLE `times` ADD COLUMN `ts` INTEGER;")
+    cursor.execute("ALTER TABLE `times` ADD COLUMN `day` INTEGER;")
+    cursor.execute(
+        """UPDATE `times` SET
+        `ts` = CAST(strftime('%s', `date`) AS INTEGER),
+        `day` = CAST(strftime('%Y%m%d', `date`) AS INTEGER);"""
+    )
+    cursor.execute("CREATE INDEX `idx_times_ts` ON `times` (`ts`);")
+    cursor.execute("CREATE INDEX `idx_times_day` ON `times` (`day`);")
+
+
+def summarize_days(cursor: Cursor) -> None:
+    """Version 3: daily summary table kept dirty by triggers on times
+
+    Inserting or deleting a punch dirties its day and the day of the punch
+    before it, whose IN may have been paired with it. Existing days start
+    dirty and are summarized on the next read.
+    """
+    cursor.execute(
+        """CREATE TABLE `day_summary` (
+        day INTEGER PRIMARY KEY NOT NULL,
+        first_in INTEGER,
+        out_ts INTEGER,
+        worked INTEGER NOT NULL DEFAULT 0,
+        open INTEGER NOT NULL DEFAULT 0,
+        dirty INTEGER NOT NULL DEFAULT 1);"""
+    )
+    cursor.execute(
+        "CREATE INDEX `idx_day_summary_dirty` ON `day_summary` (`dirty`) WHERE `dirty`;"
+    )
+
+    for event, row in (("INSERT", "NEW"), ("DELETE", "OLD")):
+        cursor.execute(
+            f"""CREATE TRIGGER `times_summary_{event.lower()}`
+            AFTER {event} ON `times` WHEN {row}.`day` IS NOT NULL
+            BEGIN
+                INSERT INTO `day_summary` (`day`) VALUES ({row}.`day`)
+                ON CONFLICT (`day`) DO UPDATE SET `dirty` = 1;
+                INSERT INTO `day_summary` (`day`)
+                SELECT `day` FROM `times`
+                WHERE (`ts`, `id`) < ({row}.`ts`, {row}.`id`)
+                ORDER BY `ts` DESC, `id` DESC LIMIT 1
+                ON CONFLICT (`day`) DO UPDATE SET `dirty` = 1;
+            END;"""
+        )
+
+    cursor.execute(
+        """INSERT INTO `day_summary` (`day`)
+        SELECT DISTINCT `day` FROM `times` WHERE `day` IS NOT NULL;"""
+    )
+
+
+def create_sync_ledger(cursor: Cursor) -> None:
+    """Version 4: remote sync ledger, unsent days form the outbox"""
+    cursor.execute(
+        """CREATE TABLE `sync_ledger` (
+        day INTEGER PRIMARY KEY NOT NULL,
+        digest TEXT NOT NULL,
+        first_in INTEGER NOT NULL,
+        worked INTEGER NOT NULL,
+        status TEXT CHECK( status IN ('pending','sent','failed') ) NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        updated INTEGER);"""
+    )
+    cursor.execute(
+        """CREATE INDEX `idx_sync_ledger_outbox` ON `sync_ledger` (`day`)
+        WHERE `status` != 'sent';"""
+    )
+
+
+def unique_punches(cursor: Cursor) -> None:
+    """Version 5: one punch per operation and timestamp
+
+    Exact duplicates already stored are dropped, keeping the oldest one.
+    """
+    cursor.execute(
+        """DELETE FROM `times` WHERE `ts` IS NOT NULL AND `id` NOT IN (
+        SELECT MIN(`id`) FROM `times` WHERE `ts` IS NOT NULL
+        GROUP BY `operation`, `ts`);"""
+    )
+    cursor.execute(
+        "CREATE UNIQUE INDEX `idx_times_punch` ON `times` (`operation`, `ts`);"
+    )
+
+
+def accumulate_days(cursor: Cursor) -> None:
+    """Version 6: running totals of worked seconds and days on the summary
+
+    The totals of any range of days are the difference of two running
+    totals. Every day is dirtied, so they get computed on the next read.
+    """
+    cursor.execute("ALTER TABLE `day_summary` ADD COLUMN `cum_worked` INTEGER;")
+    cursor.execute("ALTER TABLE `day_summary` ADD COLUMN `cum_days` INTEGER;")
+    cursor.execute("UPDATE `day_summary` SET `dirty` = 1;")
+
+
+def track_archive(cursor: Cursor) -> None:
+    """Version 7: archive bound, days before it live in the archive database
+
+    Punches can no longer be registered on archived days.
+    """
+    cursor.execute(
+        """CREATE TABLE `archive_state` (
+        id INTEGER PRIMARY KEY CHECK( id = 1 ) NOT NULL,
+        before INTEGER NOT NULL,
+        path TEXT NOT NULL);"""
+    )
+    cursor.execute(
+        """CREATE TRIGGER `times_archived` BEFORE INSERT ON `times`
+        WHEN NEW.`day` < (SELECT `before` FROM `archive_state`)
+        BEGIN
+            SELECT RAISE(ABORT, 'day is archived');
+        END;"""
+    )
+
+
+def create_archive(cursor: Cursor, schema: str) -> None:
+    """Creates the punches table of an attached archive database"""
+    cursor.execute(
+        f"""CREATE TABLE IF NOT EXISTS `{schema}`.`times` (
+        id integer PRIMARY KEY NOT NULL,
+        operation TEXT CHECK( operation IN ('IN','OUT') ) NOT NULL,
+        date TIMESTAMP,
+        ts INTEGER NOT NULL,
+        day INTEGER NOT NULL);"""
+    )
+    cursor.execute(
+        f"""CREATE UNIQUE INDEX IF NOT EXISTS `{schema}`.`idx_times_punch`
+        ON `times` (`operation`, `ts`);"""
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS `{schema}`.`idx_times_ts` ON `times` (`ts`);"
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS `{schema}`.`idx_times_day` ON `times` (`day`);"
+    )
+
+
+MIGRATIONS: List[Callable[[Cursor], None]] = [
+    create_tables,
+    index_times,
+    summarize_days,
+    create_sync_ledger,
+    unique_punches,
+    accumulate_days,
+    track_archive,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+_migrated: Dict[str, Connection] = {}
+
+
+def schema_version(cursor: Cursor) -> int:
+    """Returns the schema version of a database"""
+    cursor.execute("PRAGMA user_version;")
+    return cursor.fetchone()[0]
+
+
+def migrate(database: str, manager: ConnectionManager = connections) -> int:
+    """Upgrades a database to the current schema version
+
+    Connections already migrated by this process are skipped without running
+    any statement. Returns the resulting schema version.
+    """
+    if _migrated.get(database) is manager.connect(database):
+        return SCHEMA_VERSION
+
+    with manager.transaction(database) as connection:
+        if _migrated.get(database) is connection:
+            return SCHEMA_VERSION
+
+        cursor = connection.cursor()
+        try:
+            version = schema_version(cursor)
+            if version < SCHEMA_VERSION:
+                if not connection.in_transaction:
+                    cursor.execute("BEGIN IMMEDIATE;")
+                    version = schema_version(cursor)
+
+                for migration in MIGRATIONS[version:]:
+                    migration(cursor)
+
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+            elif version > SCHEMA_VERSION:
+                raise TimekeeperSchemaError(
+                    f"{database} schema version {version} is newer "
+                    f"than the supported {SCHEMA_VERSION}"
+                )
+        finally:
+            cursor.close()
+
+        _migrated[database] = connection
+
+    return SCHEMA_VERSION
@@ -0,0 +1,81 @@
+"""Live status module
+
+Tells whether a work cycle is open and how long was worked today. The
+watcher keeps the last status in memory and only queries the database
+again once another connection committed, its own punch journal
+compaction inserted punches, or the day changed. Between changes a tick
+costs a single PRAGMA, and a stat with the journal backend.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from timekeeper.model import DAYS_SUMMARY, Times
+from timekeeper.times import duration_str, from_timestamp, to_timestamp
+
+
+@dataclass
+class Status:
+    """Worked time of a day, and the start of the open work cycle if any"""
+
+    day: date
+    worked: int
+    open_since: Optional[int] = None
+
+    def worked_at(self, now: datetime) -> int:
+        """Worked seconds of the day, counting the open cycle up to now"""
+        if self.open_since is None:
+            return self.worked
+
+        midnight = to_timestamp(datetime.combine(self.day, datetime.min.time()))
+        since = max(self.open_since, midnight)
+        return self.worked + max(to_timestamp(now) - since, 0)
+
+
+def read_status(times: Times, day: date) -> Status:
+    """Reads the worked time of a day and the open cycle from the database"""
+    filters = {"date_from": f"{day} 00:00:00", "date_to": f"{day} 23:59:59"}
+    worked = sum(worked for _, worked in times.iter_rows(filters, mode=DAYS_SUMMARY))
+
+    last = times.last_punch()
+    open_since = last[1] if last is not None and last[0] == "IN" else None
+
+    return Status(day, worked, open_since)
+
+
+class StatusWatcher:
+    """Polls the status, reading the database only when it changed"""
+
+    def __init__(self, times: Times):
+        self.times = times
+        self.version: Optional[Tuple[int, int]] = None
+        self.status: Optional[Status] = None
+        self.reads = 0
+
+    def poll(self, now: Optional[datetime] = None) -> Status:
+        """Returns the current status, reread only if it may have changed"""
+        today = (now or datetime.now()).date()
+        # Compacting the journal commits on our own connection, which
+        # data_version does not count, so compacted punches are counted too
+        version = (self.times.data_version(), self.times.compacted)
+
+        if self.status is None or version != self.version or self.status.day != today:
+            self.status = read_status(self.times, today)
+            # Reading may refresh the summary, which our own commits never
+            # change the version for, so the version read before is kept
+            self.version = version
+            self.reads += 1
+
+        return self.status
+
+
+def status_line(status: Status, now: datetime) -> str:
+    """Returns a one line description of a status, for terminals and bars"""
+    worked = f"Today {duration_str(status.worked_at(now))}"
+    if status.open_since is None:
+        return f"{worked}, out"
+
+    since = from_timestamp(status.open_since)
+    start = since.strftime("%H:%M" if since.date() == now.date() else "%Y-%m-%d %H:%M")
+    return f"{worked}, in since {start}"
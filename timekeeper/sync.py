@@ -0,0 +1,21 @@
+"""Remote synchronization module"""
+
+from typing import Iterable, Iterator, Tuple
+
+from timekeeper.model import Day, SyncLedger
+from timekeeper.remote import Hiper
+
+
+def synchronize(
+    ledger: SyncLedger, remote: Hiper, days: Iterable[Day] = ()
+) -> Iterator[Tuple[Day, bool]]:
+    """Queues the new or changed days, then drains the whole outbox
+
+    Yields every sent day with its result as soon as it is recorded, so an
+    interrupted run keeps what was already confirmed.
+    """
+    ledger.enqueue(days)
+
+    for day, sent in remote.register_days(ledger.outbox()):
+        ledger.mark(day, sent)
+        yield day, sent
@@ -0,0 +1,119 @@
+"""Team reporting module
+
+Aggregates the days of many user databases at once, one worker process per
+database. Workers read through read-only connections, so reports never
+write to, or wait for, the users databases.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, Iterator, List, Optional
+
+from timekeeper.database import DatabaseError, DatabaseSettings, close_db, connections
+from timekeeper.model import (
+    DAYS_AGGREGATE,
+    DAYS_SUMMARY,
+    DayBatch,
+    TimekeeperModelError,
+    Times,
+)
+from timekeeper.schema import SCHEMA_VERSION, schema_version
+
+DATABASE_SUFFIX = ".db"
+SCHEMA_OUTDATED = "schema out of date, run tk once"
+
+
+class TimekeeperTeamError(Exception):
+    """team module exception"""
+
+
+@dataclass
+class UserReport:
+    """Days of a user in the filtered range, or why they could not be read"""
+
+    user: str
+    days: DayBatch
+    problem: Optional[str] = None
+
+
+def discover(paths: Iterable[str]) -> List[str]:
+    """Returns the databases given, and the ones inside given directories"""
+    databases = []
+    for path in paths:
+        if os.path.isdir(path):
+            databases.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.endswith(DATABASE_SUFFIX)
+            )
+        else:
+            databases.append(path)
+    return databases
+
+
+def user_name(database: str) -> str:
+    """Returns the user a database belongs to, its file name"""
+    return os.path.splitext(os.path.basename(database))[0]
+
+
+def read_days(times: Times, filters: dict = None) -> DayBatch:
+    """Reads the days from the daily summary when it is up to date
+
+    Read-only connections cannot recompute the summary, the days are
+    computed from the registers when it is not, or stops being meanwhile.
+    """
+    if times.summary_is_fresh():
+        try:
+            return DayBatch(times.iter_rows(filters, mode=DAYS_SUMMARY))
+        except TimekeeperModelError:
+            pass
+
+    return DayBatch(times.iter_rows(filters, mode=DAYS_AGGREGATE))
+
+
+def user_report(database: str, filters: dict = None) -> UserReport:
+    """Reads the days of a database through a read-only connection
+
+    Databases of an older schema cannot be migrated read-only, their report
+    holds no days and the problem instead.
+    """
+    previous = connections.settings.get(database)
+    connections.configure(database, DatabaseSettings(read_only=True))
+
+    try:
+        with connections.cursor(database) as cursor:
+            version = schema_version(cursor)
+        if version < SCHEMA_VERSION:
+            return UserReport(user_name(database), DayBatch(), SCHEMA_OUTDATED)
+        days = read_days(Times(database), filters)
+    except (TimekeeperModelError, DatabaseError) as error:
+        raise TimekeeperTeamError(f"{database}: {error.__cause__ or error}") from error
+    finally:
+        close_db(database)
+        if previous is None:
+            connections.settings.pop(database, None)
+        else:
+            connections.configure(database, previous)
+
+    return UserReport(user_name(database), days)
+
+
+def team_reports(
+    databases: List[str], filters: dict = None, workers: Optional[int] = None
+) -> Iterator[UserReport]:
+    """Yields the report of every database in order, each once it is ready
+
+    Databases are spread over a process pool of workers processes, one per
+    CPU by default. A single worker reads them in this process instead.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(databases))
+
+    if workers <= 1:
+        for database in databases:
+            yield user_report(database, filters)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(partial(user_report, filters=filters), databases)
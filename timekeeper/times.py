@@ -1,8 +1,11 @@
 """Time management utils"""
 
-from datetime import datetime
+import calendar
+from datetime import date, datetime, timedelta
 
 ROUND_INTERVAL = 5
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
 
 
 def round_minutes(minutes: int, interval: int = ROUND_INTERVAL) -> int:
@@ -17,3 +20,43 @@ def now_rounded(interval: int = ROUND_INTERVAL) -> datetime:
     return now.replace(
         minute=round_minutes(current_minutes, interval), second=0, microsecond=0
     )
+
+
+def to_timestamp(date: datetime) -> int:
+    """Returns the sortable numeric timestamp stored for a datetime"""
+    return calendar.timegm(date.timetuple())
+
+
+def from_timestamp(timestamp: int) -> datetime:
+    """Returns the datetime represented by a stored timestamp"""
+    return EPOCH + timedelta(seconds=timestamp)
+
+
+def day_key(date: datetime) -> int:
+    """Returns the numeric YYYYMMDD key of a datetime day"""
+    return date.year * 10000 + date.month * 100 + date.day
+
+
+def parse_datetime(value) -> datetime:
+    """Returns a datetime from a datetime or an ISO formated string"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def date_str(timestamp: int) -> str:
+    """Returns the YYYY-MM-DD day of a stored timestamp"""
+    return date.fromordinal(EPOCH_ORDINAL + timestamp // 86400).isoformat()
+
+
+def clock_str(timestamp: int) -> str:
+    """Returns the HH:MM time of a stored timestamp"""
+    hours, seconds = divmod(timestamp % 86400, 3600)
+    return f"{hours:02d}:{seconds // 60:02d}"
+
+
+def duration_str(seconds: int, signed: bool = False) -> str:
+    """Returns an H:MM duration, with its sign when signed"""
+    sign = "-" if seconds < 0 else "+" if signed else ""
+    hours, seconds = divmod(abs(seconds), 3600)
+    return f"{sign}{hours}:{seconds // 60:02d}"
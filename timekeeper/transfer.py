@@ -0,0 +1,96 @@
+"""Punches import and export module"""
+
+import csv
+import json
+from datetime import datetime
+from typing import IO, Iterable, Iterator, Tuple
+
+from timekeeper.times import parse_datetime
+
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = (CSV, JSONL)
+COLUMNS = ("operation", "date")
+OPERATIONS = ("IN", "OUT")
+
+
+class TimekeeperImportError(ValueError):
+    """transfer module exception"""
+
+
+def guess_format(filename: str) -> str:
+    """Returns the file format matching a filename extension"""
+    return JSONL if filename.endswith((".jsonl", ".json")) else CSV
+
+
+def validate(line: int, record: dict) -> Tuple[str, datetime]:
+    """Returns the operation and date of a record, raising if invalid
+
+    Dates with a UTC offset are converted to naive local time, like the
+    punches are stored.
+    """
+    if not isinstance(record, dict):
+        raise TimekeeperImportError(f"Line {line}: expected an object")
+
+    operation = str(record.get("operation", "")).strip().upper()
+    if operation not in OPERATIONS:
+        raise TimekeeperImportError(
+            f"Line {line}: invalid operation {record.get('operation')!r}"
+        )
+
+    try:
+        date = parse_datetime(str(record.get("date", "")).strip())
+    except ValueError as date_error:
+        raise TimekeeperImportError(
+            f"Line {line}: invalid date {record.get('date')!r}"
+        ) from date_error
+
+    if date.tzinfo is not None:
+        date = date.astimezone().replace(tzinfo=None)
+
+    return operation, date
+
+
+def read_punches(stream: IO[str], file_format: str) -> Iterator[Tuple[str, datetime]]:
+    """Yields the validated punches of a CSV or JSON lines stream"""
+    if file_format == JSONL:
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as json_error:
+                raise TimekeeperImportError(
+                    f"Line {line}: invalid JSON"
+                ) from json_error
+            yield validate(line, record)
+        return
+
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None or not set(COLUMNS) <= set(reader.fieldnames):
+        raise TimekeeperImportError(f"CSV header must include {', '.join(COLUMNS)}")
+
+    for record in reader:
+        yield validate(reader.line_num, record)
+
+
+def write_punches(
+    stream: IO[str], punches: Iterable[Tuple[str, datetime]], file_format: str
+) -> int:
+    """Writes punches as CSV or JSON lines, returns how many were written"""
+    written = 0
+
+    if file_format == JSONL:
+        for operation, date in punches:
+            record = {"operation": operation, "date": date.isoformat(sep=" ")}
+            stream.write(json.dumps(record))
+            stream.write("\n")
+            written += 1
+        return written
+
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(COLUMNS)
+    for operation, date in punches:
+        writer.writerow((operation, date.isoformat(sep=" ")))
+        written += 1
+    return written